@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# detection_journal.py - detected_news 감지 기록용 append-only JSONL 저널
+#
+# 레이아웃
+#   data/journal/detected_news-YYYY-MM.jsonl     현재/미압축 월 세그먼트 (1줄 = 감지 1건)
+#   data/journal/detected_news-YYYY-MM.jsonl.gz  압축(compaction)된 지난 월 세그먼트
+#   data/journal/manifest.json                   레거시 배열 이관 여부 등 메타데이터
+#
+# detected_news.json(배열)은 더 이상 원본이 아니라 호환용 뷰다. append_records가 새 기록만
+# 닫는 ']' 앞에 덧붙이고(O(새 기록)), 전체 재생성은 백그라운드 compaction이 세그먼트를
+# 압축했거나 뷰가 manifest에 기록된 상태(array_view: 크기/mtime)와 어긋났을 때(이관 직후,
+# 중간에 끊긴 덧붙이기, 외부 수정)만 한다. 프로세스 안의 소비자는 load_detected_news()를 쓴다.
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import textwrap
+import threading
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_DIR = os.getenv("DETECTION_JOURNAL_DIR", "").strip() or os.path.join(BASE_DIR, "data", "journal")
+LEGACY_ARRAY_PATH = os.path.join(BASE_DIR, "detected_news.json")
+
+SEGMENT_PREFIX = "detected_news-"
+SEGMENT_RE = re.compile(r"^detected_news-(\d{4}-\d{2})\.jsonl(\.gz)?$")
+MANIFEST_NAME = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+_compaction_lock = threading.Lock()
+
+
+def _atomic_write(file_path, write_fn, opener=open):
+    """임시 파일에 write_fn으로 기록한 뒤 fsync + os.replace로 교체한다."""
+    target_path = os.path.abspath(file_path)
+    target_dir = os.path.dirname(target_path) or "."
+    os.makedirs(target_dir, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=f".{os.path.basename(target_path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        with opener(tmp_path, "wt", encoding="utf-8") as f:
+            write_fn(f)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _segment_month(record):
+    stamp = str(record.get("timestamp") or "")
+    if re.match(r"^\d{4}-\d{2}", stamp):
+        return stamp[:7]
+    return datetime.now().strftime("%Y-%m")
+
+
+def _segment_path(month, compacted=False, journal_dir=JOURNAL_DIR):
+    suffix = ".jsonl.gz" if compacted else ".jsonl"
+    return os.path.join(journal_dir, f"{SEGMENT_PREFIX}{month}{suffix}")
+
+
+def _encode(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def list_segments(journal_dir=JOURNAL_DIR):
+    """(month, compacted, path) 목록을 월/압축본 우선 순서로 반환한다."""
+    if not os.path.isdir(journal_dir):
+        return []
+    segments = []
+    for name in os.listdir(journal_dir):
+        match = SEGMENT_RE.match(name)
+        if match:
+            compacted = bool(match.group(2))
+            segments.append((match.group(1), compacted, os.path.join(journal_dir, name)))
+    # 같은 월은 압축본(과거) → 미압축본(이후 append) 순서
+    segments.sort(key=lambda seg: (seg[0], not seg[1]))
+    return segments
+
+
+def _load_manifest(journal_dir=JOURNAL_DIR):
+    try:
+        with open(os.path.join(journal_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def _save_manifest(manifest, journal_dir=JOURNAL_DIR):
+    _atomic_write(
+        os.path.join(journal_dir, MANIFEST_NAME),
+        lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2),
+    )
+
+
+def ensure_journal(journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH):
+    """최초 1회: 레거시 detected_news.json 배열을 월별 세그먼트로 이관한다."""
+    manifest = _load_manifest(journal_dir)
+    if manifest.get("legacy_imported_at"):
+        return manifest
+
+    os.makedirs(journal_dir, exist_ok=True)
+    legacy = []
+    # manifest만 유실된 경우 배열 뷰를 다시 이관하면 중복되므로 기존 세그먼트를 그대로 신뢰한다.
+    if os.path.exists(legacy_path) and not list_segments(journal_dir):
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        legacy = [rec for rec in loaded if isinstance(rec, dict)] if isinstance(loaded, list) else []
+
+    by_month = {}
+    for record in legacy:
+        by_month.setdefault(_segment_month(record), []).append(record)
+
+    for month, records in by_month.items():
+        _atomic_write(
+            _segment_path(month, journal_dir=journal_dir),
+            lambda f, records=records: f.writelines(_encode(rec) for rec in records),
+        )
+
+    manifest = {
+        "legacy_imported_at": datetime.now().isoformat(),
+        "legacy_records": len(legacy),
+    }
+    _save_manifest(manifest, journal_dir)
+    logger.info("   📦 detected_news.json 레거시 %d건을 저널로 이관: %s", len(legacy), journal_dir)
+    return manifest
+
+
+def append_records(records, journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH, export_path=LEGACY_ARRAY_PATH):
+    """한 실행분의 감지 기록을 월 세그먼트별로 묶어 1회씩 append + fsync 하고 배열 뷰에도 덧붙인다."""
+    records = [rec for rec in records if isinstance(rec, dict)]
+    if not records:
+        return 0
+
+    ensure_journal(journal_dir, legacy_path)
+
+    by_month = {}
+    for record in records:
+        by_month.setdefault(_segment_month(record), []).append(record)
+
+    for month, month_records in by_month.items():
+        path = _segment_path(month, journal_dir=journal_dir)
+        payload = "".join(_encode(rec) for rec in month_records).encode("utf-8")
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # 이전 실행이 줄 중간에서 끊겼다면 새 기록이 깨진 줄에 붙지 않도록 개행을 보정한다.
+            size = os.fstat(fd).st_size
+            if size:
+                with open(path, "rb") as f:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    if export_path:
+        with _compaction_lock:
+            # 뷰가 어긋나 있으면 건드리지 않는다 (다음 compaction이 전체 재생성).
+            _append_array_view(records, export_path, journal_dir)
+
+    return len(records)
+
+
+def _iter_segment(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 끊긴(torn) 줄은 건너뛴다
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def iter_records(months=None, journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH):
+    """감지 기록을 오래된 순으로 세그먼트 단위 lazy 스트리밍한다."""
+    if not _load_manifest(journal_dir).get("legacy_imported_at"):
+        # 아직 이관 전이면 레거시 배열이 유일한 원본이다.
+        if os.path.exists(legacy_path):
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            for record in loaded if isinstance(loaded, list) else []:
+                if isinstance(record, dict) and (months is None or _segment_month(record) in months):
+                    yield record
+        return
+
+    for month, _, path in list_segments(journal_dir):
+        if months is not None and month not in months:
+            continue
+        yield from _iter_segment(path)
+
+
+def load_detected_news(journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH):
+    """기존 detected_news.json 소비자용 배열 뷰."""
+    return list(iter_records(journal_dir=journal_dir, legacy_path=legacy_path))
+
+
+def _encode_array_entry(record):
+    return textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), "  ")
+
+
+def _view_state(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _record_view_state(path, journal_dir):
+    manifest = _load_manifest(journal_dir)
+    manifest["array_view"] = _view_state(path)
+    _save_manifest(manifest, journal_dir)
+
+
+def _view_is_current(path, journal_dir):
+    view = _load_manifest(journal_dir).get("array_view")
+    return bool(view) and os.path.exists(path) and _view_state(path) == view
+
+
+def _append_array_view(records, path, journal_dir=JOURNAL_DIR):
+    """배열 뷰의 닫는 ']' 앞에 records만 덧붙인다. 뷰가 최신 상태가 아니면 False."""
+    if not _view_is_current(path, journal_dir):
+        return False
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        tail_len = min(size, 64)
+        f.seek(size - tail_len)
+        tail = f.read(tail_len).rstrip()
+        if not tail.endswith(b"]"):
+            return False
+        body = tail[:-1].rstrip()
+        empty = body.endswith(b"[")
+        f.seek(size - tail_len + len(body))
+        entries = []
+        for record in records:
+            entries.append(("\n" if empty and not entries else ",\n") + _encode_array_entry(record))
+        f.write(("".join(entries) + "\n]").encode("utf-8"))
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+    _record_view_state(path, journal_dir)
+    return True
+
+
+def export_array(path=LEGACY_ARRAY_PATH, journal_dir=JOURNAL_DIR):
+    """저널을 기존 포맷(indent=2 JSON 배열)으로 스트리밍 export 한다."""
+
+    def write(f):
+        f.write("[")
+        first = True
+        for record in iter_records(journal_dir=journal_dir, legacy_path=path):
+            f.write("\n" if first else ",\n")
+            f.write(_encode_array_entry(record))
+            first = False
+        f.write("\n]" if not first else "]")
+
+    _atomic_write(path, write)
+    if _load_manifest(journal_dir).get("legacy_imported_at"):
+        _record_view_state(path, journal_dir)
+
+
+def compact_segments(journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH, export_path=LEGACY_ARRAY_PATH):
+    """지난 월 세그먼트를 중복/깨진 줄 제거 후 gzip으로 압축하고, 필요할 때만 배열 뷰를 재생성한다."""
+    with _compaction_lock:
+        ensure_journal(journal_dir, legacy_path)
+        current_month = datetime.now().strftime("%Y-%m")
+        compacted = 0
+
+        for month, is_compacted, path in list_segments(journal_dir):
+            if is_compacted or month >= current_month:
+                continue
+
+            gz_path = _segment_path(month, compacted=True, journal_dir=journal_dir)
+            sources = [gz_path, path] if os.path.exists(gz_path) else [path]
+
+            def write(f, sources=sources):
+                seen = set()
+                for source in sources:
+                    for record in _iter_segment(source):
+                        key = (record.get("timestamp"), record.get("news"))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        f.write(_encode(record))
+
+            _atomic_write(gz_path, write, opener=gzip.open)
+            os.remove(path)
+            compacted += 1
+
+        # 압축은 중복 줄을 걸러내므로 뷰도 다시 만든다. 그 밖에는 덧붙이기로 최신인 뷰를 그대로 둔다.
+        if export_path and (compacted or not _view_is_current(export_path, journal_dir)):
+            export_array(export_path, journal_dir)
+
+        return compacted
+
+
+def start_background_compaction(journal_dir=JOURNAL_DIR, legacy_path=LEGACY_ARRAY_PATH, export_path=LEGACY_ARRAY_PATH):
+    """compaction을 별도 스레드로 실행한다 (non-daemon: 프로세스 종료 전 완료 보장)."""
+
+    def run():
+        try:
+            count = compact_segments(journal_dir, legacy_path, export_path)
+            if count:
+                logger.info("   🗜️ 저널 세그먼트 compaction 완료: %d개", count)
+        except Exception as e:
+            logger.error("   ⚠️ 저널 compaction 실패: %s", str(e))
+
+    thread = threading.Thread(target=run, name="detection-journal-compaction")
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="detected_news 저널 관리")
+    parser.add_argument("--compact", action="store_true", help="지난 월 세그먼트 압축 (+ 필요 시 배열 뷰 재생성)")
+    parser.add_argument("--export", dest="export_path", help="저널을 JSON 배열 파일로 export")
+    args = parser.parse_args()
+
+    if args.compact:
+        print(f"compacted={compact_segments()}")
+    if args.export_path:
+        export_array(os.path.abspath(args.export_path))
+        print(f"exported={args.export_path}")
+    if not args.compact and not args.export_path:
+        print(f"records={sum(1 for _ in iter_records())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# enrich_cache.py - Claude 보강 결과 영속 캐시 (.state/enrich_cache.sqlite3)
+#
+# 키 = blake2b(model, 프롬프트 템플릿 버전, 카테고리 컨텍스트, 제목/요약/URL).
+# item dict가 normalize/backfill에서 새로 만들어지거나 07:10 reconcile이 체인을 다시 돌려도
+# 같은 기사·같은 프롬프트면 저장된 decision을 즉시 다시 붙인다 (Claude 재호출 없음).
+# - TTL: ENRICH_CACHE_TTL_DAYS (기본 30일)가 지난 항목은 조회되지 않고 prune 때 지워진다
+# - LRU: 조회 시 last_used를 갱신하고, ENRICH_CACHE_MAX_ENTRIES를 넘으면 오래 안 쓴 것부터 지운다
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, ".state", "enrich_cache.sqlite3")
+TTL = float(os.getenv("ENRICH_CACHE_TTL_DAYS", "30")) * 86400
+MAX_ENTRIES = int(os.getenv("ENRICH_CACHE_MAX_ENTRIES", "5000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    key TEXT PRIMARY KEY,
+    decision TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def cache_key(model, prompt_version, context, item):
+    h = hashlib.blake2b(digest_size=20)
+    for part in (
+        model,
+        prompt_version,
+        context,
+        str(item.get("title", "")).strip(),
+        str(item.get("summary", "")).strip(),
+        str(item.get("url", "")).strip(),
+    ):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class EnrichCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=TTL, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key, now=None):
+        """TTL 안의 decision(dict)을 반환하고 last_used를 갱신한다. 없으면 None."""
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT decision FROM decisions WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE decisions SET last_used = ? WHERE key = ?", (now, key))
+                conn.commit()
+                self.hits += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, key, decision, now=None):
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO decisions (key, decision, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(decision, ensure_ascii=False), now, now),
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def prune(self, now=None):
+        """TTL이 지난 항목을 지우고, max_entries를 넘는 만큼 LRU 순으로 지운다. 지운 행 수 반환."""
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                conn = self._connection()
+                deleted = conn.execute("DELETE FROM decisions WHERE created_at <= ?", (now - self.ttl,)).rowcount
+                if self.max_entries > 0:
+                    deleted += conn.execute(
+                        "DELETE FROM decisions WHERE key IN ("
+                        "SELECT key FROM decisions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    ).rowcount
+                conn.commit()
+                return deleted
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EnrichCache(os.getenv("ENRICH_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _cache
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# feed_fetcher.py - news_hub.fetch_news용 RSS/Atom 조건부 GET 수집기
+#
+# - 피드 목록: NEWS_FEEDS(쉼표 구분) 또는 NEWS_FEEDS_FILE(기본 feeds.txt, 한 줄에 URL 1개)
+# - 피드별 ETag/Last-Modified를 .state/feed_state.json에 보관 → 변경 없는 피드는 304 1회로 끝
+# - bounded 워커 풀로 동시 폴링, 응답 스트림을 iterparse로 점진 파싱
+# - GUID와 정규화 URL 둘 다 키로 써서, 어느 하나라도 실행 내 + 최근 실행분(seen)에 있으면 중복으로 제거한다
+#
+# news_hub가 매 실행 import 하므로 urllib.request/ElementTree/concurrent.futures는
+# 실제로 피드를 폴링하는 경로에서만 import 한다 (피드 미설정 시에는 import 하지 않는다).
+import html
+import json
+import logging
+import os
+import re
+from datetime import datetime
+
+import news_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(BASE_DIR, ".state")
+FEED_STATE_FILE = os.path.join(STATE_DIR, "feed_state.json")
+DEFAULT_FEEDS_FILE = os.path.join(BASE_DIR, "feeds.txt")
+
+FEED_TIMEOUT = float(os.getenv("NEWS_FEED_TIMEOUT", "10"))
+FEED_WORKERS = int(os.getenv("NEWS_FEED_WORKERS", "4"))
+SEEN_LIMIT = int(os.getenv("NEWS_FEED_SEEN_LIMIT", "5000"))
+SUMMARY_LIMIT = 300
+USER_AGENT = "WaveTreeNewsBot/1.0 (+feeds)"
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+logger = logging.getLogger(__name__)
+
+
+def configured_feeds():
+    """환경변수/피드 파일에서 폴링 대상 URL 목록을 읽는다 (순서 유지, 중복 제거)."""
+    feeds = [u.strip() for u in os.getenv("NEWS_FEEDS", "").split(",") if u.strip()]
+
+    feeds_file = os.getenv("NEWS_FEEDS_FILE", "").strip() or DEFAULT_FEEDS_FILE
+    if os.path.exists(feeds_file):
+        with open(feeds_file, "r", encoding="utf-8") as f:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith("#"):
+                    feeds.append(url)
+
+    return list(dict.fromkeys(feeds))
+
+
+def load_state(path=FEED_STATE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data.setdefault("feeds", {})
+            data.setdefault("seen", [])
+            return data
+    except Exception:
+        pass
+    return {"feeds": {}, "seen": []}
+
+
+def save_state(state, path=FEED_STATE_FILE):
+    news_store.atomic_write_json(path, state)
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def _plain_text(value):
+    text = re.sub(r"<[^>]+>", " ", value or "")
+    return " ".join(html.unescape(text).split())
+
+
+def _entry_from_element(elem):
+    """RSS <item> / Atom <entry> 요소에서 title/link/guid/summary를 뽑는다."""
+    fields = {"title": "", "link": "", "guid": "", "summary": ""}
+    for child in elem:
+        name = _local(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            fields["title"] = _plain_text(text)
+        elif name == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                fields["link"] = href.strip()
+            elif text and not fields["link"]:
+                fields["link"] = text
+        elif name in ("guid", "id"):
+            fields["guid"] = text
+        elif name in ("description", "summary") or (name == "content" and not fields["summary"]):
+            fields["summary"] = _plain_text(text)[:SUMMARY_LIMIT]
+    return fields
+
+
+def parse_feed_stream(stream):
+    """응답 스트림을 iterparse로 점진 파싱하며 항목을 yield 한다 (처리한 요소는 즉시 해제)."""
+    import xml.etree.ElementTree as ET
+
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag == "item" or elem.tag == f"{ATOM_NS}entry":
+            entry = _entry_from_element(elem)
+            elem.clear()
+            if entry["title"]:
+                yield entry
+
+
+def poll_feed(url, feed_state, timeout=FEED_TIMEOUT):
+    """조건부 GET 1회. (entries, new_feed_state, status) 반환."""
+    import urllib.error
+    import urllib.request
+
+    headers = {"User-Agent": USER_AGENT}
+    if feed_state.get("etag"):
+        headers["If-None-Match"] = feed_state["etag"]
+    if feed_state.get("last_modified"):
+        headers["If-Modified-Since"] = feed_state["last_modified"]
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            entries = list(parse_feed_stream(resp))
+            new_state = {
+                "etag": resp.headers.get("ETag") or "",
+                "last_modified": resp.headers.get("Last-Modified") or "",
+                "checked_at": datetime.now().isoformat(),
+            }
+            return entries, new_state, resp.status
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            new_state = dict(feed_state)
+            new_state["checked_at"] = datetime.now().isoformat()
+            return [], new_state, 304
+        raise
+
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def normalize_link(link):
+    """중복 판정용 URL: scheme/host 소문자, fragment·추적 파라미터·끝 '/' 제거."""
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+    parts = urlsplit(link.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def entry_keys(entry):
+    """항목의 중복 판정 키 목록. GUID와 URL 중 하나라도 이미 본 것이면 중복이다."""
+    keys = []
+    if entry.get("guid"):
+        keys.append(f"guid:{entry['guid']}")
+    if entry.get("link"):
+        keys.append(f"url:{normalize_link(entry['link'])}")
+    if not keys:
+        keys.append(f"title:{entry.get('title', '')}")
+    return keys
+
+
+def _legacy_key(entry):
+    # 이전 포맷(접두사 없는 guid|link|title 1개) seen 기록 호환. SEEN_LIMIT로 밀려나면 자연히 사라진다.
+    return entry.get("guid") or entry.get("link") or entry.get("title", "")
+
+
+def entry_text(entry):
+    """filter_and_analyze에 넘길 뉴스 원문 문자열."""
+    if entry.get("summary"):
+        return f"{entry['title']} - {entry['summary']}"
+    return entry["title"]
+
+
+def iter_feed_entries(feeds=None, state_path=FEED_STATE_FILE, workers=FEED_WORKERS, timeout=FEED_TIMEOUT):
+    """피드를 동시 폴링해 완료되는 순서대로 중복 제거된 항목을 yield 한다."""
+    feeds = configured_feeds() if feeds is None else feeds
+    if not feeds:
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    state = load_state(state_path)
+    seen_order = list(state.get("seen", []))
+    seen = set(seen_order)
+    stats = {"fetched": 0, "not_modified": 0, "failed": 0, "new": 0, "duplicate": 0}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(feeds)))) as pool:
+            futures = {
+                pool.submit(poll_feed, url, state["feeds"].get(url, {}), timeout): url
+                for url in feeds
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    entries, feed_state, status = future.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.warning("   ⚠️ 피드 수집 실패(%s): %s", url, str(e))
+                    continue
+
+                state["feeds"][url] = feed_state
+                if status == 304:
+                    stats["not_modified"] += 1
+                    continue
+                stats["fetched"] += 1
+
+                for entry in entries:
+                    keys = entry_keys(entry)
+                    if _legacy_key(entry) in seen or any(key in seen for key in keys):
+                        stats["duplicate"] += 1
+                        # 같은 글의 다른 GUID/URL도 기억해 두어야 다음 변형도 걸러진다.
+                        new_keys = [key for key in keys if key not in seen]
+                        seen.update(new_keys)
+                        seen_order.extend(new_keys)
+                        continue
+                    seen.update(keys)
+                    seen_order.extend(keys)
+                    stats["new"] += 1
+                    yield entry
+    finally:
+        state["seen"] = seen_order[-SEEN_LIMIT:]
+        save_state(state, state_path)
+        logger.info(
+            "   📡 피드 폴링: feeds=%d fetched=%d not_modified=%d failed=%d new=%d duplicate=%d",
+            len(feeds),
+            stats["fetched"],
+            stats["not_modified"],
+            stats["failed"],
+            stats["new"],
+            stats["duplicate"],
+        )
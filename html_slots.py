@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# html_slots.py - 정적 HTML의 이름 붙은 슬롯(section)에 조각을 끼워 넣는 엔진
+#
+# - 슬롯 = 여는 마커(정확한 문자열) ~ 닫는 패턴(첫 매치)까지의 구간
+# - 등록된 모든 슬롯의 여는 마커를 한 번의 선형 스캔(alternation finditer)으로 찾는다
+# - 슬롯 오프셋은 (inode, mtime_ns, size) 파일 버전별로 캐시 → 같은 버전이면 재스캔 없음
+# - 여러 슬롯을 한 번에 splice 해 버퍼를 1회 조립하고, 슬롯 내용이 같으면 None(쓰기 생략)
+# 실제 파일 쓰기는 호출 측이 publish_fanout(원자적 교체)으로 한다.
+import os
+import re
+
+
+class SlotSpec:
+    """open_marker 뒤부터 close_pattern 매치 끝까지를 prefix + fragment + suffix로 교체한다."""
+
+    __slots__ = ("name", "open_marker", "close_re", "prefix", "suffix")
+
+    def __init__(self, name, open_marker, close_pattern, prefix="", suffix=""):
+        self.name = name
+        self.open_marker = open_marker
+        self.close_re = re.compile(close_pattern)
+        self.prefix = prefix
+        self.suffix = suffix
+
+    @classmethod
+    def comment(cls, name):
+        """<!-- slot:name --> ... <!-- /slot:name --> 주석 마커 슬롯."""
+        return cls(
+            name,
+            f"<!-- slot:{name} -->",
+            re.escape(f"<!-- /slot:{name} -->"),
+            suffix=f"<!-- /slot:{name} -->",
+        )
+
+    def render(self, fragment):
+        return f"{self.prefix}{fragment}{self.suffix}"
+
+
+# sync_top_news.update_html의 기존 정규식 2단계(비우기 → 주입)와 같은 결과를 내는 슬롯
+INTELLIGENCE_HUB = SlotSpec(
+    "intelligence-hub",
+    '<div class="section-content" id="intelligence-hub-content">',
+    r"</div>\s*</section>",
+    prefix="\n                ",
+    suffix="</div>\n            </section>",
+)
+
+_offset_cache = {}  # abspath -> (version_key, spec_names, {name: (start, end)})
+_scanner_cache = {}
+
+
+def _version_key(path):
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _scanner(specs):
+    names = tuple(spec.name for spec in specs)
+    scanner = _scanner_cache.get(names)
+    if scanner is None:
+        scanner = re.compile("|".join(f"(?P<s{i}>{re.escape(spec.open_marker)})" for i, spec in enumerate(specs)))
+        _scanner_cache[names] = scanner
+    return scanner
+
+
+def find_slots(text, specs):
+    """여는 마커를 1회 선형 스캔으로 찾고 {name: (start, end)}를 반환한다 (없는 슬롯은 빠짐)."""
+    offsets = {}
+    for match in _scanner(specs).finditer(text):
+        index = int(match.lastgroup[1:])
+        spec = specs[index]
+        if spec.name in offsets:
+            continue
+        close = spec.close_re.search(text, match.end())
+        if close:
+            offsets[spec.name] = (match.end(), close.end())
+        if len(offsets) == len(specs):
+            break
+    return offsets
+
+
+def locate(path, text, specs):
+    """파일 버전이 같으면 캐시된 오프셋을, 아니면 새로 스캔한 오프셋을 반환한다."""
+    path = os.path.abspath(path)
+    names = tuple(spec.name for spec in specs)
+    try:
+        key = _version_key(path)
+    except OSError:
+        key = None
+    cached = _offset_cache.get(path)
+    if key is not None and cached and cached[0] == key and cached[1] == names:
+        return cached[2]
+    offsets = find_slots(text, specs)
+    if key is not None:
+        _offset_cache[path] = (key, names, offsets)
+    return offsets
+
+
+def splice(text, offsets, specs, fragments):
+    """fragments를 끼운 새 텍스트와 새 오프셋을 반환한다. 모든 슬롯 내용이 같으면 (None, offsets)."""
+    by_name = {spec.name: spec for spec in specs}
+    edits = []
+    for name, fragment in fragments.items():
+        if name not in offsets:
+            continue
+        start, end = offsets[name]
+        rendered = by_name[name].render(fragment)
+        if text[start:end] != rendered:
+            edits.append((start, end, name, rendered))
+    if not edits:
+        return None, offsets
+
+    edits.sort()
+    parts = []
+    new_offsets = dict(offsets)
+    cursor = 0
+    shift = 0
+    for start, end, name, rendered in edits:
+        parts.append(text[cursor:start])
+        parts.append(rendered)
+        new_offsets[name] = (start + shift, start + shift + len(rendered))
+        shift += len(rendered) - (end - start)
+        cursor = end
+    parts.append(text[cursor:])
+
+    # 편집 구간 뒤에 있는 (편집되지 않은) 슬롯도 이동량만큼 보정한다.
+    for name, (start, end) in offsets.items():
+        if any(name == edit[2] for edit in edits):
+            continue
+        moved = sum(len(r) - (e - s) for s, e, _, r in edits if e <= start)
+        new_offsets[name] = (start + moved, end + moved)
+    return "".join(parts), new_offsets
+
+
+def render_file(path, fragments, specs=(INTELLIGENCE_HUB,)):
+    """파일을 읽어 슬롯을 채운다. (new_text | None, new_offsets, missing_slot_names) 반환."""
+    specs = tuple(specs)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    offsets = locate(path, text, specs)
+    missing = [name for name in fragments if name not in offsets]
+    new_text, new_offsets = splice(text, offsets, specs, fragments)
+    return new_text, new_offsets, missing
+
+
+def remember(path, offsets, specs=(INTELLIGENCE_HUB,)):
+    """방금 기록한 파일 버전에 대한 오프셋을 캐시한다 (다음 실행 전 재스캔 생략)."""
+    path = os.path.abspath(path)
+    try:
+        _offset_cache[path] = (_version_key(path), tuple(spec.name for spec in specs), offsets)
+    except OSError:
+        _offset_cache.pop(path, None)
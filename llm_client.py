@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# llm_client.py - LLM API 호출 공용 경로: 응답 시간 기록 + 헤지(hedged) 요청
+#
+# perplexity_auto.fetch_markdown, backfill_missing_categories.fetch_candidates,
+# enrich_with_claude(call_claude / 비동기 엔진)가 호출을 이 모듈로 감싼다.
+# - 엔드포인트 이름별 응답 시간을 .state/llm_latency.json에 최근 LLM_HEDGE_HISTORY건씩 기록한다
+#   (LLM_HEDGE=0이어도 기록은 쌓인다). 운영 상태이므로 로컬 실험·스탠드인 서버 테스트는
+#   LLM_LATENCY_PATH로 임시 경로를 지정해 돌린다 (가짜 응답 시간이 학습된 헤지 지연을 바꾼다).
+# - LLM_HEDGE=1이면 기록의 LLM_HEDGE_PERCENTILE 분위수(최소 LLM_HEDGE_MIN_DELAY초)만큼 기다려도
+#   응답이 없을 때 같은 요청을 한 번 더 보내고, 먼저 온 유효한 응답을 쓴다 (진 쪽 처리는 아래).
+#   기록이 LLM_HEDGE_MIN_SAMPLES건 미만인 엔드포인트는 헤지하지 않는다.
+# - 헤지 요청은 프로세스(실행)당 LLM_HEDGE_BUDGET건까지만 보낸다 (추가 과금 상한).
+# - 동기 호출(requests/SDK)은 데몬 스레드로 경주시킨다. 이미 나간 동기 요청은 중간에 끊을 수 없어
+#   진 쪽은 끝까지 실행되고(과금도 그대로) 결과만 버린다. 아직 요청 전이면 Attempt.session /
+#   Attempt.check()가 HedgeCancelled를 던져 보내지 않는다. 비동기 호출은 진 쪽 태스크를 cancel()로 실제 취소한다.
+# - 응답 시간은 호출 시작부터 채택된 응답까지다 (헤지로 이긴 경우 원 요청 지연의 하한).
+import atexit
+import math
+import os
+import queue
+import threading
+import time
+
+import news_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY_PATH = os.path.join(BASE_DIR, ".state", "llm_latency.json")
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "0").strip().lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+HEDGE_BUDGET = int(os.getenv("LLM_HEDGE_BUDGET", "4"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "5"))
+HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+HISTORY_SIZE = int(os.getenv("LLM_HEDGE_HISTORY", "100"))
+
+
+def percentile(values, pct):
+    """nearest-rank 분위수. 값이 없으면 None."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = math.ceil(pct / 100.0 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+class HedgeCancelled(Exception):
+    """이미 승패가 난 시도가 새 요청을 보내려 할 때."""
+
+
+class Attempt:
+    """경주 중인 시도 하나 (0 = 원 요청, 1 = 헤지 요청). session은 처음 쓸 때 만든다."""
+
+    def __init__(self, number):
+        self.number = number
+        self.cancelled = False
+        self._session = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """요청을 보내기 직전에 호출한다. 이미 진 시도면 HedgeCancelled."""
+        if self.cancelled:
+            raise HedgeCancelled(f"attempt {self.number} cancelled")
+
+    @property
+    def session(self):
+        with self._lock:
+            self.check()
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+            return self._session
+
+    def close(self):
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def cancel(self):
+        """진 시도를 표시한다. 진행 중인 요청은 끊기지 않는다 (세션 풀만 정리)."""
+        with self._lock:
+            self.cancelled = True
+        self.close()
+
+
+class Hedger:
+    def __init__(self, history_path=DEFAULT_HISTORY_PATH, enabled=HEDGE_ENABLED, pct=HEDGE_PERCENTILE,
+                 budget=HEDGE_BUDGET, min_samples=HEDGE_MIN_SAMPLES, min_delay=HEDGE_MIN_DELAY,
+                 history_size=HISTORY_SIZE):
+        self.history_path = history_path
+        self.enabled = enabled
+        self.pct = pct
+        self.budget = max(0, budget)
+        self.min_samples = max(1, min_samples)
+        self.min_delay = min_delay
+        self.history_size = max(1, history_size)
+        self._history = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.fired = 0
+        self.won = 0
+        self.denied = 0
+
+    def _samples(self, name, create=False):
+        if self._history is None:
+            document = news_store.read(self.history_path, default=None)
+            self._history = {}
+            if hasattr(document, "items"):
+                for key, values in document.items():
+                    if isinstance(values, list):
+                        self._history[key] = [float(v) for v in values if isinstance(v, (int, float))]
+        if create:
+            return self._history.setdefault(name, [])
+        return self._history.get(name, [])
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self._samples(name, create=True)
+            samples.append(round(seconds, 3))
+            del samples[: -self.history_size]
+            self._dirty = True
+
+    def hedge_after(self, name):
+        """헤지를 보낼 대기 시간(초). 꺼져 있거나 기록이 부족하면 None."""
+        if not self.enabled or self.budget <= 0:
+            return None
+        with self._lock:
+            samples = list(self._samples(name))
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(samples, self.pct))
+
+    def _take_budget(self, name, delay):
+        with self._lock:
+            if self.fired >= self.budget:
+                self.denied += 1
+                return False
+            self.fired += 1
+        print(f"llm_hedge: {name} 응답 {delay:.1f}s 초과 - 헤지 요청 ({self.fired}/{self.budget})")
+        return True
+
+    def _accept(self, name, started, number):
+        self.record(name, time.monotonic() - started)
+        if number:
+            with self._lock:
+                self.won += 1
+
+    def call(self, name, attempt_fn, valid=None):
+        """attempt_fn(Attempt) → 결과. 먼저 끝난 유효한 결과를 반환한다.
+
+        모든 시도가 실패하면 원 요청의 예외를 다시 던지거나 원 요청의 (무효) 결과를 반환한다.
+        """
+        valid = valid or (lambda result: True)
+        started = time.monotonic()
+        delay = self.hedge_after(name)
+        outcomes = queue.Queue()
+        attempts = []
+
+        def launch(number):
+            attempt = Attempt(number)
+            attempts.append(attempt)
+
+            def run():
+                try:
+                    outcomes.put((attempt, attempt_fn(attempt), None))
+                except BaseException as e:
+                    outcomes.put((attempt, None, e))
+
+            threading.Thread(target=run, name=f"llm-{name}-{number}", daemon=True).start()
+
+        launch(0)
+        failed = {}
+        hedge_pending = delay is not None
+        while True:
+            timeout = max(0.0, started + delay - time.monotonic()) if hedge_pending else None
+            try:
+                attempt, result, error = outcomes.get(timeout=timeout)
+            except queue.Empty:
+                hedge_pending = False
+                if self._take_budget(name, delay):
+                    launch(1)
+                continue
+            if error is None and valid(result):
+                for other in attempts:
+                    if other is not attempt:
+                        other.cancel()
+                attempt.close()
+                self._accept(name, started, attempt.number)
+                return result
+            attempt.close()
+            failed[attempt.number] = (result, error)
+            hedge_pending = False
+            if len(failed) == len(attempts):
+                # 실패는 헤지 사유가 아니다 (원 요청이 대기 시간 전에 실패하면 그대로 돌려준다).
+                result, error = failed[0]
+                if error is not None:
+                    raise error
+                return result
+
+    async def call_async(self, name, attempt_fn, valid=None):
+        """attempt_fn(number) → awaitable. call()과 같지만 진 쪽 태스크를 실제로 취소한다."""
+        import asyncio
+
+        valid = valid or (lambda result: True)
+        started = time.monotonic()
+        delay = self.hedge_after(name)
+        tasks = {asyncio.ensure_future(attempt_fn(0)): 0}
+        running = set(tasks)
+        failed = {}
+        hedge_pending = delay is not None
+        try:
+            while True:
+                timeout = max(0.0, started + delay - time.monotonic()) if hedge_pending else None
+                done, running = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_pending = False
+                    if self._take_budget(name, delay):
+                        task = asyncio.ensure_future(attempt_fn(1))
+                        tasks[task] = 1
+                        running.add(task)
+                    continue
+                for task in done:
+                    number = tasks[task]
+                    error = task.exception()
+                    result = None if error is not None else task.result()
+                    if error is None and valid(result):
+                        self._accept(name, started, number)
+                        return result
+                    failed[number] = (result, error)
+                if not running:
+                    result, error = failed[0]
+                    if error is not None:
+                        raise error
+                    return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or self._history is None:
+                return
+            snapshot = {name: list(values) for name, values in self._history.items()}
+            self._dirty = False
+        try:
+            news_store.atomic_write_json(self.history_path, snapshot, indent=None)
+        except OSError as e:
+            print(f"⚠️ llm_latency 기록 저장 실패: {e}")
+
+    def report(self):
+        return f"llm_hedge: fired={self.fired} won={self.won} denied={self.denied} budget={self.budget}"
+
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger():
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger(os.getenv("LLM_LATENCY_PATH", DEFAULT_HISTORY_PATH))
+            atexit.register(_save_at_exit)
+        return _hedger
+
+
+def _save_at_exit():
+    if _hedger is not None:
+        if _hedger.fired or _hedger.denied:
+            print(_hedger.report())
+        _hedger.save()
+
+
+def hedged(name, attempt_fn, valid=None):
+    return get_hedger().call(name, attempt_fn, valid=valid)
+
+
+async def hedged_async(name, attempt_fn, valid=None):
+    return await get_hedger().call_async(name, attempt_fn, valid=valid)
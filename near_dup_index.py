@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# near_dup_index.py - SimHash 기반 근사 중복(near-duplicate) 인덱스
+#
+# 제목+요약을 문자 2-gram shingle로 쪼개 64bit SimHash를 만들고,
+# 지문을 (max_distance + 1)개 밴드로 나눠 밴드 값 → 항목 목록 dict로 색인한다.
+# 해밍 거리 max_distance 이하인 두 지문은 비둘기집 원리로 최소 1개 밴드가 일치하므로
+# 조회는 밴드 수만큼의 dict lookup + 소수 후보 비교로 끝난다.
+#
+# news_hub(Daily Bridge 슬롯), backfill(후보 probe 전), enrich(Claude 호출 전)가 공유한다.
+# 기본 저장 위치는 운영 상태인 .state/near_dup_index.json이다. 로컬 실험은 NEAR_DUP_INDEX_PATH로
+# 임시 경로를 지정해 돌린다 (가짜 지문이 쌓이면 실제 기사가 근사 중복으로 걸러진다).
+import json
+import os
+from collections import deque
+import re
+import struct
+import time
+import zlib
+
+import news_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_PATH = os.getenv("NEAR_DUP_INDEX_PATH") or os.path.join(BASE_DIR, ".state", "near_dup_index.json")
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 2
+MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "7"))
+MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "2000"))
+
+_SEED = 0x9E3779B9
+_BIT_TABLES = [bytes((value >> bit) & 1 for value in range(256)) for bit in range(8)]
+
+
+def normalize_text(text):
+    text = str(text or "").lower()
+    text = re.sub(r"https?://\S+", " ", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def item_text(item):
+    """뉴스 아이템(dict)에서 지문 대상 텍스트(제목+요약)를 만든다."""
+    return f"{item.get('title', '')} {item.get('summary', '')}"
+
+
+def simhash(text):
+    normalized = normalize_text(text)
+    if not normalized:
+        return 0
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+    # shingle별 64bit 해시를 한 버퍼에 모은 뒤, 바이트 열(column)마다 비트 테이블 translate + count로
+    # 비트별 1의 개수를 C 루프에서 센다 (shingle × 64 파이썬 루프 대비 수십 배 빠름).
+    blob = b"".join(
+        struct.pack(">II", zlib.crc32(encoded), zlib.crc32(encoded, _SEED))
+        for encoded in (shingle.encode("utf-8") for shingle in shingles)
+    )
+    total = len(shingles)
+    fingerprint = 0
+    for byte_index in range(8):
+        column = blob[byte_index::8]
+        for bit in range(8):
+            if column.translate(_BIT_TABLES[bit]).count(1) * 2 > total:
+                fingerprint |= 1 << (byte_index * 8 + bit)
+    return fingerprint
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDupIndex:
+    """밴드 분할 SimHash 인덱스. path가 있으면 load/save로 실행 간 유지된다."""
+
+    def __init__(self, path=None, max_distance=MAX_DISTANCE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self._entries = deque()  # [fingerprint, key, data], 오래된 순
+        self._buckets = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH, **kwargs):
+        index = cls(path=path, **kwargs)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            for fp_hex, key, data in payload.get("entries", []):
+                index._insert(int(fp_hex, 16), key, data)
+        except Exception:
+            pass
+        index._dirty = False
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, (fingerprint >> (band * self.band_bits)) & mask) for band in range(self.bands)]
+
+    def _insert(self, fingerprint, key, data=None):
+        entry = [fingerprint, key, data]
+        self._entries.append(entry)
+        for band_key in self._band_keys(fingerprint):
+            self._buckets.setdefault(band_key, []).append(entry)
+        self._dirty = True
+
+    def _evict_oldest(self):
+        # 버킷도 삽입 순이라 가장 오래된 항목은 보통 맨 앞에 있다 → 전체 재색인 없이 O(밴드 수).
+        entry = self._entries.popleft()
+        for band_key in self._band_keys(entry[0]):
+            bucket = self._buckets.get(band_key)
+            if not bucket:
+                continue
+            for position, candidate in enumerate(bucket):
+                if candidate is entry:
+                    del bucket[position]
+                    break
+            if not bucket:
+                del self._buckets[band_key]
+        self._dirty = True
+
+    def query(self, text, fingerprint=None):
+        """가장 가까운 근사 중복 (key, data, distance)를 반환한다. 없으면 None."""
+        fingerprint = simhash(text) if fingerprint is None else fingerprint
+        if not fingerprint:
+            return None
+        best = None
+        for band_key in self._band_keys(fingerprint):
+            for entry in self._buckets.get(band_key, ()):
+                distance = hamming(fingerprint, entry[0])
+                if distance <= self.max_distance and (best is None or distance < best[2]):
+                    best = (entry[1], entry[2], distance)
+        return best
+
+    def add(self, text, key, data=None, fingerprint=None):
+        fingerprint = simhash(text) if fingerprint is None else fingerprint
+        if not fingerprint:
+            return
+        self._insert(fingerprint, key, data)
+        if self.max_entries:
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def check_and_add(self, text, key, data=None):
+        """근사 중복이면 기존 매치를 반환하고, 아니면 색인에 추가한 뒤 None을 반환한다."""
+        fingerprint = simhash(text)
+        hit = self.query(text, fingerprint=fingerprint)
+        if hit is None:
+            self.add(text, key, data, fingerprint=fingerprint)
+        return hit
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        payload = {
+            "saved_at": int(time.time()),
+            "max_distance": self.max_distance,
+            "entries": [[f"{fp:016x}", key, data] for fp, key, data in self._entries],
+        }
+        news_store.atomic_write_json(self.path, payload, indent=None)
+        self._dirty = False
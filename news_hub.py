@@ -2,26 +2,47 @@
 # news_hub.py (로컬 규칙 기반 뉴스 분석 + Daily Bridge)
 import os
 import re
+import functools
+import glob
+import heapq
+import itertools
 import logging
 from datetime import datetime
 import json
 import shutil
-import tempfile
-import requests
-
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    def load_dotenv(*args, **kwargs):
-        return False
-
-# .env 파일 로드
-load_dotenv()
 
 # 경로 설정
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# .env 파일 로드 (파일이 있을 때만 dotenv를 import).
+# 아래 로컬 모듈들이 import 시점에 환경변수를 읽으므로 그보다 먼저 실행한다.
+if os.path.exists(os.path.join(BASE_DIR, ".env")):
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+import detection_journal  # noqa: E402
+import feed_fetcher  # noqa: E402
+import news_store  # noqa: E402
+import publish_fanout  # noqa: E402
+from near_dup_index import NearDupIndex  # noqa: E402
+
 WORK_DIR = BASE_DIR
 DAILY_BRIDGE_PATH = os.path.join(BASE_DIR, "Daily_Bridge.md")
+RADAR_PATH = os.path.join(BASE_DIR, "Project_Radar.md")
+RADAR_ARCHIVE_DIR = os.path.join(BASE_DIR, "data", "radar_archive")
+RADAR_MAX_BYTES = int(os.getenv("RADAR_MAX_BYTES", str(256 * 1024)))
+RADAR_HEADER = "# Project Radar - 뉴스 감지 로그\n\n"
+STATE_DIR = os.path.join(BASE_DIR, ".state")
+
+# 스트리밍 모드: 소스→필터→브릿지를 generator로 연결해 대량 backlog도 상수 메모리로 처리
+PIPELINE_STREAMING = os.getenv("NEWS_PIPELINE_STREAMING", "").strip().lower() == "true"
+NEWS_REPLAY_GLOB = os.getenv("NEWS_REPLAY_GLOB", "").strip()
+PERSIST_CHUNK_SIZE = int(os.getenv("NEWS_PERSIST_CHUNK_SIZE", "500"))
+RADAR_SYNC_STATE_FILE = os.path.join(STATE_DIR, "radar_sync_state.json")
 
 ANTIGRAVITY_PATH = os.getenv("ANTIGRAVITY_PATH", "").strip()
 if not ANTIGRAVITY_PATH:
@@ -49,6 +70,15 @@ CATEGORY_RULES = {
     "global_biz": ["규제", "시장", "정책", "관세", "수출", "비즈니스", "투자", "글로벌", "market", "regulation", "policy", "trade", "economy", "approval"],
 }
 
+HIGH_IMPACT_KEYWORDS = ["절감", "효율", "혁신", "긴급", "fda", "blackwell", "배양육", "균사체"]
+
+COST_ACTION_KEYWORDS = ["절감", "효율", "발효"]
+SAFETY_ACTION_KEYWORDS = ["리스테리아", "listeria", "fda", "긴급"]
+INFRA_ACTION_KEYWORDS = ["gpu", "blackwell", "ai", "인프라"]
+
+# 짧은 영문 키워드는 단어/한글 음절 경계에서만 매칭 (예: "said", "Thailand" 안의 ai 제외)
+WORD_BOUNDARY_KEYWORDS = {"ai"}
+
 REQUIRED_KEYS = {"id", "category", "title", "summary"}
 
 logging.basicConfig(
@@ -58,47 +88,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def atomic_write_json(file_path, data, ensure_ascii=False, indent=2):
-    """JSON 파일을 원자적으로 저장하고 디스크 반영까지 보장한다."""
-    target_path = os.path.abspath(file_path)
-    target_dir = os.path.dirname(target_path) or "."
-    os.makedirs(target_dir, exist_ok=True)
-
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=target_dir,
-            prefix=f".{os.path.basename(target_path)}.",
-            suffix=".tmp",
-            delete=False,
-        ) as f:
-            tmp_path = f.name
-            json.dump(data, f, ensure_ascii=ensure_ascii, indent=indent)
-            f.flush()
-            os.fsync(f.fileno())
-
-        os.replace(tmp_path, target_path)
-
-        try:
-            dir_fd = os.open(target_dir, os.O_RDONLY)
-            try:
-                os.fsync(dir_fd)
-            finally:
-                os.close(dir_fd)
-        except OSError:
-            pass
-
-    except Exception:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
-        raise
-
-
 def validate_news_items_schema(items, context="news.json"):
     """REQUIRED_KEYS 기준으로 뉴스 아이템 스키마를 검증하고 유효 항목만 반환한다."""
     valid_items = []
@@ -133,81 +122,222 @@ def validate_news_items_schema(items, context="news.json"):
     return valid_items, invalid_count
 
 
-def score_news(news_text, matched_keywords):
+def _is_word_char(ch):
+    """경계 판정용: 한글 음절/자모는 단어 문자로 보지 않는다."""
+    if "\uac00" <= ch <= "\ud7a3" or "\u1100" <= ch <= "\u11ff" or "\u3130" <= ch <= "\u318f":
+        return False
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordProfile:
+    """텍스트 1건의 키워드 매칭 결과 (필터/점수/분류/액션이 공유)."""
+
+    __slots__ = ("hits", "_matcher")
+
+    def __init__(self, hits, matcher):
+        self.hits = hits
+        self._matcher = matcher
+
+    def matched(self, group):
+        """그룹 내 매칭된 키워드를 설정 순서/원래 표기로 반환한다."""
+        return [original for original, lowered in self._matcher.groups[group] if lowered in self.hits]
+
+    def count(self, group):
+        return sum(1 for _, lowered in self._matcher.groups[group] if lowered in self.hits)
+
+    def has_any(self, group):
+        return any(lowered in self.hits for _, lowered in self._matcher.groups[group])
+
+
+class KeywordMatcher:
+    """설정 키워드 전체를 단일 정규식 오토마톤으로 컴파일해 텍스트를 1회만 스캔한다.
+
+    lookahead 교대(가장 긴 needle 우선)로 위치마다 최장 매칭을 찾고,
+    그 안에 포함된 짧은 needle은 미리 계산한 포함 관계로 함께 기록한다.
+    """
+
+    def __init__(self, groups, boundary_needles=()):
+        self.groups = {
+            name: tuple((needle, needle.lower()) for needle in dict.fromkeys(needles))
+            for name, needles in groups.items()
+        }
+        self.boundary_needles = frozenset(needle.lower() for needle in boundary_needles)
+
+        needles = sorted(
+            {lowered for entries in self.groups.values() for _, lowered in entries if lowered},
+            key=lambda needle: (-len(needle), needle),
+        )
+        self._implied = {}
+        for outer in needles:
+            implied = []
+            for inner in needles:
+                start = outer.find(inner)
+                while start != -1:
+                    implied.append((inner, start))
+                    start = outer.find(inner, start + 1)
+            self._implied[outer] = tuple(implied)
+
+        if needles:
+            self._pattern = re.compile("(?=(" + "|".join(re.escape(n) for n in needles) + "))")
+        else:
+            self._pattern = None
+
+    def _bounded(self, text, start, length):
+        end = start + length
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def scan(self, text):
+        lowered = (text or "").lower()
+        hits = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(lowered):
+                position = match.start()
+                for needle, offset in self._implied[match.group(1)]:
+                    if needle in hits:
+                        continue
+                    if needle in self.boundary_needles and not self._bounded(lowered, position + offset, len(needle)):
+                        continue
+                    hits.add(needle)
+        return KeywordProfile(frozenset(hits), self)
+
+
+def build_keyword_matcher(keywords=KEYWORDS, exclude=EXCLUDE_KEYWORDS):
+    groups = {
+        "keywords": keywords,
+        "exclude": exclude,
+        "high_impact": HIGH_IMPACT_KEYWORDS,
+        "action_cost": COST_ACTION_KEYWORDS,
+        "action_safety": SAFETY_ACTION_KEYWORDS,
+        "action_infra": INFRA_ACTION_KEYWORDS,
+    }
+    for category, needles in CATEGORY_RULES.items():
+        groups[f"category:{category}"] = needles
+    return KeywordMatcher(groups, boundary_needles=WORD_BOUNDARY_KEYWORDS)
+
+
+KEYWORD_MATCHER = build_keyword_matcher()
+
+
+@functools.lru_cache(maxsize=4096)
+def scan_keywords(news_text):
+    """기본 설정 매처로 텍스트를 스캔한다 (동일 텍스트는 캐시 재사용)."""
+    return KEYWORD_MATCHER.scan(news_text)
+
+
+@functools.lru_cache(maxsize=16)
+def _custom_matcher(keywords, exclude):
+    return build_keyword_matcher(list(keywords), list(exclude))
+
+
+def score_news(news_text, matched_keywords, profile=None):
     """로컬 점수 계산"""
-    text_lower = news_text.lower()
+    profile = profile or scan_keywords(news_text)
     score = 5.0
 
-    high_impact = ["절감", "효율", "혁신", "긴급", "fda", "blackwell", "배양육", "균사체"]
-    for keyword in high_impact:
-        if keyword.lower() in text_lower:
-            score += 0.8
+    score += profile.count("high_impact") * 0.8
 
     score += min(len(matched_keywords) * 0.6, 2.0)
     score = max(1.0, min(10.0, score))
     return round(score, 1)
 
 
-def classify_news_category(news_text, matched_keywords=None):
-    matched_keywords = matched_keywords or []
-    probe = f"{news_text} {' '.join(matched_keywords)}".lower()
+def classify_news_category(news_text, matched_keywords=None, profile=None):
+    if profile is None:
+        matched_keywords = matched_keywords or []
+        profile = scan_keywords(f"{news_text} {' '.join(matched_keywords)}")
 
     for category in ["listeria_free", "cultured_meat", "high_end_audio", "computer_ai"]:
-        if any(needle.lower() in probe for needle in CATEGORY_RULES[category]):
+        if profile.has_any(f"category:{category}"):
             return category
 
-    if any(needle.lower() in probe for needle in CATEGORY_RULES["global_biz"]):
+    if profile.has_any("category:global_biz"):
         return "global_biz"
 
     return "global_biz"
 
 # 1. 키워드 필터링 함수
-def filter_by_keywords(news_text, keywords=KEYWORDS, exclude=EXCLUDE_KEYWORDS):
+def filter_by_keywords(news_text, keywords=KEYWORDS, exclude=EXCLUDE_KEYWORDS, profile=None):
     """특정 키워드가 포함된 뉴스만 선택"""
-    text_lower = news_text.lower()
-    
+    if profile is None:
+        if keywords is KEYWORDS and exclude is EXCLUDE_KEYWORDS:
+            profile = scan_keywords(news_text)
+        else:
+            profile = _custom_matcher(tuple(keywords), tuple(exclude)).scan(news_text)
+
     # 제외 키워드 확인
-    for exclude_kw in exclude:
-        if exclude_kw.lower() in text_lower:
-            return False, "제외 키워드 포함"
-    
+    if profile.has_any("exclude"):
+        return False, "제외 키워드 포함"
+
     # 포함 키워드 확인
-    matched_keywords = [kw for kw in keywords if kw.lower() in text_lower]
+    matched_keywords = profile.matched("keywords")
     if matched_keywords:
         return True, matched_keywords
-    
+
     return False, "관련 키워드 없음"
 
 
 # 2. 정보 수집 (RSS/API)
-def fetch_news():
-    """뉴스 데이터 수집 (2026년 시장 트렌드 시뮬레이션)"""
-    # 실제 운영 시: NewsAPI나 RSS 피드를 연동합니다.
-    sample_news = [
-        "미국 내 배양육 시장, 고비용 문제로 세포 배양 방식에서 균사체(Mycelium) 기반 발효 방식으로 급격한 이동 중",
-        "Better Meat Co 및 Prime Roots, 산업용 연속 발효 시스템 도입으로 생산 단가 30% 절감 성공",
-        "2026년 푸드테크 트렌드: 'Precision Fermentation'과 버섯 균사체를 결합한 하이브리드 단백질 부상",
-        "FDA 리스테리아 긴급 알림 발표 - 냉장 식품 관련",
-        "고급 오디오 기술 최신 동향 - DSD 포맷 주류화",
-        "NVIDIA Blackwell GPU, AI 인프라 혁신 주도",
-        "스타트업 광고: 새 제품 출시 스폰서됨 (제외 대상)",
-    ]
-    return sample_news
+SAMPLE_NEWS = [
+    "미국 내 배양육 시장, 고비용 문제로 세포 배양 방식에서 균사체(Mycelium) 기반 발효 방식으로 급격한 이동 중",
+    "Better Meat Co 및 Prime Roots, 산업용 연속 발효 시스템 도입으로 생산 단가 30% 절감 성공",
+    "2026년 푸드테크 트렌드: 'Precision Fermentation'과 버섯 균사체를 결합한 하이브리드 단백질 부상",
+    "FDA 리스테리아 긴급 알림 발표 - 냉장 식품 관련",
+    "고급 오디오 기술 최신 동향 - DSD 포맷 주류화",
+    "NVIDIA Blackwell GPU, AI 인프라 혁신 주도",
+    "스타트업 광고: 새 제품 출시 스폰서됨 (제외 대상)",
+]
+
+
+def iter_news_sources():
+    """뉴스를 1건씩 yield 한다
+
+    우선순위: NEWS_REPLAY_GLOB(원시 피드 파일 재생) → RSS/Atom 피드(NEWS_FEEDS/feeds.txt) → 샘플
+    """
+    if not NEWS_REPLAY_GLOB:
+        feeds = feed_fetcher.configured_feeds()
+        if feeds:
+            for entry in feed_fetcher.iter_feed_entries(feeds):
+                yield feed_fetcher.entry_text(entry)
+            return
+        yield from SAMPLE_NEWS
+        return
+
+    for path in sorted(glob.glob(NEWS_REPLAY_GLOB)):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                text = line.strip()
+                if not text or text.startswith("#"):
+                    continue
+                if text.startswith("- "):
+                    text = text[2:].strip()
+                if text:
+                    yield text
+
+
+def fetch_news(streaming=False):
+    """뉴스 데이터 수집 (RSS/Atom 피드, 미설정 시 2026년 시장 트렌드 시뮬레이션)"""
+    if streaming:
+        return iter_news_sources()
+    return list(iter_news_sources())
 
 
 # 3. 전략적 필터링 (로컬 규칙 기반)
-def analyze_importance(news_text, matched_keywords):
+def analyze_importance(news_text, matched_keywords, profile=None):
     """로컬 규칙 기반 뉴스 중요도 분석"""
-    score = score_news(news_text, matched_keywords)
+    profile = profile or scan_keywords(news_text)
+    score = score_news(news_text, matched_keywords, profile=profile)
     title = news_text[:48] + ("..." if len(news_text) > 48 else "")
 
     actions = []
-    lower_text = news_text.lower()
-    if any(keyword in lower_text for keyword in ["절감", "효율", "발효"]):
+    if profile.has_any("action_cost"):
         actions.append("비용 절감 PoC 우선 검토")
-    if any(keyword in lower_text for keyword in ["리스테리아", "listeria", "fda", "긴급"]):
+    if profile.has_any("action_safety"):
         actions.append("식품안전 모니터링 카드 즉시 생성")
-    if any(keyword in lower_text for keyword in ["gpu", "blackwell", "ai", "인프라"]):
+    if profile.has_any("action_infra"):
         actions.append("인프라 투자/업그레이드 영향도 계산")
     if not actions:
         actions.append("주간 회의 안건으로 추적")
@@ -219,110 +349,171 @@ def analyze_importance(news_text, matched_keywords):
     )
 
 
-# 3-1. Daily Bridge 생성 함수 (새로운 기능!)
-def create_daily_bridge(news_data_list):
-    """
-    매일 수집된 뉴스 중 TOP 3을 정제하여 Daily_Bridge.md 생성
-    이 파일이 VS Code ↔ Antigravity 연결점
+class NewsFeatures:
+    """filter_and_analyze에서 1회 계산해 브릿지 구성/렌더링이 재사용하는 아이템 특성."""
+
+    __slots__ = ("score", "category", "global_signal", "action_line")
+
+    def __init__(self, score, category, global_signal, action_line):
+        self.score = score
+        self.category = category
+        self.global_signal = global_signal
+        self.action_line = action_line
+
+
+def build_news_features(news_text, matched_keywords, profile=None):
+    if profile is None:
+        profile = scan_keywords(f"{news_text} {' '.join(matched_keywords)}")
+
+    action_line = "주간 트래킹 유지"
+    if profile.has_any("action_cost"):
+        action_line = "비용 절감 실험 항목 우선 배치"
+    elif profile.has_any("action_safety"):
+        action_line = "식품안전 대응 시나리오 점검"
+    elif profile.has_any("action_infra"):
+        action_line = "서버 인프라 대응 계획 업데이트"
+
+    return NewsFeatures(
+        score=score_news(news_text, matched_keywords, profile=profile),
+        category=classify_news_category(news_text, matched_keywords, profile=profile),
+        global_signal=profile.has_any("category:global_biz"),
+        action_line=action_line,
+    )
+
+
+class _TopK:
+    """텍스트 기준 중복을 제거하며 점수 상위 k개만 유지하는 bounded min-heap.
+
+    동점은 먼저 들어온 항목(seq가 작은 쪽)을 우선해 sorted(reverse=True)와 같은 순서를 낸다.
     """
-    if not news_data_list:
-        logger.warning("   ⚠️ 분석할 뉴스가 없습니다.")
-        return
-    
-    timestamp = datetime.now().strftime("%Y년 %m월 %d일 %H:%M:%S")
-    
-    chapter_defs = [
-        ("listeria_free", "리스테리아/식품안전", CATEGORY_RULES["listeria_free"]),
-        ("cultured_meat", "배양육/균사체", CATEGORY_RULES["cultured_meat"]),
-        ("high_end_audio", "하이엔드 오디오", CATEGORY_RULES["high_end_audio"]),
-        ("computer_ai", "컴퓨터/AI", CATEGORY_RULES["computer_ai"]),
-        ("global_biz", "글로벌 비즈니스/규제", CATEGORY_RULES["global_biz"]),
-    ]
 
-    def classify_category(item):
-        text = item.get("text", "")
-        keywords = item.get("keywords", [])
-        return classify_news_category(text, keywords)
+    __slots__ = ("k", "_heap", "_texts")
 
-    def has_global_signal(item):
-        text = item.get("text", "")
-        keywords = item.get("keywords", [])
-        probe = f"{text} {' '.join(keywords)}".lower()
-        global_needles = chapter_defs[-1][2]
-        return any(needle.lower() in probe for needle in global_needles)
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._texts = set()
 
-    def add_unique(bucket_list, item):
-        text = item.get("text", "")
-        if any(existing.get("text", "") == text for existing in bucket_list):
+    def offer(self, score, seq, text, item):
+        if text in self._texts:
             return
-        bucket_list.append(item)
-
-    buckets = {category: [] for category, _, _ in chapter_defs}
-    for item in news_data_list:
-        category = classify_category(item)
-        add_unique(buckets[category], item)
-        if category != "global_biz" and has_global_signal(item):
-            add_unique(buckets["global_biz"], item)
-
-    for category in buckets:
-        buckets[category] = sorted(
-            buckets[category],
-            key=lambda item: score_news(item.get("text", ""), item.get("keywords", [])),
-            reverse=True,
-        )[:3]
-
-    min_global_items = 2
-    if len(buckets["global_biz"]) < min_global_items and news_data_list:
-        ranked_all = sorted(
-            news_data_list,
-            key=lambda item: score_news(item.get("text", ""), item.get("keywords", [])),
-            reverse=True,
-        )
-        for candidate in ranked_all:
-            add_unique(buckets["global_biz"], candidate)
-            if len(buckets["global_biz"]) >= min_global_items:
-                break
-
-    sections = ["## 레이더 감지 결과 (5챕터)", ""]
-    for chapter_index, (category, chapter_title, _) in enumerate(chapter_defs, 1):
-        sections.append(f"## {chapter_index}장. {chapter_title} ({category})")
-        chapter_items = buckets.get(category, [])
-
-        if not chapter_items:
-            sections.extend([
-                "- 원문: 해당 카테고리 감지 뉴스 없음",
-                "- 영향도: 0/10",
-                "- 실행 인사이트: 다음 수집 주기에 재확인",
-                "",
-            ])
-            continue
+        entry = (score, -seq, text, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            self._texts.discard(evicted[2])
+        else:
+            return
+        self._texts.add(text)
 
-        for item_index, item in enumerate(chapter_items, 1):
-            text = item.get("text", "")
-            keywords = item.get("keywords", [])
-            score = score_news(text, keywords)
-            action_line = "주간 트래킹 유지"
-            lower_text = text.lower()
-            if any(keyword in lower_text for keyword in ["절감", "효율", "발효"]):
-                action_line = "비용 절감 실험 항목 우선 배치"
-            elif any(keyword in lower_text for keyword in ["리스테리아", "listeria", "fda", "긴급"]):
-                action_line = "식품안전 대응 시나리오 점검"
-            elif any(keyword in lower_text for keyword in ["gpu", "blackwell", "ai", "인프라"]):
-                action_line = "서버 인프라 대응 계획 업데이트"
-
-            title = text[:45] + ("..." if len(text) > 45 else "")
-            sections.extend([
-                f"### {item_index}. {title}",
-                f"- 원문: {text}",
-                f"- 영향도: {score}/10",
-                f"- 실행 인사이트: {action_line}",
-                "",
-            ])
+    def ranked(self):
+        return [entry[3] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
 
-    bridge_content = "\n".join(sections).strip()
-    
-    # Daily_Bridge.md 생성
-    full_content = f"""# 📡 Daily Bridge - {timestamp}
+
+BRIDGE_CHAPTERS = [
+    ("listeria_free", "리스테리아/식품안전", CATEGORY_RULES["listeria_free"]),
+    ("cultured_meat", "배양육/균사체", CATEGORY_RULES["cultured_meat"]),
+    ("high_end_audio", "하이엔드 오디오", CATEGORY_RULES["high_end_audio"]),
+    ("computer_ai", "컴퓨터/AI", CATEGORY_RULES["computer_ai"]),
+    ("global_biz", "글로벌 비즈니스/규제", CATEGORY_RULES["global_biz"]),
+]
+
+
+# 3-1. Daily Bridge 생성 함수 (새로운 기능!)
+class DailyBridgeBuilder:
+    """아이템을 1건씩 받아 챕터별 top-3 heap과 카운터만 유지하는 Daily Bridge 빌더.
+
+    리스트 모드(create_daily_bridge)와 스트리밍 모드(persist)가 같은 빌더를 쓴다.
+    """
+
+    def __init__(self, per_chapter=3, min_global_items=2):
+        self.min_global_items = min_global_items
+        self.buckets = {category: _TopK(per_chapter) for category, _, _ in BRIDGE_CHAPTERS}
+        self.ranked_all = _TopK(min_global_items + 1)
+        self.near_dups = NearDupIndex()
+        self.count = 0
+        self.near_dup_skipped = 0
+
+    def add(self, item):
+        seq = self.count
+        self.count += 1
+        text = item.get("text", "")
+        # 표현만 바뀐 같은 기사(다른 매체/제목 변형)가 챕터 슬롯을 차지하지 않도록 먼저 걸러낸다.
+        hit = self.near_dups.check_and_add(text, seq)
+        if hit is not None:
+            self.near_dup_skipped += 1
+            return
+        features = item.get("features") or build_news_features(text, item.get("keywords", []))
+        self.buckets[features.category].offer(features.score, seq, text, item)
+        if features.category != "global_biz" and features.global_signal:
+            self.buckets["global_biz"].offer(features.score, seq, text, item)
+        self.ranked_all.offer(features.score, seq, text, item)
+
+    def chapters(self):
+        buckets = {category: bucket.ranked() for category, bucket in self.buckets.items()}
+
+        if len(buckets["global_biz"]) < self.min_global_items and self.count:
+            global_texts = {item.get("text", "") for item in buckets["global_biz"]}
+            for candidate in self.ranked_all.ranked():
+                text = candidate.get("text", "")
+                if text in global_texts:
+                    continue
+                buckets["global_biz"].append(candidate)
+                global_texts.add(text)
+                if len(buckets["global_biz"]) >= self.min_global_items:
+                    break
+
+        return buckets
+
+    def write(self, path=None):
+        """
+        매일 수집된 뉴스 중 TOP 3을 정제하여 Daily_Bridge.md 생성
+        이 파일이 VS Code ↔ Antigravity 연결점
+        """
+        if not self.count:
+            logger.warning("   ⚠️ 분석할 뉴스가 없습니다.")
+            return
+
+        path = path or DAILY_BRIDGE_PATH
+        if self.near_dup_skipped:
+            logger.info("   ℹ️ 근사 중복 %d건 제외", self.near_dup_skipped)
+        timestamp = datetime.now().strftime("%Y년 %m월 %d일 %H:%M:%S")
+        buckets = self.chapters()
+
+        sections = ["## 레이더 감지 결과 (5챕터)", ""]
+        for chapter_index, (category, chapter_title, _) in enumerate(BRIDGE_CHAPTERS, 1):
+            sections.append(f"## {chapter_index}장. {chapter_title} ({category})")
+            chapter_items = buckets.get(category, [])
+
+            if not chapter_items:
+                sections.extend([
+                    "- 원문: 해당 카테고리 감지 뉴스 없음",
+                    "- 영향도: 0/10",
+                    "- 실행 인사이트: 다음 수집 주기에 재확인",
+                    "",
+                ])
+                continue
+
+            for item_index, item in enumerate(chapter_items, 1):
+                text = item.get("text", "")
+                features = item.get("features") or build_news_features(text, item.get("keywords", []))
+                score = features.score
+                action_line = features.action_line
+
+                title = text[:45] + ("..." if len(text) > 45 else "")
+                sections.extend([
+                    f"### {item_index}. {title}",
+                    f"- 원문: {text}",
+                    f"- 영향도: {score}/10",
+                    f"- 실행 인사이트: {action_line}",
+                    "",
+                ])
+
+        bridge_content = "\n".join(sections).strip()
+
+        # Daily_Bridge.md 생성
+        full_content = f"""# 📡 Daily Bridge - {timestamp}
 
 **이 파일은 VS Code와 Antigravity를 연결하는 인사이트 브릿지입니다.**
 
@@ -338,16 +529,24 @@ def create_daily_bridge(news_data_list):
 
 생성 시각: {timestamp}
 """
-    
-    # 파일 저장
-    try:
-        with open(DAILY_BRIDGE_PATH, "w", encoding="utf-8") as f:
-            f.write(full_content)
-        logger.info("   ✅ Daily_Bridge.md 생성 완료: %s", DAILY_BRIDGE_PATH)
-        return DAILY_BRIDGE_PATH
-    except Exception as e:
-        logger.error("   ⚠️ Daily_Bridge.md 저장 실패: %s", str(e))
-        return None
+
+        # 파일 저장
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(full_content)
+            logger.info("   ✅ Daily_Bridge.md 생성 완료: %s", path)
+            return path
+        except Exception as e:
+            logger.error("   ⚠️ Daily_Bridge.md 저장 실패: %s", str(e))
+            return None
+
+
+def create_daily_bridge(news_data_list):
+    """리스트 입력으로 Daily_Bridge.md 생성 (DailyBridgeBuilder 래퍼)"""
+    builder = DailyBridgeBuilder()
+    for item in news_data_list or []:
+        builder.add(item)
+    return builder.write()
 
 
 def append_daily_bridge_to_news_json(bridge_path, category="global_biz"):
@@ -355,7 +554,7 @@ def append_daily_bridge_to_news_json(bridge_path, category="global_biz"):
         logger.warning("   ⚠️ Daily Bridge 파일이 없어 news.json 추가를 건너뜁니다.")
         return False
 
-    news_json_path = os.path.join(BASE_DIR, "data", "normalized", "news.json")
+    news_json_path = news_store.NORMALIZED_NEWS_JSON
 
     try:
         with open(bridge_path, "r", encoding="utf-8") as f:
@@ -391,10 +590,8 @@ def append_daily_bridge_to_news_json(bridge_path, category="global_biz"):
     summary = summary[:180]
 
     try:
-        if os.path.exists(news_json_path):
-            with open(news_json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
+        data = news_store.checkout(news_json_path, default=None)
+        if data is None:
             data = {"generated_at": datetime.now().isoformat(), "items": []}
 
         items, _ = validate_news_items_schema(data.get("items", []), context=news_json_path)
@@ -418,7 +615,7 @@ def append_daily_bridge_to_news_json(bridge_path, category="global_biz"):
         data["generated_at"] = datetime.now().isoformat()
         data["items"] = items
 
-        atomic_write_json(news_json_path, data, ensure_ascii=False, indent=2)
+        news_store.write(news_json_path, data)
 
         logger.info("   ✅ Daily Bridge가 news.json에 추가되었습니다: %s", news_json_path)
         return True
@@ -428,12 +625,8 @@ def append_daily_bridge_to_news_json(bridge_path, category="global_biz"):
 
 
 def sync_news_hub_source_from_canonical():
-    normalized_path = os.path.join(BASE_DIR, "data", "normalized", "news.json")
-    canonical_path = os.path.join(
-        os.path.abspath(os.path.join(BASE_DIR, "..")),
-        "woonmok.github.io",
-        "news.json",
-    )
+    normalized_path = news_store.NORMALIZED_NEWS_JSON
+    canonical_path = news_store.CANONICAL_NEWS_JSON
 
     candidates = [normalized_path, canonical_path]
     valid_sources = []
@@ -442,8 +635,7 @@ def sync_news_hub_source_from_canonical():
         if not os.path.exists(candidate):
             continue
         try:
-            with open(candidate, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
+            loaded = news_store.checkout(candidate)
             items, _ = validate_news_items_schema(loaded.get("items", []), context=candidate)
             if isinstance(items, list) and len(items) >= 20:
                 loaded["items"] = items
@@ -458,65 +650,162 @@ def sync_news_hub_source_from_canonical():
     chosen_path, chosen_data, _ = max(valid_sources, key=lambda item: item[2])
 
     try:
-        atomic_write_json(normalized_path, chosen_data, ensure_ascii=False, indent=2)
-        atomic_write_json(canonical_path, chosen_data, ensure_ascii=False, indent=2)
-        logger.info(
-            "   ✅ news.json 양방향 동기화 완료: source=%s (items=%d)",
-            chosen_path,
-            len(chosen_data.get("items", [])),
-        )
-        return True
+        payload = news_store.serialize_json(chosen_data)
+        report = publish_fanout.publish({normalized_path: payload, canonical_path: payload})
     except Exception as e:
         logger.error("   ⚠️ news.json 양방향 동기화 실패: %s", str(e))
         return False
 
+    for result in report.results:
+        if result.status not in ("written", "unchanged"):
+            logger.error("   ⚠️ news.json 양방향 동기화 실패(%s): %s", result.path, result.error or "트랜잭션 취소")
+    if not report.ok:
+        return False
+    logger.info(
+        "   ✅ news.json 양방향 동기화 완료: source=%s (items=%d, %s)",
+        chosen_path,
+        len(chosen_data.get("items", [])),
+        report.summary(),
+    )
+    return True
+
 
 # 4. 결과 저장 (Markdown)
-def save_to_radar(news_text, matched_keywords, analysis=None):
-    """Project_Radar.md에 결과 저장 및 Antigravity로 자동 동기화"""
+def _format_radar_entry(timestamp, news_text, matched_keywords, analysis=None):
+    lines = [
+        f"## [{timestamp}] 신규 감지\n",
+        f"**뉴스**: {news_text[:100]}...\n\n",
+        f"**감지 키워드**: {', '.join(matched_keywords)}\n\n",
+    ]
+    if analysis:
+        lines.append(f"**분석**: {analysis}\n")
+    lines.append("\n---\n\n")
+    return "".join(lines)
+
+
+def _rotate_radar_if_needed(radar_file, incoming_bytes):
+    """live 파일이 RADAR_MAX_BYTES를 넘게 되면 아카이브로 옮기고 헤더만 남긴다."""
+    if not os.path.exists(radar_file):
+        return None
+    if RADAR_MAX_BYTES <= 0 or os.path.getsize(radar_file) + incoming_bytes <= RADAR_MAX_BYTES:
+        return None
+
+    os.makedirs(RADAR_ARCHIVE_DIR, exist_ok=True)
+    archive_path = os.path.join(
+        RADAR_ARCHIVE_DIR,
+        f"Project_Radar_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
+    )
+    os.replace(radar_file, archive_path)
+    logger.info("   🗂️ Project_Radar.md 로테이션: %s", archive_path)
+    return archive_path
+
+
+def _load_radar_sync_state():
+    try:
+        with open(RADAR_SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def _tail_matches(source_path, target_path, offset, window=4096):
+    """offset 직전 window 바이트가 양쪽에서 같은지로 대상 파일 분기 여부를 판정한다."""
+    start = max(0, offset - window)
+    with open(source_path, "rb") as src, open(target_path, "rb") as dst:
+        src.seek(start)
+        dst.seek(start)
+        return src.read(offset - start) == dst.read(offset - start)
+
+
+def sync_radar_to_antigravity(radar_file, previous_size):
+    """새로 append된 바이트 구간만 ANTIGRAVITY_PATH로 보낸다 (대상이 달라졌으면 전체 복사)."""
+    state = _load_radar_sync_state()
+    current_size = os.path.getsize(radar_file)
+    try:
+        target_size = os.path.getsize(ANTIGRAVITY_PATH)
+    except OSError:
+        target_size = None
+
+    can_delta = (
+        state.get("target") == ANTIGRAVITY_PATH
+        and state.get("synced_size") == previous_size
+        and target_size == previous_size
+        and _tail_matches(radar_file, ANTIGRAVITY_PATH, previous_size)
+    )
+
+    if can_delta:
+        with open(radar_file, "rb") as src, open(ANTIGRAVITY_PATH, "ab") as dst:
+            src.seek(previous_size)
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        mode = f"delta {current_size - previous_size}B"
+    else:
+        shutil.copy2(radar_file, ANTIGRAVITY_PATH)
+        mode = f"full {current_size}B"
+
+    os.makedirs(STATE_DIR, exist_ok=True)
+    news_store.atomic_write_json(RADAR_SYNC_STATE_FILE, {
+        "target": ANTIGRAVITY_PATH,
+        "synced_size": current_size,
+        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    return mode
+
+
+def save_to_radar(entries):
+    """한 실행분의 감지 결과를 Project_Radar.md에 1회 append 하고 Antigravity로 동기화
+
+    entries: (news_text, matched_keywords, analysis) 튜플 목록
+    """
+    if not entries:
+        return 0
+
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    radar_file = "Project_Radar.md"
-    
+    radar_file = RADAR_PATH
+    payload = "".join(
+        _format_radar_entry(timestamp, news_text, matched_keywords, analysis)
+        for news_text, matched_keywords, analysis in entries
+    ).encode("utf-8")
+
+    _rotate_radar_if_needed(radar_file, len(payload))
+
     # 파일이 없으면 헤더 생성
     if not os.path.exists(radar_file):
         with open(radar_file, "w", encoding="utf-8") as f:
-            f.write("# Project Radar - 뉴스 감지 로그\n\n")
-    
-    with open(radar_file, "a", encoding="utf-8") as f:
-        f.write(f"## [{timestamp}] 신규 감지\n")
-        f.write(f"**뉴스**: {news_text[:100]}...\n\n")
-        f.write(f"**감지 키워드**: {', '.join(matched_keywords)}\n\n")
-        if analysis:
-            f.write(f"**분석**: {analysis}\n")
-        f.write("\n---\n\n")
-    
+            f.write(RADAR_HEADER)
+
+    previous_size = os.path.getsize(radar_file)
+    with open(radar_file, "ab") as f:
+        f.write(payload)
+
     # Antigravity로 자동 동기화
     try:
-        shutil.copy2(radar_file, ANTIGRAVITY_PATH)
-        logger.info("   🔄 Antigravity 동기화 완료: %s", ANTIGRAVITY_PATH)
+        mode = sync_radar_to_antigravity(radar_file, previous_size)
+        logger.info("   🔄 Antigravity 동기화 완료(%s): %s", mode, ANTIGRAVITY_PATH)
     except Exception as e:
         logger.error("   ⚠️ Antigravity 동기화 실패: %s", str(e))
 
+    return len(entries)
+
 
 # 5. JSON으로도 저장 (API 연동 용)
-def save_to_json(news_data):
-    """감지된 뉴스를 JSON으로 저장"""
-    json_file = "detected_news.json"
-    
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        data = []
-    
-    data.append({
-        "timestamp": datetime.now().isoformat(),
-        "news": news_data["text"],
-        "keywords": news_data["keywords"],
-        "analysis": news_data.get("analysis", "")
-    })
-    
-    atomic_write_json(json_file, data, ensure_ascii=False, indent=2)
+def save_to_json(news_data_list):
+    """감지된 뉴스를 JSONL 저널에 배치 단위로 1회 append 한다 (detected_news.json 뷰에는 새 기록만 덧붙임)"""
+    timestamp = datetime.now().isoformat()
+    records = [
+        {
+            "timestamp": timestamp,
+            "news": news_data["text"],
+            "keywords": news_data["keywords"],
+            "analysis": news_data.get("analysis") or "",
+        }
+        for news_data in news_data_list
+    ]
+    return detection_journal.append_records(records)
 
 
 # Dashboard 업데이트 함수
@@ -537,10 +826,8 @@ def update_dashboard(news_data_list):
     
     try:
         # 기존 dashboard_data.json 로드
-        if os.path.exists(DASHBOARD_PATH):
-            with open(DASHBOARD_PATH, 'r', encoding='utf-8') as f:
-                dashboard_data = json.load(f)
-        else:
+        dashboard_data = news_store.checkout(DASHBOARD_PATH, default=None)
+        if dashboard_data is None:
             dashboard_data = {
                 "todo_list": [],
                 "system_status": "NORMAL",
@@ -580,7 +867,7 @@ def update_dashboard(news_data_list):
         dashboard_data["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # 저장
-        atomic_write_json(DASHBOARD_PATH, dashboard_data, ensure_ascii=False, indent=2)
+        news_store.write(DASHBOARD_PATH, dashboard_data)
         
         logger.info("   ✅ Dashboard 업데이트 완료: %d개 뉴스", len(top_news))
         
@@ -588,82 +875,165 @@ def update_dashboard(news_data_list):
         logger.error("   ⚠️ Dashboard 업데이트 오류: %s", str(e))
 
 
-def filter_and_analyze(news_list, use_local_analysis=True):
-    """뉴스를 필터링/분석하여 후속 단계용 리스트를 구성한다."""
-    processed_news_data = []
-    skipped_count = 0
+class RunningCount:
+    """스트리밍 모드에서 소비가 끝난 뒤 확정되는 카운터 (%d 포맷/int() 지원)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def __index__(self):
+        return self.value
 
+    __int__ = __index__
+
+
+class ProcessedNewsStream:
+    """filter_and_analyze 스트리밍 결과.
+
+    1회만 순회 가능하며, 대시보드용 앞쪽 head_size건과 카운터만 메모리에 남긴다.
+    순회가 끝나면 len()/슬라이싱([:3])이 리스트 모드와 같은 값을 돌려준다.
+    """
+
+    def __init__(self, items, skipped, head_size=3):
+        self._items = items
+        self._head = []
+        self._head_size = head_size
+        self.count = 0
+        self.skipped = skipped
+
+    def __iter__(self):
+        for item in self._items:
+            self.count += 1
+            if len(self._head) < self._head_size:
+                self._head.append(item)
+            yield item
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __getitem__(self, index):
+        return self._head[index]
+
+
+def _analyze_one(news, use_local_analysis, position):
+    logger.info("\n[%s] 처리 중...", position)
+    logger.info("   📝 뉴스: %s...", news[:60])
+
+    profile = scan_keywords(news)
+    is_relevant, result = filter_by_keywords(news, profile=profile)
+    if not is_relevant:
+        logger.info("   ✗ 건너뜀: %s", result)
+        return None
+
+    matched_keywords = result
+    logger.info("   ✓ 필터 통과!")
+    logger.info("   🎯 감지된 키워드: %s", ", ".join(matched_keywords))
+
+    analysis = None
+    if use_local_analysis:
+        try:
+            logger.info("   🔄 로컬 분석 진행 중...")
+            analysis = analyze_importance(news, matched_keywords, profile=profile)
+            logger.info("   ✅ 분석 완료")
+        except Exception as e:
+            logger.error("   ⚠️ 분석 오류: %s", str(e))
+
+    features = build_news_features(news, matched_keywords, profile=profile)
+    return {
+        "text": news,
+        "keywords": matched_keywords,
+        "analysis": analysis,
+        "category": features.category,
+        "features": features,
+    }
+
+
+def filter_and_analyze(news_list, use_local_analysis=True, streaming=False):
+    """뉴스를 필터링/분석하여 후속 단계용 리스트를 구성한다.
+
+    streaming=True면 news_list를 lazy하게 소비하는 ProcessedNewsStream을 반환한다.
+    """
     logger.info("=" * 60)
     logger.info("🛰️ 외부 정보 감지 시스템 가동 중...")
     logger.info("=" * 60)
     logger.info("📋 감지 키워드 (%d개): %s...", len(KEYWORDS), ", ".join(KEYWORDS[:5]))
     logger.info("🚫 제외 키워드 (%d개): %s\n", len(EXCLUDE_KEYWORDS), ", ".join(EXCLUDE_KEYWORDS))
 
-    for idx, news in enumerate(news_list, 1):
-        logger.info("\n[%d/%d] 처리 중...", idx, len(news_list))
-        logger.info("   📝 뉴스: %s...", news[:60])
+    if streaming:
+        skipped = RunningCount()
 
-        is_relevant, result = filter_by_keywords(news)
-        if not is_relevant:
-            logger.info("   ✗ 건너뜀: %s", result)
+        def generate():
+            for idx, news in enumerate(news_list, 1):
+                item = _analyze_one(news, use_local_analysis, f"{idx}/?")
+                if item is None:
+                    skipped.value += 1
+                    continue
+                yield item
+
+        return ProcessedNewsStream(generate(), skipped), skipped
+
+    processed_news_data = []
+    skipped_count = 0
+    for idx, news in enumerate(news_list, 1):
+        item = _analyze_one(news, use_local_analysis, f"{idx}/{len(news_list)}")
+        if item is None:
             skipped_count += 1
             continue
-
-        matched_keywords = result
-        logger.info("   ✓ 필터 통과!")
-        logger.info("   🎯 감지된 키워드: %s", ", ".join(matched_keywords))
-
-        analysis = None
-        if use_local_analysis:
-            try:
-                logger.info("   🔄 로컬 분석 진행 중...")
-                analysis = analyze_importance(news, matched_keywords)
-                logger.info("   ✅ 분석 완료")
-            except Exception as e:
-                logger.error("   ⚠️ 분석 오류: %s", str(e))
-
-        processed_news_data.append({
-            "text": news,
-            "keywords": matched_keywords,
-            "analysis": analysis,
-            "category": classify_news_category(news, matched_keywords),
-        })
+        processed_news_data.append(item)
 
     return processed_news_data, skipped_count
 
 
 def persist(processed_news_data):
-    """분석 결과를 파일로 저장하고 관련 아티팩트를 수집한다."""
+    """분석 결과를 파일로 저장하고 관련 아티팩트를 수집한다.
+
+    리스트/스트림 모두 1회만 순회하며 PERSIST_CHUNK_SIZE 단위로 저장하고,
+    Daily Bridge는 챕터별 top-k 상태만 유지하는 빌더로 함께 구성한다.
+    """
     artifacts = {
         "radar_saved": 0,
         "json_saved": 0,
         "bridge_path": None,
         "news_sync_ok": False,
     }
+    bridge_builder = DailyBridgeBuilder()
+
+    iterator = iter(processed_news_data)
+    while True:
+        chunk = list(itertools.islice(iterator, max(1, PERSIST_CHUNK_SIZE)))
+        if not chunk:
+            break
+
+        for item in chunk:
+            bridge_builder.add(item)
 
-    for item in processed_news_data:
         try:
-            save_to_radar(item["text"], item["keywords"], item.get("analysis"))
-            artifacts["radar_saved"] += 1
-            logger.info("   💾 Markdown 저장 완료")
+            artifacts["radar_saved"] += save_to_radar([
+                (item["text"], item["keywords"], item.get("analysis"))
+                for item in chunk
+            ])
+            logger.info("   💾 Markdown 저장 완료: %d건", artifacts["radar_saved"])
         except Exception as e:
             logger.error("   ⚠️ 저장 오류: %s", str(e))
 
         try:
-            save_to_json({
-                "text": item["text"],
-                "keywords": item["keywords"],
-                "analysis": item.get("analysis") or "",
-            })
-            artifacts["json_saved"] += 1
-            logger.info("   💾 JSON 저장 완료")
+            artifacts["json_saved"] += save_to_json(chunk)
+            logger.info("   💾 JSON 저널 저장 완료: %d건", artifacts["json_saved"])
         except Exception as e:
             logger.error("   ⚠️ JSON 저장 오류: %s", str(e))
 
+    if artifacts["json_saved"]:
+        detection_journal.start_background_compaction()
+
     logger.info("\n%s", "=" * 60)
     logger.info("🌉 Daily Bridge 생성 중...")
     logger.info("%s", "=" * 60)
-    artifacts["bridge_path"] = create_daily_bridge(processed_news_data)
+    artifacts["bridge_path"] = bridge_builder.write()
 
     artifacts["news_sync_ok"] = sync_news_hub_source_from_canonical()
     return artifacts
@@ -712,10 +1082,12 @@ def summary(processed_news_data, skipped_count, artifacts):
 
 
 # 6. 메인 실행 함수
-def process_news(use_local_analysis=True):
+def process_news(use_local_analysis=True, streaming=PIPELINE_STREAMING):
     """오케스트레이터: 실행 순서 제어 + 최종 요약 출력만 담당"""
-    news_list = fetch_news()
-    processed_news_data, skipped_count = filter_and_analyze(news_list, use_local_analysis=use_local_analysis)
+    news_list = fetch_news(streaming=streaming)
+    processed_news_data, skipped_count = filter_and_analyze(
+        news_list, use_local_analysis=use_local_analysis, streaming=streaming
+    )
     artifacts = persist(processed_news_data)
     publish(processed_news_data, artifacts)
     summary(processed_news_data, skipped_count, artifacts)
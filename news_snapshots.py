@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# news_snapshots.py - 검증을 통과한 news.json의 최근 N개 버전을 보관하는 스냅샷 링
+#
+# .state/news_snapshots/
+#   objects/<blake2b>.json  - 스냅샷 본문 (내용 주소: 같은 내용은 한 번만 저장)
+#   index.json              - {"ring": [최신순 {digest, saved_at, counts}],
+#                              "by_category": {category: [{"digest", "item"}, ...]}}
+#
+# - record()는 카테고리별 목표 개수를 모두 채운 문서만 저장한다 (known-good).
+# - by_category는 링 안의 스냅샷 항목을 최신 스냅샷 우선 + URL 중복 제거로 모아 둔 색인이라,
+#   backfill fallback 후보는 index.json 한 번 읽고 dict 조회로 끝난다 (git show HEAD 불필요).
+# - 링 크기(NEWS_SNAPSHOT_RING_SIZE)를 넘는 오래된 스냅샷은 색인 항목과 객체 파일까지 함께 지운다.
+import os
+import time
+
+import news_store
+from publish_fanout import content_digest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_DIR = os.path.join(BASE_DIR, ".state", "news_snapshots")
+RING_SIZE = int(os.getenv("NEWS_SNAPSHOT_RING_SIZE", "7"))
+MAX_PER_CATEGORY = int(os.getenv("NEWS_SNAPSHOT_MAX_PER_CATEGORY", "40"))
+
+
+def category_counts(items):
+    counts = {}
+    for item in items:
+        if isinstance(item, dict) and item.get("category"):
+            counts[item["category"]] = counts.get(item["category"], 0) + 1
+    return counts
+
+
+def is_known_good(payload, required_counts):
+    """모든 카테고리가 required_counts 이상이고 모든 항목이 http(s) URL을 가지면 True."""
+    items = payload.get("items") if hasattr(payload, "get") else None
+    if not isinstance(items, list) or not items:
+        return False
+    for item in items:
+        if not isinstance(item, dict):
+            return False
+        if not str(item.get("url") or "").startswith(("http://", "https://")):
+            return False
+    counts = category_counts(items)
+    return all(counts.get(cat, 0) >= need for cat, need in required_counts.items())
+
+
+class SnapshotRing:
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR, size=RING_SIZE, max_per_category=MAX_PER_CATEGORY):
+        self.root = root
+        self.size = max(1, size)
+        self.max_per_category = max_per_category
+        self.index_path = os.path.join(root, "index.json")
+        self.objects_dir = os.path.join(root, "objects")
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.json")
+
+    def load_index(self):
+        index = news_store.read(self.index_path, default=None)
+        if not hasattr(index, "get"):
+            return {"ring": [], "by_category": {}}
+        return {"ring": list(index.get("ring") or []), "by_category": dict(index.get("by_category") or {})}
+
+    def candidates(self, category):
+        """category의 fallback 후보 항목 목록 (최신 스냅샷 우선, URL 중복 제거)."""
+        index = news_store.read(self.index_path, default=None)
+        if not hasattr(index, "get"):
+            return []
+        return [entry["item"] for entry in (index.get("by_category") or {}).get(category, [])]
+
+    def latest(self):
+        ring = self.load_index()["ring"]
+        if not ring:
+            return None
+        return news_store.read(self._object_path(ring[0]["digest"]), default=None)
+
+    def record(self, payload):
+        """payload를 링 맨 앞에 추가한다. 최신 스냅샷과 내용이 같으면 아무것도 쓰지 않는다. digest 반환."""
+        data = news_store.serialize_json(payload)
+        digest = content_digest(data)
+        index = self.load_index()
+        ring = index["ring"]
+        if ring and ring[0].get("digest") == digest:
+            return digest
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            news_store.atomic_write_bytes(object_path, data)
+
+        items = [item for item in payload.get("items", []) if isinstance(item, dict)]
+        ring = [entry for entry in ring if entry.get("digest") != digest]
+        ring.insert(0, {"digest": digest, "saved_at": int(time.time()), "counts": category_counts(items)})
+        kept, dropped = ring[: self.size], ring[self.size:]
+        alive = {entry["digest"] for entry in kept}
+
+        by_category = {}
+        seen_urls = {}
+        fresh = [(item.get("category"), {"digest": digest, "item": item}) for item in items]
+        old = [
+            (category, entry)
+            for category, entries in index["by_category"].items()
+            for entry in entries
+            if entry.get("digest") in alive and entry.get("digest") != digest
+        ]
+        for category, entry in fresh + old:
+            url = str(entry["item"].get("url") or "")
+            if not category or not url or url in seen_urls.setdefault(category, set()):
+                continue
+            bucket = by_category.setdefault(category, [])
+            if len(bucket) >= self.max_per_category:
+                continue
+            seen_urls[category].add(url)
+            bucket.append(entry)
+
+        news_store.write(self.index_path, {"ring": kept, "by_category": by_category}, indent=None)
+
+        for entry in dropped:
+            if entry.get("digest") not in alive:
+                try:
+                    os.remove(self._object_path(entry["digest"]))
+                except OSError:
+                    pass
+        return digest
+
+
+_ring = None
+
+
+def get_ring():
+    global _ring
+    if _ring is None:
+        _ring = SnapshotRing(os.getenv("NEWS_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR))
+    return _ring
+
+
+def record_if_valid(payload, required_counts):
+    """검증을 통과한 문서면 스냅샷으로 저장하고 digest를, 아니면 None을 반환한다."""
+    if not is_known_good(payload, required_counts):
+        print("news_snapshot=skip (category counts below target)")
+        return None
+    try:
+        digest = get_ring().record(payload)
+    except Exception as e:
+        print(f"⚠️ news_snapshot 저장 실패: {e}")
+        return None
+    print(f"news_snapshot={digest[:12]}")
+    return digest
+
+
+_bootstrap_tried = False
+
+
+def candidates(category, required_counts):
+    ring = get_ring()
+    if not os.path.exists(ring.index_path):
+        _bootstrap(required_counts)
+    return ring.candidates(category)
+
+
+def _bootstrap(required_counts):
+    """링이 비어 있으면 배포된 news.json이 검증을 통과할 때만 첫 스냅샷으로 삼는다 (프로세스당 1회 시도)."""
+    global _bootstrap_tried
+    if _bootstrap_tried:
+        return
+    _bootstrap_tried = True
+    try:
+        payload = news_store.read(news_store.CANONICAL_NEWS_JSON)
+    except Exception:
+        return
+    if hasattr(payload, "get") and payload.get("items"):
+        record_if_valid(payload, required_counts)
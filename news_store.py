@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# news_store.py - news.json / dashboard_data.json 읽기·쓰기 단일 창구
+#
+# - 파싱 결과를 (path, inode, mtime_ns, size) 키로 캐시 → 한 실행 안에서 같은 파일을 여러 단계가
+#   읽어도 실제 파싱은 파일 버전당 1회
+# - read()는 최상위가 읽기 전용인 뷰(MappingProxyType)를 돌려준다. 하위 list/dict는 캐시와
+#   공유되므로 수정하려면 checkout()으로 받은 사본을 고친 뒤 write()로 저장한다.
+# - write()/atomic_write_json()은 임시 파일 + fsync + os.replace(+ 디렉터리 fsync)로 교체하고,
+#   교체한 그 경로의 캐시만 무효화한다 (다음 read에서 그 파일만 다시 파싱).
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKSPACE_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+NORMALIZED_NEWS_JSON = os.path.join(BASE_DIR, "data", "normalized", "news.json")
+CANONICAL_NEWS_JSON = os.path.join(WORKSPACE_ROOT, "woonmok.github.io", "news.json")
+
+_MISSING = object()
+
+
+def _plain(value):
+    """MappingProxyType 뷰를 json 직렬화 가능한 dict로 되돌린다 (최상위만)."""
+    if isinstance(value, Mapping) and not isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def serialize_json(payload, ensure_ascii=False, indent=2):
+    """저장 포맷 그대로의 UTF-8 바이트열. indent=None이면 한 줄로 직렬화한다."""
+    return json.dumps(_plain(payload), ensure_ascii=ensure_ascii, indent=indent).encode("utf-8")
+
+
+def atomic_write_bytes(file_path, data):
+    """바이트열을 원자적으로 저장하고 디스크 반영까지 보장한다."""
+    target_path = os.path.abspath(file_path)
+    target_dir = os.path.dirname(target_path) or "."
+    os.makedirs(target_dir, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=f".{os.path.basename(target_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, target_path)
+
+        try:
+            dir_fd = os.open(target_dir, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class NewsStore:
+    """파일 버전 키 기반 JSON 문서 캐시 + 원자적 저장."""
+
+    def __init__(self):
+        self._cache = {}  # abspath -> (version_key, document)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _version_key(path):
+        st = os.stat(path)
+        return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self, path):
+        path = os.path.abspath(path)
+        key = self._version_key(path)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[path] = (key, document)
+        return document
+
+    def read(self, path, default=_MISSING):
+        """읽기 전용 뷰를 반환한다. 파일이 없으면 default(지정 시) 또는 FileNotFoundError."""
+        try:
+            document = self._load(path)
+        except FileNotFoundError:
+            if default is _MISSING:
+                raise
+            return default
+        return MappingProxyType(document) if isinstance(document, dict) else document
+
+    def checkout(self, path, default=_MISSING):
+        """수정용 사본을 반환한다 (최상위 dict와 최상위 list 값만 복사, 항목 dict는 공유)."""
+        document = self.read(path, default)
+        if isinstance(document, Mapping):
+            return {k: list(v) if isinstance(v, list) else v for k, v in document.items()}
+        if isinstance(document, list):
+            return list(document)
+        return document
+
+    def write(self, path, payload, ensure_ascii=False, indent=2):
+        """JSON 문서를 원자적으로 저장하고 해당 경로의 캐시만 무효화한다."""
+        atomic_write_bytes(path, serialize_json(payload, ensure_ascii=ensure_ascii, indent=indent))
+        self.invalidate(path)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+
+_store = NewsStore()
+
+
+def get_store():
+    return _store
+
+
+def read(path, default=_MISSING):
+    return _store.read(path, default)
+
+
+def checkout(path, default=_MISSING):
+    return _store.checkout(path, default)
+
+
+def write(path, payload, ensure_ascii=False, indent=2):
+    _store.write(path, payload, ensure_ascii=ensure_ascii, indent=indent)
+
+
+def atomic_write_json(file_path, data, ensure_ascii=False, indent=2):
+    """JSON 파일을 원자적으로 저장하고 디스크 반영까지 보장한다 (상태 파일 등 공용)."""
+    _store.write(file_path, data, ensure_ascii=ensure_ascii, indent=indent)
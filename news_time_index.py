@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# news_time_index.py - 뉴스 아이템 시간 컬럼 + 시간(hour) 버킷 인덱스 + 힙 기반 Top-K
+#
+# - decision_generated_at / published_at을 아이템당 1회만 파싱해 epoch 마이크로초 int 컬럼으로 보관
+# - 각 시각을 UTC 시간 단위 버킷(epoch_hour → 아이템 번호)에 색인해 윈도 조회는 해당 버킷만 훑는다
+#   (최근 N시간 / 특정 UTC 날짜 / 임의 [start, end) 구간 / 전체)
+# - Top-K는 전체 정렬 대신 heapify + 필요한 만큼만 pop(O(n + k log n))하는 지연 스트림으로 뽑고,
+#   카테고리 다양성 규칙(select_diverse)도 스트림에서 필요한 만큼만 소비한다.
+# 정렬 순서는 기존 sync_top_news._sort_key_for_top과 같다:
+#   decision_generated_at 최신 > published_at 최신 > (동률이면) 원래 순서, 시각이 없으면 가장 뒤.
+import heapq
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+US_PER_HOUR = 3600 * 1_000_000
+US_PER_DAY = 24 * US_PER_HOUR
+MISSING = -(1 << 62)  # 시각 없음 (어떤 실제 시각보다도 작다)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def parse_epoch_us(raw):
+    """ISO8601 문자열(Z/오프셋/naive=UTC)을 epoch 마이크로초 int로. 비었거나 파싱 실패면 None."""
+    if not raw:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return (parsed - _EPOCH) // _ONE_US
+    except Exception:
+        return None
+
+
+def to_epoch_us(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_US
+
+
+class LazyRanked:
+    """힙에서 필요한 만큼만 꺼내 쌓는 정렬 스트림. 인덱스 접근/순회 시 그 지점까지만 pop 한다."""
+
+    def __init__(self, items, heap):
+        self._items = items
+        self._heap = heap
+        self._ranked = []
+
+    def _fill(self, count):
+        heap = self._heap
+        while len(self._ranked) < count and heap:
+            self._ranked.append(self._items[heapq.heappop(heap)[2]])
+        return len(self._ranked) >= count
+
+    def __iter__(self):
+        position = 0
+        while self._fill(position + 1):
+            yield self._ranked[position]
+            position += 1
+
+    def __getitem__(self, position):
+        self._fill(position + 1)
+        return self._ranked[position]
+
+    def __len__(self):
+        return len(self._ranked) + len(self._heap)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def top(self, k):
+        self._fill(k)
+        return self._ranked[:k]
+
+
+def select_diverse(candidates, fallback, k=2):
+    """후보 스트림에서 k건을 고른다 (첫 건은 후보 1위, 이후 슬롯은 아래 순서로 채움).
+
+    1) 후보 중 아직 고르지 않은 카테고리(비어 있지 않은)의 최상위
+    2) fallback 중 같은 조건 (이미 고른 id 제외)
+    3) 후보 중 이미 고른 id가 아닌 최상위
+    4) fallback 중 같은 조건
+    스트림은 조건을 만족하는 첫 항목까지만 소비된다.
+    """
+    if not candidates:
+        candidates = fallback
+    if not candidates or k <= 0:
+        return []
+
+    first = candidates[0]
+    picked = [first]
+    picked_objects = {id(first)}
+    picked_ids = {first.get("id")}
+    picked_categories = {first.get("category")}
+
+    def new_category(item):
+        category = item.get("category")
+        return bool(category) and category not in picked_categories
+
+    passes = (
+        (candidates, lambda item: id(item) not in picked_objects and new_category(item)),
+        (fallback, lambda item: item.get("id") not in picked_ids and new_category(item)),
+        (candidates, lambda item: item.get("id") not in picked_ids),
+        (fallback, lambda item: item.get("id") not in picked_ids),
+    )
+    while len(picked) < k:
+        chosen = None
+        for stream, accept in passes:
+            chosen = next((item for item in stream if accept(item)), None)
+            if chosen is not None:
+                break
+        if chosen is None:
+            break
+        picked.append(chosen)
+        picked_objects.add(id(chosen))
+        picked_ids.add(chosen.get("id"))
+        picked_categories.add(chosen.get("category"))
+    return picked
+
+
+class NewsTimeIndex:
+    """아이템 목록에 대한 시간 컬럼과 시간 버킷 인덱스."""
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.decision_us = []
+        self.published_us = []
+        self._buckets = {}  # epoch_hour -> [item 번호] (decision/published 각각 색인, 중복 가능)
+        for position, item in enumerate(self.items):
+            decision = parse_epoch_us(item.get("decision_generated_at"))
+            published = parse_epoch_us(item.get("published_at"))
+            self.decision_us.append(MISSING if decision is None else decision)
+            self.published_us.append(MISSING if published is None else published)
+            for value in (decision, published):
+                if value is not None:
+                    self._buckets.setdefault(value // US_PER_HOUR, []).append(position)
+        self._hours = sorted(self._buckets)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _in_range(self, position, start_us, end_us):
+        for value in (self.decision_us[position], self.published_us[position]):
+            if value != MISSING and value >= start_us and (end_us is None or value < end_us):
+                return True
+        return False
+
+    def window(self, start_us=None, end_us=None):
+        """decision/published 중 하나라도 [start_us, end_us)에 드는 아이템 번호 (원래 순서)."""
+        if start_us is None and end_us is None:
+            return list(range(len(self.items)))
+        start_us = MISSING + 1 if start_us is None else start_us
+        lo = bisect_left(self._hours, start_us // US_PER_HOUR)
+        hi = len(self._hours) if end_us is None else bisect_left(self._hours, -(-end_us // US_PER_HOUR))
+        found = set()
+        for hour in self._hours[lo:hi]:
+            for position in self._buckets[hour]:
+                if position not in found and self._in_range(position, start_us, end_us):
+                    found.add(position)
+        return sorted(found)
+
+    def last_hours(self, hours, now=None):
+        now = now or datetime.now(timezone.utc)
+        return self.window(start_us=to_epoch_us(now) - int(hours * US_PER_HOUR))
+
+    def on_date(self, day):
+        """UTC 날짜 day에 decision 또는 published 시각이 있는 아이템 번호."""
+        start_us = (datetime(day.year, day.month, day.day, tzinfo=timezone.utc) - _EPOCH) // _ONE_US
+        return self.window(start_us=start_us, end_us=start_us + US_PER_DAY)
+
+    def ranked(self, positions=None):
+        """positions(기본: 전체)를 최신순으로 지연 정렬한 LazyRanked 스트림."""
+        if positions is None:
+            positions = range(len(self.items))
+        decision, published = self.decision_us, self.published_us
+        heap = [(-decision[p], -published[p], p) for p in positions]
+        heapq.heapify(heap)
+        return LazyRanked(self.items, heap)
+
+    def top_k(self, k, positions=None, diverse=True, fallback=None):
+        """positions 중 상위 k건. diverse면 카테고리 다양성 규칙(select_diverse)을 적용한다."""
+        stream = self.ranked(positions)
+        if not diverse:
+            return stream.top(k)
+        return select_diverse(stream, fallback if fallback is not None else self.ranked(), k)
+
+
+_index_cache = []  # [(items 객체, NewsTimeIndex)] - 같은 문서 버전이면 재색인하지 않는다
+
+
+def index_for(items):
+    """같은 items 객체(news_store 캐시가 돌려준 문서의 목록)에 대해서는 인덱스를 재사용한다."""
+    if _index_cache and _index_cache[0][0] is items:
+        return _index_cache[0][1]
+    index = NewsTimeIndex(items)
+    _index_cache[:] = [(items, index)]
+    return index
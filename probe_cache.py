@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# probe_cache.py - URL probe 결과 영속 캐시 (.state/url_probe_cache.sqlite3)
+#
+# validate_news_urls와 backfill_missing_categories가 공유한다.
+# URL마다 (HTTP status, 최종 리다이렉트 URL, 판정 reason, suspicious 분류, 확인 시각)을 저장하고,
+# 결과 종류별 TTL이 지나기 전에는 다시 probe 하지 않는다.
+#   - 정상(2xx/3xx)          : PROBE_TTL_OK_HOURS (기본 7일)
+#   - 404/410               : PROBE_TTL_DEAD_HOURS (기본 3일)
+#   - 검색/홈페이지 리다이렉트 : PROBE_TTL_SUSPICIOUS_HOURS (기본 1일)
+#   - 그 밖의 HTTP 상태(403/429/5xx 등): PROBE_TTL_OTHER_HOURS (기본 6시간)
+#   - 네트워크 오류           : PROBE_TTL_NETWORK_MINUTES (기본 30분)
+# 리다이렉트로 URL이 바뀌면 최종 URL 키로도 같은 결과를 저장한다 (검증기가 item url을 최종 URL로
+# 바꾸므로, 같은 실행의 두 번째 검증 패스나 다음 실행에서 다시 probe 하지 않도록).
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, ".state", "url_probe_cache.sqlite3")
+
+TTL_OK = float(os.getenv("PROBE_TTL_OK_HOURS", "168")) * 3600
+TTL_DEAD = float(os.getenv("PROBE_TTL_DEAD_HOURS", "72")) * 3600
+TTL_SUSPICIOUS = float(os.getenv("PROBE_TTL_SUSPICIOUS_HOURS", "24")) * 3600
+TTL_OTHER = float(os.getenv("PROBE_TTL_OTHER_HOURS", "6")) * 3600
+TTL_NETWORK = float(os.getenv("PROBE_TTL_NETWORK_MINUTES", "30")) * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    final_url TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    suspicious TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class ProbeRecord:
+    __slots__ = ("url", "status", "final_url", "reason", "suspicious", "checked_at")
+
+    def __init__(self, url, status, final_url, reason, suspicious="", checked_at=None):
+        self.url = url
+        self.status = int(status or 0)  # 0 = 네트워크 오류(응답 없음)
+        self.final_url = final_url or url
+        self.reason = reason
+        self.suspicious = suspicious or ""
+        self.checked_at = time.time() if checked_at is None else checked_at
+
+    @property
+    def network_error(self):
+        return self.status == 0
+
+    @property
+    def alive(self):
+        """backfill 기준 생존 여부: 2xx/3xx 또는 네트워크 오류(판단 보류)."""
+        return self.network_error or 200 <= self.status < 400
+
+    def ttl(self):
+        if self.network_error:
+            return TTL_NETWORK
+        if self.status in (404, 410):
+            return TTL_DEAD
+        if self.suspicious:
+            return TTL_SUSPICIOUS
+        if 200 <= self.status < 400:
+            return TTL_OK
+        return TTL_OTHER
+
+
+class ProbeCache:
+    """SQLite 기반 probe 캐시. 여러 probe 스레드에서 동시에 써도 되도록 연결 1개를 잠금으로 보호한다."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, url, now=None):
+        """만료되지 않은 기록이 있으면 ProbeRecord, 없으면 None."""
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT url, status, final_url, reason, suspicious, checked_at FROM probes "
+                    "WHERE url = ? AND expires_at > ?",
+                    (url, now),
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+        except sqlite3.Error:
+            return None
+        return ProbeRecord(*row)
+
+    def put(self, record):
+        rows = [record.url]
+        if record.final_url and record.final_url != record.url:
+            rows.append(record.final_url)
+        expires_at = record.checked_at + record.ttl()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO probes "
+                    "(url, status, final_url, reason, suspicious, checked_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (url, record.status, record.final_url, record.reason, record.suspicious,
+                         record.checked_at, expires_at)
+                        for url in rows
+                    ],
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def prune(self, now=None):
+        """만료된 기록을 지운다. 지운 행 수 반환."""
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                conn = self._connection()
+                deleted = conn.execute("DELETE FROM probes WHERE expires_at <= ?", (now,)).rowcount
+                conn.commit()
+                return deleted
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProbeCache(os.getenv("URL_PROBE_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _cache
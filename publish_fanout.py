@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# publish_fanout.py - 배포/미러 대상 파일 묶음을 해시 비교 → 병렬 스테이징 → 일괄 커밋으로 기록
+#
+# publish({path: bytes}) 한 번이 하나의 트랜잭션이다.
+#   1) 대상별로 현재 내용과 blake2b 해시를 비교해 같으면 건너뛴다
+#      (.state/publish_digests.json에 (inode, mtime_ns, size) → digest를 보관해 재읽기도 생략)
+#   2) 바뀐 대상만 각 대상 디렉터리에 임시 파일로 병렬 스테이징 + fsync
+#      (같은 내용을 받는 두 번째 대상부터는 첫 스테이징 파일에서 copy_file_range로 복사)
+#   3) 스테이징이 모두 성공했을 때만 os.replace로 커밋. 커밋 중 실패하면 이미 교체한
+#      대상을 백업본으로 되돌려 묶음 전체가 이전 상태로 남는다.
+# 결과는 대상별 상태/바이트/지연(ms)을 담은 FanOutReport로 돌려준다.
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import news_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIGEST_STATE_FILE = os.path.join(BASE_DIR, ".state", "publish_digests.json")
+FANOUT_WORKERS = int(os.getenv("PUBLISH_FANOUT_WORKERS", "4"))
+
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+class TargetResult:
+    __slots__ = ("path", "status", "bytes", "latency_ms", "method", "error")
+
+    def __init__(self, path, status, size=0, latency_ms=0.0, method="", error=None):
+        self.path = path
+        self.status = status  # written | unchanged | failed | aborted
+        self.bytes = size
+        self.latency_ms = latency_ms
+        self.method = method
+        self.error = error
+
+
+class FanOutReport:
+    def __init__(self, results):
+        self.results = results
+
+    @property
+    def ok(self):
+        return all(r.status in ("written", "unchanged") for r in self.results)
+
+    @property
+    def written(self):
+        return [r for r in self.results if r.status == "written"]
+
+    @property
+    def unchanged(self):
+        return [r for r in self.results if r.status == "unchanged"]
+
+    def summary(self):
+        return "targets=%d written=%d unchanged=%d failed=%d bytes=%d" % (
+            len(self.results),
+            len(self.written),
+            len(self.unchanged),
+            len(self.results) - len(self.written) - len(self.unchanged),
+            sum(r.bytes for r in self.written),
+        )
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _version_key(st):
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def _load_digests():
+    try:
+        data = news_store.read(DIGEST_STATE_FILE)
+        return {path: dict(entry) for path, entry in data.items() if isinstance(entry, dict)}
+    except Exception:
+        return {}
+
+
+def _is_unchanged(path, data, digest, digests):
+    """대상 파일이 data와 같은 내용인지. 크기가 다르면 읽지 않고, 버전이 같으면 저장된 digest를 쓴다."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != len(data):
+        return False
+
+    key = _version_key(st)
+    cached = digests.get(path)
+    if cached and cached.get("key") == key:
+        return cached.get("digest") == digest
+
+    with open(path, "rb") as f:
+        current = content_digest(f.read())
+    digests[path] = {"key": key, "digest": current}
+    return current == digest
+
+
+def _copy_range(src_path, dst_fd, size):
+    with open(src_path, "rb") as src:
+        offset = 0
+        while offset < size:
+            copied = os.copy_file_range(src.fileno(), dst_fd, size - offset, offset, offset)
+            if copied == 0:
+                break
+            offset += copied
+    if offset != size:
+        raise OSError(errno.EIO, "short copy_file_range")
+
+
+def _stage(path, data, source_path=None):
+    """대상 디렉터리에 임시 파일을 만들고 fsync 한다. (tmp_path, method, elapsed_ms) 반환."""
+    started = time.perf_counter()
+    target_dir = os.path.dirname(path) or "."
+    os.makedirs(target_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    method = "write"
+    try:
+        copied = False
+        if source_path and hasattr(os, "copy_file_range"):
+            try:
+                _copy_range(source_path, fd, len(data))
+                copied = True
+                method = "copy_file_range"
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+        if not copied:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except Exception:
+        os.close(fd)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    os.close(fd)
+    return tmp_path, method, (time.perf_counter() - started) * 1000
+
+
+def _backup(path):
+    """롤백용 백업 경로(하드링크, 안 되면 복사). 원본이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    backup_path = f"{path}.fanout-bak"
+    try:
+        os.remove(backup_path)
+    except OSError:
+        pass
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+    return backup_path
+
+
+def _fsync_dir(path):
+    try:
+        dir_fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+def publish(targets, workers=FANOUT_WORKERS):
+    """{path: bytes|None} 묶음을 하나의 트랜잭션으로 기록한다. None은 '변경 없음'으로 취급한다."""
+    digests = _load_digests()
+    initial_digests = {path: dict(entry) for path, entry in digests.items()}
+    results = {}
+    pending = []  # (path, data, digest, check_ms)
+
+    for raw_path, data in targets.items():
+        path = os.path.abspath(raw_path)
+        started = time.perf_counter()
+        if data is None:
+            results[path] = TargetResult(path, "unchanged", method="skip")
+            continue
+        digest = content_digest(data)
+        try:
+            unchanged = _is_unchanged(path, data, digest, digests)
+        except OSError:
+            unchanged = False
+        check_ms = (time.perf_counter() - started) * 1000
+        if unchanged:
+            results[path] = TargetResult(path, "unchanged", len(data), check_ms, "skip")
+        else:
+            pending.append((path, data, digest, check_ms))
+
+    staged = {}  # path -> (tmp_path, method, stage_ms)
+    failed = None
+    if pending:
+        # 같은 내용 묶음의 첫 대상(leader)을 먼저 쓰고, 나머지는 leader 임시 파일에서 복사한다.
+        leaders, followers = {}, []
+        for entry in pending:
+            if entry[2] in leaders:
+                followers.append(entry)
+            else:
+                leaders[entry[2]] = entry
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+            for batch in (list(leaders.values()), followers):
+                if failed:
+                    break
+                futures = []
+                for entry in batch:
+                    leader = leaders[entry[2]]
+                    source = None if leader is entry else staged[leader[0]][0]
+                    futures.append((entry[0], pool.submit(_stage, entry[0], entry[1], source)))
+                for path, future in futures:
+                    try:
+                        staged[path] = future.result()
+                    except Exception as e:
+                        failed = failed or (path, e)
+
+    if failed:
+        for tmp_path, _, _ in staged.values():
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        failed_path, error = failed
+        for path, data, _, check_ms in pending:
+            status = "failed" if path == failed_path else "aborted"
+            stage_ms = staged[path][2] if path in staged else 0.0
+            results[path] = TargetResult(
+                path, status, 0, check_ms + stage_ms, error=error if path == failed_path else None
+            )
+        return FanOutReport([results[os.path.abspath(p)] for p in targets])
+
+    # 커밋: 모두 스테이징된 뒤에만 교체. 중간 실패 시 이미 교체한 대상을 되돌린다.
+    # (대상이 1개면 os.replace 자체가 원자적이므로 백업을 만들지 않는다)
+    committed = []  # (path, backup_path)
+    commit_error = None
+    for path, data, digest, check_ms in pending:
+        tmp_path, method, stage_ms = staged[path]
+        started = time.perf_counter()
+        try:
+            backup_path = _backup(path) if len(pending) > 1 else None
+            os.replace(tmp_path, path)
+            committed.append((path, backup_path))
+            commit_ms = (time.perf_counter() - started) * 1000
+            results[path] = TargetResult(path, "written", len(data), check_ms + stage_ms + commit_ms, method)
+        except Exception as e:
+            commit_error = (path, e)
+            break
+
+    if commit_error:
+        for path, backup_path in reversed(committed):
+            try:
+                if backup_path:
+                    os.replace(backup_path, path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+        for path, data, _, check_ms in pending:
+            tmp_path, _, stage_ms = staged[path]
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            status = "failed" if path == commit_error[0] else "aborted"
+            results[path] = TargetResult(
+                path, status, 0, check_ms + stage_ms,
+                error=commit_error[1] if path == commit_error[0] else None,
+            )
+    else:
+        for path, backup_path in committed:
+            if backup_path:
+                try:
+                    os.remove(backup_path)
+                except OSError:
+                    pass
+        store = news_store.get_store()
+        for directory in {os.path.dirname(path) for path, _ in committed}:
+            _fsync_dir(directory)
+        for path, data, digest, _ in pending:
+            store.invalidate(path)
+            try:
+                digests[path] = {"key": _version_key(os.stat(path)), "digest": digest}
+            except OSError:
+                digests.pop(path, None)
+
+    if digests != initial_digests:
+        try:
+            news_store.atomic_write_json(DIGEST_STATE_FILE, digests)
+        except Exception:
+            pass
+
+    return FanOutReport([results[os.path.abspath(p)] for p in targets])
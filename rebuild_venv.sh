@@ -34,5 +34,10 @@ else
     echo "ℹ️ requirements.txt가 없어 의존성 자동 설치를 건너뜁니다."
 fi
 
+# Claude 보강의 HTTP/2 연결 풀은 h2가 필요하다 (없으면 HTTP/1.1로 느리게 동작).
+echo "📦 httpx[http2] (h2) 설치 확인"
+.venv/bin/pip install "httpx[http2]"
+.venv/bin/python -c "import h2, httpx" || { echo "❌ h2/httpx import 실패"; exit 1; }
+
 echo "✅ 완료: $SCRIPT_DIR/.venv/bin/python"
 echo "👉 VS Code에서 인터프리터를 .venv/bin/python으로 선택하세요."
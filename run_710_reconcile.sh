@@ -265,6 +265,18 @@ else
   done
 fi
 
+# 선택: backfill로 들어온 항목을 Message Batches로 보강 (CLAUDE_BATCH_ENRICH=1)
+# 배치가 대기 시간 안에 끝나지 않으면 news.json은 그대로 두고, 다음 실행이 같은 배치를 이어서 확인한다.
+if [ "${CLAUDE_BATCH_ENRICH:-0}" = "1" ] && [ -f "$SCRIPT_DIR/tools/enrich_with_claude.py" ]; then
+  echo "🧠 Claude batch 보강"
+  "$PYTHON_BIN" "$SCRIPT_DIR/tools/enrich_with_claude.py" \
+    --in "$NEWS_JSON" \
+    --out "$NEWS_JSON" \
+    --max-enrich 0 \
+    --batch \
+    --batch-wait "${CLAUDE_BATCH_WAIT_SECONDS:-1800}" || true
+fi
+
 if ! counts_ok; then
   echo "❌ reconcile failed: 23개/카테고리 목표 미충족"
   send_failure_alert "23개/카테고리 목표 미충족"
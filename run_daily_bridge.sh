@@ -70,10 +70,10 @@ send_telegram_failure() {
     fi
 
     local text
-    text="❌ Daily Bridge 실패%0A- 시각: $(date '+%Y-%m-%d %H:%M:%S')%0A- 호스트: $(hostname)%0A- 원인: ${reason}%0A- 로그: ${LOG_FILE}"
-    curl -fsS -X POST "https://api.telegram.org/bot${token}/sendMessage" \
-        -d "chat_id=${chat_id}" \
-        -d "text=${text}" >/dev/null || true
+    text="❌ Daily Bridge 실패\n- 시각: $(date '+%Y-%m-%d %H:%M:%S')\n- 호스트: $(hostname)\n- 원인: ${reason}\n- 로그: ${LOG_FILE}"
+    # 공용 notifier(keep-alive 연결 + 재시도/백오프)로 전송
+    TELEGRAM_BOT_TOKEN="$token" TELEGRAM_CHAT_ID="$chat_id" \
+        "${PYTHON_BIN:-python3}" "$SCRIPT_DIR/telegram_notifier.py" --text "$text" --label "Daily Bridge 실패 알림" >/dev/null || true
 }
 
 cleanup() {
@@ -82,10 +82,10 @@ send_zero_added_alert_once() {
     fi
 
     local msg
-    msg="⚠️ Perplexity 신규 뉴스 0건 감지 (${RUN_DATE})%0A- reason: ${reason}%0A- host: $(hostname)%0A- script: run_perplexity_auto.sh"
-    if curl -fsS -X POST "https://api.telegram.org/bot${token}/sendMessage" \
-        -d "chat_id=${chat_id}" \
-        -d "text=${msg}" >/dev/null; then
+    msg="⚠️ Perplexity 신규 뉴스 0건 감지 (${RUN_DATE})\n- reason: ${reason}\n- host: $(hostname)\n- script: run_perplexity_auto.sh"
+    # 공용 notifier(keep-alive 연결 + 재시도/백오프)로 전송
+    if TELEGRAM_BOT_TOKEN="$token" TELEGRAM_CHAT_ID="$chat_id" \
+        "${PYTHON_BIN:-python3}" "$SCRIPT_DIR/telegram_notifier.py" --text "$msg" --label "added=0 알림" >/dev/null; then
         touch "$ZERO_ADDED_ALERT_SENT"
         echo "✅ $(date '+%Y-%m-%d %H:%M:%S') - added=0 텔레그램 알림 발송 완료"
     else
@@ -6,6 +6,7 @@
  * 사용:
  *   node ./scripts/normalize.js --in ./data/raw/perplexity.txt --out ./data/normalized/news.json
  *   node ./scripts/normalize.js --in ./data/raw/perplexity.json --out ./data/normalized/news.json
+ *   node ./scripts/normalize.js --in ./data/raw/perplexity.txt --out -   (결과 JSON을 stdout으로)
  *
  * 입력 지원:
  * 1) 이미 JSON인 경우:
@@ -59,24 +60,31 @@ const out = {
   items,
 };
 
-const allowEmptyWrite = String(process.env.ALLOW_EMPTY_NEWS_WRITE || "").toLowerCase() === "true";
-
-if (items.length === 0 && !allowEmptyWrite && fs.existsSync(outPath)) {
-  try {
-    const prevRaw = fs.readFileSync(outPath, "utf-8");
-    const prevData = JSON.parse(prevRaw);
-    const prevCount = Array.isArray(prevData?.items) ? prevData.items.length : 0;
-    if (prevCount > 0) {
-      console.warn(`WARN: parsed 0 items; keep existing output with ${prevCount} items -> ${outPath}`);
-      process.exit(0);
+if (outPath === "-") {
+  // 파이프라인 러너(in-process 모드)용: 파일 대신 stdout으로 넘긴다.
+  // 0건일 때 기존 파일 유지 여부는 호출 측(perplexity_auto)이 판단한다.
+  process.stdout.write(JSON.stringify(out));
+  console.error(`OK: parsed ${items.length} items -> stdout`);
+} else {
+  const allowEmptyWrite = String(process.env.ALLOW_EMPTY_NEWS_WRITE || "").toLowerCase() === "true";
+
+  if (items.length === 0 && !allowEmptyWrite && fs.existsSync(outPath)) {
+    try {
+      const prevRaw = fs.readFileSync(outPath, "utf-8");
+      const prevData = JSON.parse(prevRaw);
+      const prevCount = Array.isArray(prevData?.items) ? prevData.items.length : 0;
+      if (prevCount > 0) {
+        console.warn(`WARN: parsed 0 items; keep existing output with ${prevCount} items -> ${outPath}`);
+        process.exit(0);
+      }
+    } catch (_) {
     }
-  } catch (_) {
   }
-}
 
-fs.mkdirSync(path.dirname(outPath), { recursive: true });
-fs.writeFileSync(outPath, JSON.stringify(out, null, 2), "utf-8");
-console.log(`OK: wrote ${items.length} items -> ${outPath}`);
+  fs.mkdirSync(path.dirname(outPath), { recursive: true });
+  fs.writeFileSync(outPath, JSON.stringify(out, null, 2), "utf-8");
+  console.log(`OK: wrote ${items.length} items -> ${outPath}`);
+}
 
 function parseInput(raw, filename) {
   const isJson = filename.toLowerCase().endsWith(".json");
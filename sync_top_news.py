@@ -3,14 +3,16 @@
 
 import json
 import os
-import re
-import subprocess
-import tempfile
 import urllib.parse
-import urllib.request
 import html
 from datetime import datetime, timezone
 
+import html_slots
+import news_store
+import news_time_index
+import publish_fanout
+import telegram_notifier
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 WORKSPACE_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
 
@@ -86,84 +88,6 @@ def get_news_json_targets():
     return deduped
 
 
-def atomic_write_json(file_path, payload):
-    target_path = os.path.abspath(file_path)
-    target_dir = os.path.dirname(target_path) or "."
-    os.makedirs(target_dir, exist_ok=True)
-
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=target_dir,
-            prefix=f".{os.path.basename(target_path)}.",
-            suffix=".tmp",
-            delete=False,
-        ) as f:
-            tmp_path = f.name
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-
-        os.replace(tmp_path, target_path)
-
-        try:
-            dir_fd = os.open(target_dir, os.O_RDONLY)
-            try:
-                os.fsync(dir_fd)
-            finally:
-                os.close(dir_fd)
-        except OSError:
-            pass
-    except Exception:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
-        raise
-
-
-def _read_env_file(path):
-    values = {}
-    if not path or not os.path.exists(path):
-        return values
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                key, val = line.split("=", 1)
-                key = key.strip()
-                val = val.strip().strip('"').strip("'")
-                if key:
-                    values[key] = val
-    except Exception:
-        return {}
-    return values
-
-
-def _get_telegram_credentials():
-    token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
-    chat_id = os.getenv("TELEGRAM_CHAT_ID", "").strip()
-    if token and chat_id:
-        return token, chat_id
-
-    env_candidates = [
-        os.path.join(BASE_DIR, ".env"),
-        os.path.join(WORKSPACE_ROOT, "woonmok.github.io", ".env"),
-    ]
-    merged = {}
-    for p in env_candidates:
-        merged.update(_read_env_file(p))
-
-    token = token or str(merged.get("TELEGRAM_BOT_TOKEN", "")).strip()
-    chat_id = chat_id or str(merged.get("TELEGRAM_CHAT_ID", "")).strip()
-    return token, chat_id
-
-
 def _load_sync_telegram_state():
     try:
         with open(SYNC_TELEGRAM_STATE_FILE, "r", encoding="utf-8") as f:
@@ -177,7 +101,7 @@ def _load_sync_telegram_state():
 
 def _save_sync_telegram_state(payload):
     os.makedirs(STATE_DIR, exist_ok=True)
-    atomic_write_json(SYNC_TELEGRAM_STATE_FILE, payload)
+    news_store.atomic_write_json(SYNC_TELEGRAM_STATE_FILE, payload)
 
 
 def _should_send_sync_notification(is_success):
@@ -203,8 +127,7 @@ def _mark_sync_notification_sent(is_success):
 
 
 def send_sync_notification(top_news, html_success, dash_success, news_success):
-    token, chat_id = _get_telegram_credentials()
-    if not token or not chat_id:
+    if not telegram_notifier.get_notifier().enabled:
         print("ℹ️ Telegram 알림 건너뜀: TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID 없음")
         return False
 
@@ -232,44 +155,17 @@ def send_sync_notification(top_news, html_success, dash_success, news_success):
             lines.append(f"  {idx}) [{category}] {title}")
 
     msg = "\n".join(lines)
-    payload = urllib.parse.urlencode({"chat_id": chat_id, "text": msg}).encode("utf-8")
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-
-    try:
-        req = urllib.request.Request(url, data=payload, method="POST")
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            if 200 <= resp.status < 300:
-                _mark_sync_notification_sent(is_success)
-                print("✅ Telegram Top2 동기화 알림 전송 완료")
-                return True
-    except Exception as e:
-        err_text = str(e)
-        if "CERTIFICATE_VERIFY_FAILED" in err_text:
-            if _send_telegram_via_curl(token, chat_id, msg):
-                _mark_sync_notification_sent(is_success)
-                print("✅ Telegram Top2 동기화 알림 전송 완료(curl fallback)")
-                return True
-        print(f"⚠️ Telegram 알림 전송 실패: {e}")
-    return False
-
-
-def _send_telegram_via_curl(token, chat_id, message):
-    cmd = [
-        "curl",
-        "-fsS",
-        "-X",
-        "POST",
-        f"https://api.telegram.org/bot{token}/sendMessage",
-        "-d",
-        f"chat_id={chat_id}",
-        "--data-urlencode",
-        f"text={message}",
-    ]
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=12)
-        return proc.returncode == 0
-    except Exception:
-        return False
+    # 전송은 백그라운드 워커가 맡는다. 같은 상태 알림이 대기 중이면 하나로 합쳐지고,
+    # 당일 중복 방지 상태는 실제 전송이 성공한 뒤에만 기록한다.
+    queued = telegram_notifier.notify(
+        msg,
+        key=("sync_top_news", is_success),
+        on_delivered=lambda: _mark_sync_notification_sent(is_success),
+        label="Telegram Top2 동기화 알림",
+    )
+    if queued:
+        print("📨 Telegram Top2 동기화 알림 전송 대기열에 추가")
+    return queued
 
 
 def _parse_generated_at(data):
@@ -285,63 +181,6 @@ def _parse_generated_at(data):
         return None
 
 
-def _parse_published_at(item):
-    raw = item.get("published_at")
-    if not raw:
-        return None
-    try:
-        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed
-    except Exception:
-        return None
-
-
-def _parse_decision_generated_at(item):
-    raw = item.get("decision_generated_at")
-    if not raw:
-        return None
-    try:
-        parsed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed
-    except Exception:
-        return None
-
-
-def _sort_key_for_top(item):
-    decision_dt = _parse_decision_generated_at(item)
-    published_dt = _parse_published_at(item)
-
-    decision_key = (
-        decision_dt.astimezone(timezone.utc).isoformat() if decision_dt else ""
-    )
-    published_key = (
-        published_dt.astimezone(timezone.utc).isoformat() if published_dt else ""
-    )
-
-    # 우선순위: decision_generated_at(최신 의사결정) > published_at(기사 발행일)
-    return (decision_key, published_key)
-
-
-def _is_within_last_hours(item, hours: int = 24) -> bool:
-    now_utc = datetime.now(timezone.utc)
-    cutoff = now_utc.timestamp() - (hours * 3600)
-
-    candidates = [
-        _parse_decision_generated_at(item),
-        _parse_published_at(item),
-    ]
-    for dt in candidates:
-        if dt is None:
-            continue
-        if dt.astimezone(timezone.utc).timestamp() >= cutoff:
-            return True
-    return False
-
-
 def sanitize_url(url_value):
     if not url_value:
         return ""
@@ -383,10 +222,10 @@ def load_top_news():
     try:
         news_json_path = resolve_news_json_path()
         print(f"   📥 뉴스 소스: {news_json_path}")
-        with open(news_json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
+        data = news_store.read(news_json_path)
+
         items = data.get("items", [])
+        index = news_time_index.index_for(items)
 
         generated_at = _parse_generated_at(data)
         if generated_at:
@@ -394,74 +233,20 @@ def load_top_news():
         else:
             today_date = datetime.now(timezone.utc).date()
 
-        today_items = []
-        for item in items:
-            decision_generated = _parse_decision_generated_at(item)
-            published = _parse_published_at(item)
-            decision_is_today = (
-                decision_generated
-                and decision_generated.astimezone(timezone.utc).date() == today_date
-            )
-            published_is_today = (
-                published and published.astimezone(timezone.utc).date() == today_date
-            )
-
-            if decision_is_today or published_is_today:
-                today_items.append(item)
-
+        # 시간 컬럼/버킷 인덱스로 윈도만 추리고, 정렬은 힙에서 필요한 만큼만 꺼낸다.
         # 최신순 (decision_generated_at 우선, 없으면 published_at)
-        recent_24h_items = [item for item in items if _is_within_last_hours(item, 24)]
-        sorted_recent_24h = sorted(recent_24h_items, key=_sort_key_for_top, reverse=True)
-        sorted_today = sorted(today_items, key=_sort_key_for_top, reverse=True)
-        sorted_all = sorted(items, key=_sort_key_for_top, reverse=True)
-
-        def pick_top2_with_diversity(candidates, fallback):
-            if not candidates:
-                candidates = fallback
-            if not candidates:
-                return []
-
-            first = candidates[0]
-            first_category = first.get("category")
-            second = None
-
-            # 두 번째 뉴스는 가능하면 다른 카테고리로 선택
-            for item in candidates[1:]:
-                if item.get("category") and item.get("category") != first_category:
-                    second = item
-                    break
-
-            # 오늘 뉴스에서 못 찾으면 전체 뉴스에서 다른 카테고리 탐색
-            if second is None:
-                for item in fallback:
-                    if item.get("id") == first.get("id"):
-                        continue
-                    if item.get("category") and item.get("category") != first_category:
-                        second = item
-                        break
-
-            # 그래도 없으면 단순 최신 2건
-            if second is None:
-                for item in candidates[1:]:
-                    if item.get("id") != first.get("id"):
-                        second = item
-                        break
-            if second is None:
-                for item in fallback:
-                    if item.get("id") != first.get("id"):
-                        second = item
-                        break
-
-            return [first, second] if second else [first]
+        recent_24h = index.last_hours(24)
+        today = index.on_date(today_date)
 
         # 24시간 이내 최신 기사 우선 → 오늘자 → 전체 최신순
-        if len(sorted_recent_24h) >= 2:
-            candidate_pool = sorted_recent_24h
-        elif len(sorted_today) >= 2:
-            candidate_pool = sorted_today
+        if len(recent_24h) >= 2:
+            candidate_pool = recent_24h
+        elif len(today) >= 2:
+            candidate_pool = today
         else:
-            candidate_pool = sorted_all
-        return pick_top2_with_diversity(candidate_pool, sorted_all)[:2]
+            candidate_pool = None
+        # 두 번째 뉴스는 가능하면 다른 카테고리로 선택 (후보 → 전체 → 단순 최신 순으로 탐색)
+        return index.top_k(2, candidate_pool, diverse=True)
     except Exception as e:
         print(f"Error loading news: {e}")
         return []
@@ -518,82 +303,100 @@ def generate_news_html(top_news):
     return '\n                    '.join(html_parts)
 
 
+def _print_fanout(report, label):
+    """publish_fanout 결과를 대상별 한 줄 + 요약으로 출력"""
+    for result in report.results:
+        if result.status == "written":
+            print(f"✅ {label} 동기화 완료: {result.path} ({result.bytes}B, {result.latency_ms:.1f}ms, {result.method})")
+        elif result.status == "unchanged":
+            print(f"⏭️ {label} 변경 없음(쓰기 생략): {result.path}")
+        else:
+            reason = result.error or "다른 대상 실패로 트랜잭션 취소"
+            print(f"❌ {label} 동기화 실패({result.path}): {reason}")
+    print(f"   📦 {label} fan-out: {report.summary()}")
+
+
 def update_html(news_html):
-    """index.html 업데이트 - Intelligence Hub 섹션에 주입"""
+    """index.html 업데이트 - Intelligence Hub 슬롯에 주입 (슬롯 내용이 같으면 쓰기 생략)"""
     ok = True
+    plan = {}
+    new_offsets = {}
     for target_html in get_html_targets():
         try:
-            with open(target_html, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            pattern_clean = r'<div class="section-content" id="intelligence-hub-content">.*?</div>\s*</section>'
-            replacement_clean = '''<div class="section-content" id="intelligence-hub-content">
-                </div>
-            </section>'''
-            content_clean = re.sub(pattern_clean, replacement_clean, content, count=1, flags=re.DOTALL)
-
-            pattern_inject = r'(<div class="section-content" id="intelligence-hub-content">\s*)(\s*</div>)'
-            replacement_inject = f'\\1{news_html}\\2'
-            new_content = re.sub(pattern_inject, replacement_inject, content_clean, count=1, flags=re.DOTALL)
-
-            with open(target_html, "w", encoding="utf-8") as f:
-                f.write(new_content)
-
-            print(f"✅ The Wave Tree Project 업데이트 완료: {target_html}")
+            new_content, offsets, missing = html_slots.render_file(target_html, {"intelligence-hub": news_html})
+            if missing:
+                print(f"⚠️ Intelligence Hub 슬롯을 찾지 못함({target_html}): {', '.join(missing)}")
+            if new_content is None:
+                plan[target_html] = None
+                continue
+            plan[target_html] = new_content.encode("utf-8")
+            new_offsets[target_html] = offsets
         except Exception as e:
             ok = False
             print(f"❌ 업데이트 실패({target_html}): {e}")
+
+    if plan:
+        report = publish_fanout.publish(plan)
+        _print_fanout(report, "index.html")
+        for result in report.written:
+            html_slots.remember(result.path, new_offsets.get(result.path, {}))
+        ok = ok and report.ok
     return ok
 
 
+def build_intelligence(top_news):
+    return [
+        {
+            "title": n.get("title", ""),
+            "summary": n.get("summary", ""),
+            "tag": n.get("category", ""),
+            "score": str(n.get("score", "")),
+            "url": sanitize_url(n.get("url", ""))
+        }
+        for n in top_news
+    ]
+
+
 def update_dashboard_json(top_news):
-    """dashboard_data.json의 intelligence 필드를 탑 뉴스 2개로 갱신"""
+    """dashboard_data.json의 intelligence 필드를 탑 뉴스 2개로 갱신 (Top 2가 그대로면 파일을 건드리지 않음)"""
     ok = True
+    plan = {}
+    intelligence = build_intelligence(top_news)
     for dashboard_path in get_dashboard_targets():
         try:
-            with open(dashboard_path, "r", encoding="utf-8") as f:
-                dashboard = json.load(f)
+            dashboard = news_store.checkout(dashboard_path)
+            if dashboard.get("intelligence") == intelligence:
+                # backup/last_updated까지 그대로 두어야 불필요한 배포 diff가 생기지 않는다.
+                plan[dashboard_path] = None
+                continue
 
             dashboard["intelligence_backup"] = dashboard.get("intelligence", [])
-            dashboard["intelligence"] = [
-                {
-                    "title": n.get("title", ""),
-                    "summary": n.get("summary", ""),
-                    "tag": n.get("category", ""),
-                    "score": str(n.get("score", "")),
-                    "url": sanitize_url(n.get("url", ""))
-                }
-                for n in top_news
-            ]
+            dashboard["intelligence"] = intelligence
             dashboard["last_updated"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-            atomic_write_json(dashboard_path, dashboard)
-            print(f"✅ dashboard_data.json intelligence 필드 동기화 완료: {dashboard_path}")
+            plan[dashboard_path] = news_store.serialize_json(dashboard)
         except Exception as e:
             ok = False
             print(f"❌ dashboard_data.json 동기화 실패({dashboard_path}): {e}")
+
+    if plan:
+        report = publish_fanout.publish(plan)
+        _print_fanout(report, "dashboard_data.json")
+        ok = ok and report.ok
     return ok
 
 
 def mirror_news_json_source(news_json_path):
-    """선택된 뉴스 소스를 deploy root/docs news.json으로 동기화"""
-    ok = True
+    """선택된 뉴스 소스를 deploy root/docs news.json으로 동기화 (1회 직렬화, 바뀐 대상만 기록)"""
     try:
-        with open(news_json_path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
+        payload = news_store.serialize_json(news_store.read(news_json_path))
     except Exception as e:
         print(f"❌ news.json 소스 로드 실패({news_json_path}): {e}")
         return False
 
-    for target in get_news_json_targets():
-        try:
-            atomic_write_json(target, payload)
-            print(f"✅ news.json 동기화 완료: {target}")
-        except Exception as e:
-            ok = False
-            print(f"❌ news.json 동기화 실패({target}): {e}")
-
-    return ok
+    report = publish_fanout.publish({target: payload for target in get_news_json_targets()})
+    _print_fanout(report, "news.json")
+    return report.ok
 
 
 def sync_to_html():
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# telegram_notifier.py - Telegram 알림 큐 + 백그라운드 전송
+#
+# - notify()는 메시지를 큐에 넣고 바로 반환한다 (발행 경로는 Telegram을 기다리지 않음)
+# - 워커 스레드 1개가 keep-alive HTTP 연결(http.client)을 재사용해 전송하고,
+#   실패 시 지수 백오프(+지터)로 재시도한다. 429면 응답의 retry_after를 따른다.
+#   인증서 검증 실패(CERTIFICATE_VERIFY_FAILED)는 기존처럼 curl로 한 번 더 시도한다.
+# - 같은 coalesce key의 메시지가 아직 대기 중이면 새로 쌓지 않고 내용만 최신으로 바꾼다.
+# - 프로세스 종료 시(atexit) 대기 중인 메시지를 TELEGRAM_FLUSH_TIMEOUT초까지만 비운다.
+# - TELEGRAM_API_BASE로 엔드포인트를 바꿀 수 있다 (로컬 stand-in 봇 서버로 테스트).
+#
+# 셸 러너용 CLI: python3 telegram_notifier.py --text "메시지"  (동기 전송, 성공 시 종료 코드 0)
+import argparse
+import atexit
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKSPACE_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+REQUEST_TIMEOUT = float(os.getenv("TELEGRAM_TIMEOUT", "10"))
+MAX_ATTEMPTS = int(os.getenv("TELEGRAM_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE = float(os.getenv("TELEGRAM_BACKOFF_BASE", "1.0"))
+BACKOFF_MAX = float(os.getenv("TELEGRAM_BACKOFF_MAX", "30"))
+FLUSH_TIMEOUT = float(os.getenv("TELEGRAM_FLUSH_TIMEOUT", "20"))
+
+
+def _read_env_file(path):
+    values = {}
+    if not path or not os.path.exists(path):
+        return values
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, val = line.split("=", 1)
+                key = key.strip()
+                val = val.strip().strip('"').strip("'")
+                if key:
+                    values[key] = val
+    except Exception:
+        return {}
+    return values
+
+
+def get_credentials():
+    token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
+    chat_id = os.getenv("TELEGRAM_CHAT_ID", "").strip()
+    if token and chat_id:
+        return token, chat_id
+
+    env_candidates = [
+        os.path.join(BASE_DIR, ".env"),
+        os.path.join(WORKSPACE_ROOT, "woonmok.github.io", ".env"),
+    ]
+    merged = {}
+    for p in env_candidates:
+        merged.update(_read_env_file(p))
+
+    token = token or str(merged.get("TELEGRAM_BOT_TOKEN", "")).strip()
+    chat_id = chat_id or str(merged.get("TELEGRAM_CHAT_ID", "")).strip()
+    return token, chat_id
+
+
+class DeliveryError(Exception):
+    def __init__(self, message, retry_after=None, retryable=True):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+
+class PooledClient:
+    """API_BASE 호스트로의 keep-alive 연결 1개를 재사용한다. 끊기면 다음 요청에서 다시 연결."""
+
+    def __init__(self, api_base=None, timeout=REQUEST_TIMEOUT):
+        self.api_base = (api_base or API_BASE).rstrip("/")
+        parsed = urllib.parse.urlsplit(self.api_base)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.path_prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            import http.client
+
+            if self.scheme == "https":
+                import ssl
+
+                self._conn = http.client.HTTPSConnection(
+                    self.host, self.port, timeout=self.timeout, context=ssl.create_default_context()
+                )
+            else:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def send_message(self, token, chat_id, text):
+        body = urllib.parse.urlencode({"chat_id": chat_id, "text": text}).encode("utf-8")
+        path = f"{self.path_prefix}/bot{token}/sendMessage"
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"}
+        try:
+            conn = self._connection()
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+            status = resp.status
+            if resp.will_close:
+                self.close()
+        except Exception as e:
+            self.close()
+            raise DeliveryError(str(e)) from e
+
+        if 200 <= status < 300:
+            return
+        retry_after = None
+        try:
+            retry_after = json.loads(raw.decode("utf-8")).get("parameters", {}).get("retry_after")
+        except Exception:
+            pass
+        # 429/5xx만 재시도한다 (400/401/403 등은 재시도해도 같은 결과)
+        retryable = status == 429 or status >= 500
+        raise DeliveryError(f"HTTP {status}", retry_after=retry_after, retryable=retryable)
+
+
+def _send_via_curl(api_base, token, chat_id, message):
+    cmd = [
+        "curl",
+        "-fsS",
+        "-X",
+        "POST",
+        f"{api_base}/bot{token}/sendMessage",
+        "-d",
+        f"chat_id={chat_id}",
+        "--data-urlencode",
+        f"text={message}",
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=12)
+        return proc.returncode == 0
+    except Exception:
+        return False
+
+
+class _Message:
+    __slots__ = ("text", "on_delivered", "label")
+
+    def __init__(self, text, on_delivered, label):
+        self.text = text
+        self.on_delivered = on_delivered
+        self.label = label
+
+
+class Notifier:
+    """큐 + 백그라운드 워커. notify()는 블로킹하지 않는다."""
+
+    def __init__(self, token=None, chat_id=None, client=None, max_attempts=MAX_ATTEMPTS,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, sleep=time.sleep):
+        if token is None or chat_id is None:
+            token, chat_id = get_credentials()
+        self.token = token
+        self.chat_id = chat_id
+        self.client = client or PooledClient()
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._pending = OrderedDict()  # coalesce key -> _Message (대기 순서 유지)
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._worker = None
+        self._seq = 0
+        self.delivered = 0
+        self.failed = 0
+        self.coalesced = 0
+
+    @property
+    def enabled(self):
+        return bool(self.token and self.chat_id)
+
+    def notify(self, text, key=None, on_delivered=None, label="Telegram 알림"):
+        """메시지를 큐에 넣는다. 같은 key가 대기 중이면 내용만 교체(coalesce)한다. 큐에 넣었으면 True."""
+        if not self.enabled:
+            return False
+        with self._cond:
+            if key is None:
+                self._seq += 1
+                key = ("seq", self._seq)
+            message = _Message(text, on_delivered, label)
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = message
+            self._ensure_worker()
+            self._cond.notify_all()
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                _, message = self._pending.popitem(last=False)
+                self._inflight += 1
+            try:
+                self.deliver(message)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+    def deliver(self, message):
+        """재시도/백오프를 포함해 동기로 전송한다. 성공 시 on_delivered를 호출하고 True."""
+        if isinstance(message, str):
+            message = _Message(message, None, "Telegram 알림")
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.client.send_message(self.token, self.chat_id, message.text)
+                return self._delivered(message, "")
+            except DeliveryError as e:
+                last_error = e
+                if "CERTIFICATE_VERIFY_FAILED" in str(e):
+                    if _send_via_curl(self.client.api_base, self.token, self.chat_id, message.text):
+                        return self._delivered(message, "(curl fallback)")
+                    break
+                if not e.retryable or attempt == self.max_attempts:
+                    break
+                if e.retry_after is not None:
+                    delay = float(e.retry_after)
+                else:
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+                    delay += random.uniform(0, delay / 2)
+                self._sleep(delay)
+        self.failed += 1
+        print(f"⚠️ {message.label} 전송 실패: {last_error}")
+        return False
+
+    def _delivered(self, message, suffix):
+        self.delivered += 1
+        if message.on_delivered:
+            try:
+                message.on_delivered()
+            except Exception as e:
+                print(f"⚠️ {message.label} 전송 후 상태 기록 실패: {e}")
+        print(f"✅ {message.label} 전송 완료{suffix}")
+        return True
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """대기/전송 중인 메시지가 끝날 때까지 최대 timeout초 기다린다. 모두 비웠으면 True."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while self._pending or self._inflight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + self._inflight
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier():
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = Notifier()
+            atexit.register(_flush_at_exit)
+        return _notifier
+
+
+def _flush_at_exit():
+    if _notifier is not None and _notifier.pending():
+        if not _notifier.flush(FLUSH_TIMEOUT):
+            print(f"⚠️ Telegram 알림 {_notifier.pending()}건 미전송 (종료 대기 {FLUSH_TIMEOUT:.0f}s 초과)")
+
+
+def notify(text, key=None, on_delivered=None, label="Telegram 알림"):
+    return get_notifier().notify(text, key=key, on_delivered=on_delivered, label=label)
+
+
+def flush(timeout=FLUSH_TIMEOUT):
+    return get_notifier().flush(timeout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Telegram 메시지 동기 전송 (셸 러너용)")
+    parser.add_argument("--text", required=True, help="보낼 메시지 (\\n은 줄바꿈으로 변환)")
+    parser.add_argument("--label", default="Telegram 알림", help="로그에 표시할 이름")
+    args = parser.parse_args()
+
+    notifier = Notifier()
+    if not notifier.enabled:
+        print("ℹ️ Telegram 알림 건너뜀: TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID 없음")
+        return 0
+    text = args.text.replace("\\n", "\n")
+    ok = notifier.deliver(_Message(text, None, args.label))
+    notifier.client.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,22 @@ import hashlib
 import json
 import os
 import re
-import subprocess
+import sys
+from collections import deque
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-from perplexity import Perplexity
-import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import llm_client  # noqa: E402
+import news_snapshots  # noqa: E402
+import news_store  # noqa: E402
+import probe_cache  # noqa: E402
+from near_dup_index import NearDupIndex, item_text  # noqa: E402
+import validate_news_urls  # noqa: E402
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    def load_dotenv(*args, **kwargs):
-        return False
+# perplexity SDK(pydantic 포함)와 requests는 import 비용이 커서,
+# 실제로 부족한 카테고리가 있을 때만 해당 경로에서 import 한다.
 
 TARGET_COUNTS = {
     "listeria_free": 4,
@@ -173,27 +177,19 @@ def is_suspicious_url(url: str) -> bool:
 
 
 def probe_http_alive(url: str, timeout: int = 8) -> bool:
-    headers = {"User-Agent": "WaveTreeNewsBot/1.0 (+backfill)"}
-    try:
-        resp = requests.head(url, timeout=timeout, allow_redirects=True, headers=headers)
-        status = int(getattr(resp, "status_code", 0) or 0)
-        return 200 <= status < 400
-    except Exception:
-        try:
-            resp = requests.get(url, timeout=timeout, allow_redirects=True, headers=headers)
-            status = int(getattr(resp, "status_code", 0) or 0)
-            return 200 <= status < 400
-        except Exception:
-            return True
+    # validate_news_urls와 같은 probe + 영속 캐시(.state/url_probe_cache.sqlite3)를 쓴다.
+    # 2xx/3xx 또는 네트워크 오류(판단 보류)면 살아있는 것으로 본다.
+    return validate_news_urls.probe_record(url, timeout).alive
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--file", required=True, help="Target normalized news.json")
-    args = parser.parse_args()
-
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    load_dotenv(os.path.join(base_dir, ".env"))
+def create_perplexity_client(base_dir: str):
+    """.env 로드 → API 키 확인 → SDK import 순으로 클라이언트를 만든다. (client, model) 반환."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(os.path.join(base_dir, ".env"))
 
     api_key = os.getenv("PERPLEXITY_API_KEY", "").strip()
     raw_model = os.getenv("PERPLEXITY_MODEL", "").strip().lower()
@@ -203,16 +199,227 @@ def main() -> int:
     if not api_key:
         raise RuntimeError("PERPLEXITY_API_KEY not set")
 
-    with open(args.file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    from perplexity import Perplexity
+
+    return Perplexity(api_key=api_key), model
 
-    items = data.get("items", []) if isinstance(data, dict) else []
-    if not isinstance(items, list):
-        items = []
+
+SYSTEM_PROMPT = "너는 사실 기반 뉴스 큐레이터다. URL은 실제 기사 원문만 사용하고, 중복 URL/홈페이지/검색결과 링크를 절대 내지 마라."
+CATEGORY_ORDER = ("listeria_free", "cultured_meat", "high_end_audio", "computer_ai", "global_biz")
+MAX_ATTEMPTS_PER_CATEGORY = 6
+REQUEST_BUDGET = int(os.getenv("BACKFILL_REQUEST_BUDGET", str(MAX_ATTEMPTS_PER_CATEGORY * len(TARGET_COUNTS))))
+MODEL_WORKERS = int(os.getenv("BACKFILL_MODEL_WORKERS", str(len(TARGET_COUNTS))))
+PROBE_WORKERS = int(os.getenv("BACKFILL_PROBE_WORKERS", "8"))
+
+
+def fetch_candidates(client, model: str, cat: str, excluded_urls):
+    """카테고리 1회 모델 호출 → 후보 dict 목록 (JSON 배열, 실패 시 markdown 목록 파싱)."""
+    user_prompt = PROMPTS[cat] + "\n" + (
+        "이미 수집된 URL(재사용 금지):\n" + "\n".join(f"- {u}" for u in excluded_urls)
+        if excluded_urls
+        else ""
+    )
+
+    def attempt(call):
+        # SDK 호출은 중간에 끊을 수 없어, 헤지에서 진 쪽은 응답을 버리기만 한다.
+        call.check()
+        resp = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+        return (resp.choices[0].message.content or "").strip()
+
+    text = llm_client.hedged("perplexity.backfill", attempt, valid=bool)
+    try:
+        arr = extract_json_array(text)
+    except Exception:
+        arr = extract_items_from_markdown(text)
+    # 모델이 숫자/문자 등 비구조 항목을 섞어줄 수 있어 방어적으로 무시한다.
+    return [x for x in arr if isinstance(x, dict)] if isinstance(arr, list) else []
+
+
+class BackfillScheduler:
+    """부족한 카테고리를 병렬로 채운다.
+
+    - 카테고리별 모델 호출을 동시에 진행한다 (전체 호출 수는 REQUEST_BUDGET, 카테고리당 최대 6회).
+    - 응답 후보는 값싼 필터(형식/검색·홈 URL/중복/근사 중복/MAX_AGE_DAYS)를 통과한 것만 probe 풀로 보낸다.
+    - 모자란 만큼만 probe 하고 나머지 후보는 backlog에 두었다가 probe 실패 시 먼저 꺼내 쓴다.
+    - backlog가 비었는데 probe 대기분을 다 살려도 목표에 못 미치면 probe 결과를 기다리지 않고
+      다음 호출을 바로 시작한다 (모델 호출과 probe가 겹친다).
+    - 채택은 메인 스레드에서만 하므로 TARGET_COUNTS와 id/URL/제목/근사 중복 집합 검사가 순차 실행과 같다.
+    """
+
+    def __init__(self, client, model, by_cat, items, existing_ids, existing_urls, existing_title_keys, near_dups,
+                 probe=probe_http_alive, budget=REQUEST_BUDGET):
+        self.client = client
+        self.model = model
+        self.by_cat = by_cat
+        self.items = items
+        self.existing_ids = existing_ids
+        self.existing_urls = existing_urls
+        self.existing_title_keys = existing_title_keys
+        self.near_dups = near_dups
+        self.probe = probe
+        self.budget = budget
+        self.attempts = {cat: 0 for cat in TARGET_COUNTS}
+        self.calling = set()  # 모델 호출이 진행 중인 카테고리
+        self.pending = {cat: 0 for cat in TARGET_COUNTS}  # probe 대기 후보 수
+        self.backlog = {cat: deque() for cat in TARGET_COUNTS}  # 아직 probe 하지 않은 응답 후보
+        self.pending_urls = set()
+        self.pending_title_keys = set()
+        self.added = 0
+        self.near_dup_dropped = 0
+        self.requests = 0
+
+    def _short(self, cat):
+        return len(self.by_cat[cat]) + self.pending[cat] < TARGET_COUNTS[cat]
+
+    def _can_call(self, cat):
+        return (
+            cat not in self.calling
+            and not self.backlog[cat]
+            and self._short(cat)
+            and self.attempts[cat] < MAX_ATTEMPTS_PER_CATEGORY
+            and self.requests < self.budget
+        )
+
+    def _submit_calls(self, model_pool, futures):
+        for cat in CATEGORY_ORDER:
+            if not self._can_call(cat):
+                continue
+            excluded_urls = [u for u in self.existing_urls if isinstance(u, str)][:20]
+            self.attempts[cat] += 1
+            self.requests += 1
+            self.calling.add(cat)
+            future = model_pool.submit(fetch_candidates, self.client, self.model, cat, excluded_urls)
+            futures[future] = ("call", cat, None)
+
+    def _candidate(self, cat, x):
+        """값싼 필터를 통과하면 (item, title_key, candidate_text), 아니면 None."""
+        title = str(x.get("title", "")).strip()
+        source = str(x.get("source", "")).strip() or "Web"
+        url = str(x.get("url", "")).strip()
+        if not title or not re.match(r"^https?://", url):
+            return None
+        if is_suspicious_url(url):
+            return None
+        if url in self.existing_urls or url in self.pending_urls:
+            return None
+        title_key = normalize_title_key(title)
+        if title_key in self.existing_title_keys or title_key in self.pending_title_keys:
+            return None
+        # HTTP probe 전에 근사 중복부터 걸러 불필요한 네트워크 호출을 줄인다.
+        candidate_text = item_text({"title": title, "summary": x.get("summary", "")})
+        if self.near_dups.query(candidate_text) is not None:
+            self.near_dup_dropped += 1
+            return None
+
+        published_raw = str(x.get("published_at", "")).strip()
+        published_dt = parse_published_at(published_raw) or datetime.now(timezone.utc)
+        age_days = (datetime.now(timezone.utc) - published_dt).days
+        if age_days > MAX_AGE_DAYS.get(cat, 14):
+            return None
+
+        item = {
+            "id": make_id(cat, title, url, source),
+            "category": cat,
+            "title": title,
+            "source": source,
+            "url": url,
+            "published_at": normalize_published_at(published_raw),
+            "summary": str(x.get("summary", "")).strip(),
+            "highlights": [],
+            "tags": [str(t) for t in (x.get("tags") or [])][:5] if isinstance(x.get("tags"), list) else [],
+            "score": None,
+        }
+        if item["id"] in self.existing_ids:
+            return None
+        return item, title_key, candidate_text
+
+    def _accept(self, cat, item, title_key, candidate_text):
+        if len(self.by_cat[cat]) >= TARGET_COUNTS[cat]:
+            return
+        if item["url"] in self.existing_urls or item["id"] in self.existing_ids:
+            return
+        if title_key in self.existing_title_keys:
+            return
+        # 같은 시점에 probe 중이던 다른 후보가 먼저 채택됐을 수 있으므로 근사 중복을 다시 확인한다.
+        if self.near_dups.query(candidate_text) is not None:
+            self.near_dup_dropped += 1
+            return
+        self.items.append(item)
+        self.by_cat[cat].append(item)
+        self.existing_ids.add(item["id"])
+        self.existing_urls.add(item["url"])
+        self.existing_title_keys.add(title_key)
+        self.near_dups.add(candidate_text, item["url"])
+        self.added += 1
+
+    def _feed(self, cat, probe_pool, futures):
+        """probe 대기분을 포함해 목표에 모자란 만큼만 backlog 후보를 probe 풀에 넣는다."""
+        backlog = self.backlog[cat]
+        while backlog and self._short(cat):
+            candidate = self._candidate(cat, backlog.popleft())
+            if candidate is None:
+                continue
+            item, title_key, _ = candidate
+            self.pending[cat] += 1
+            self.pending_urls.add(item["url"])
+            self.pending_title_keys.add(title_key)
+            futures[probe_pool.submit(self.probe, item["url"])] = ("probe", cat, candidate)
+
+    def run(self):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max(1, MODEL_WORKERS)) as model_pool, \
+                ThreadPoolExecutor(max_workers=max(1, PROBE_WORKERS)) as probe_pool:
+            self._submit_calls(model_pool, futures)
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, cat, candidate = futures.pop(future)
+                    if kind == "call":
+                        self.calling.discard(cat)
+                        try:
+                            self.backlog[cat].extend(future.result())
+                        except Exception as e:
+                            # 한 카테고리 호출 실패가 다른 카테고리 결과나 스냅샷 fallback을 막지 않게 한다.
+                            print(f"⚠️ backfill 모델 호출 실패 [{cat}]: {e}")
+                    else:
+                        item, title_key, candidate_text = candidate
+                        self.pending[cat] -= 1
+                        self.pending_urls.discard(item["url"])
+                        self.pending_title_keys.discard(title_key)
+                        try:
+                            alive = future.result()
+                        except Exception as e:
+                            print(f"⚠️ backfill probe 실패 [{cat}] {item['url']}: {e}")
+                            alive = False
+                        if alive:
+                            self._accept(cat, item, title_key, candidate_text)
+                    self._feed(cat, probe_pool, futures)
+                self._submit_calls(model_pool, futures)
+        print(f"backfill_requests={self.requests} attempts={self.attempts}")
+
+
+def backfill_items(items, file_path: str):
+    """부족한 카테고리를 채우고 카테고리별 고정 개수로 정렬한 items를 반환한다.
+
+    file_path는 대상 news.json 경로다 (호환용 인자, 파일을 읽거나 쓰지는 않는다).
+    """
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    items = list(items)
 
     # 1) 카테고리 내부 URL 중복 제거: 같은 섹션에서 같은 링크 반복 방지
+    #    + 제목/매체만 바뀐 같은 기사(근사 중복)는 카테고리와 무관하게 1건만 유지
     cleaned = []
     seen_by_category = {k: set() for k in TARGET_COUNTS}
+    near_dups = NearDupIndex()
+    near_dup_dropped = 0
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -224,6 +431,9 @@ def main() -> int:
             continue
         if url in seen_by_category[category]:
             continue
+        if near_dups.check_and_add(item_text(item), url) is not None:
+            near_dup_dropped += 1
+            continue
         seen_by_category[category].add(url)
         cleaned.append(item)
     items = cleaned
@@ -242,143 +452,30 @@ def main() -> int:
         if isinstance(it, dict) and it.get("title")
     }
 
-    print(f"backfill_model={model}")
-    client = Perplexity(api_key=api_key)
-
+    # 모든 카테고리가 TARGET_COUNTS를 채웠으면 .env/SDK를 건드리지 않고 정렬·저장만 한다.
+    deficits = [cat for cat in TARGET_COUNTS if len(by_cat[cat]) < TARGET_COUNTS[cat]]
     added = 0
-    fallback_added = 0
-    for cat in ("listeria_free", "cultured_meat", "high_end_audio", "computer_ai", "global_biz"):
-        need = TARGET_COUNTS[cat]
-        have = len(by_cat.get(cat, []))
-        if have >= need:
-            continue
-
-        # 최대 4회 재시도하면서 누락 슬롯 채우기
-        for attempt in range(1, 7):
-            if len(by_cat[cat]) >= need:
-                break
-
-            excluded_urls = [u for u in existing_urls if isinstance(u, str)]
-            excluded_urls = [u for u in excluded_urls if isinstance(u, str)][:20]
-            user_prompt = PROMPTS[cat] + "\n" + (
-                "이미 수집된 URL(재사용 금지):\n" + "\n".join(f"- {u}" for u in excluded_urls)
-                if excluded_urls
-                else ""
-            )
-
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "너는 사실 기반 뉴스 큐레이터다. URL은 실제 기사 원문만 사용하고, 중복 URL/홈페이지/검색결과 링크를 절대 내지 마라.",
-                    },
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            text = (resp.choices[0].message.content or "").strip()
-
-            try:
-                arr = extract_json_array(text)
-            except Exception:
-                arr = extract_items_from_markdown(text)
-
-            for x in arr:
-                if not isinstance(x, dict):
-                    # 모델이 숫자/문자 등 비구조 항목을 섞어줄 수 있어 방어적으로 무시한다.
-                    continue
-
-                if len(by_cat[cat]) >= need:
-                    break
-
-                title = str(x.get("title", "")).strip()
-                source = str(x.get("source", "")).strip() or "Web"
-                url = str(x.get("url", "")).strip()
-                if not title or not re.match(r"^https?://", url):
-                    continue
-                if is_suspicious_url(url):
-                    continue
-                if not probe_http_alive(url):
-                    continue
-                if url in existing_urls:
-                    continue
-                title_key = normalize_title_key(title)
-                if title_key in existing_title_keys:
-                    continue
-
-                published_raw = str(x.get("published_at", "")).strip()
-                published_dt = parse_published_at(published_raw)
-                if published_dt is None:
-                    published_dt = datetime.now(timezone.utc)
-
-                max_age_days = MAX_AGE_DAYS.get(cat, 14)
-                age_days = (datetime.now(timezone.utc) - published_dt).days
-                if age_days > max_age_days:
-                    continue
-
-                item = {
-                    "id": make_id(cat, title, url, source),
-                    "category": cat,
-                    "title": title,
-                    "source": source,
-                    "url": url,
-                    "published_at": normalize_published_at(published_raw),
-                    "summary": str(x.get("summary", "")).strip(),
-                    "highlights": [],
-                    "tags": [str(t) for t in (x.get("tags") or [])][:5] if isinstance(x.get("tags"), list) else [],
-                    "score": None,
-                }
-                if item["id"] in existing_ids:
-                    continue
-
-                items.append(item)
-                by_cat[cat].append(item)
-                existing_ids.add(item["id"])
-                existing_urls.add(url)
-                existing_title_keys.add(title_key)
-                added += 1
-
-    # 모델 응답이 불완전한 경우, 마지막 정상 데이터(news.json)로 슬롯을 채워 고정 카운트를 보장한다.
-    fallback_candidates = []
-
-    fallback_file = os.path.abspath(os.path.join(base_dir, "..", "woonmok.github.io", "news.json"))
-    if os.path.isfile(fallback_file):
-        try:
-            with open(fallback_file, "r", encoding="utf-8") as f:
-                fallback_data = json.load(f)
-            if isinstance(fallback_data, dict) and isinstance(fallback_data.get("items"), list):
-                fallback_candidates.extend([x for x in fallback_data["items"] if isinstance(x, dict)])
-        except Exception:
-            pass
-
-    # 현 파일이 이미 축소된 경우를 대비해, 마지막 커밋된 정상본도 fallback 소스로 사용한다.
-    try:
-        rel_path = os.path.relpath(os.path.abspath(args.file), start=base_dir)
-        result = subprocess.run(
-            ["git", "show", f"HEAD:{rel_path}"],
-            cwd=base_dir,
-            capture_output=True,
-            text=True,
-            check=True,
+    if deficits:
+        client, model = create_perplexity_client(base_dir)
+        print(f"backfill_model={model}")
+        scheduler = BackfillScheduler(
+            client, model, by_cat, items, existing_ids, existing_urls, existing_title_keys, near_dups
         )
-        head_data = json.loads(result.stdout)
-        if isinstance(head_data, dict) and isinstance(head_data.get("items"), list):
-            fallback_candidates.extend([x for x in head_data["items"] if isinstance(x, dict)])
-    except Exception:
-        pass
-
-    fallback_by_cat = {cat: [] for cat in TARGET_COUNTS}
-    for item in fallback_candidates:
-        cat = item.get("category")
-        if cat in fallback_by_cat:
-            fallback_by_cat[cat].append(item)
+        scheduler.run()
+        added = scheduler.added
+        near_dup_dropped += scheduler.near_dup_dropped
+    else:
+        print("backfill_skip=all categories meet TARGET_COUNTS")
+    fallback_added = 0
 
+    # 모델 응답이 불완전한 경우, 검증을 통과했던 최근 스냅샷(news_snapshots 링)의 카테고리별 색인에서
+    # 슬롯을 채워 고정 카운트를 보장한다. 모자란 카테고리가 없으면 색인도 읽지 않는다.
     for cat in ("listeria_free", "cultured_meat", "high_end_audio", "computer_ai", "global_biz"):
         need = TARGET_COUNTS[cat]
         if len(by_cat[cat]) >= need:
             continue
 
-        for src in fallback_by_cat.get(cat, []):
+        for src in news_snapshots.candidates(cat, TARGET_COUNTS):
             if len(by_cat[cat]) >= need:
                 break
 
@@ -393,6 +490,9 @@ def main() -> int:
             title_key = normalize_title_key(title)
             if title_key in existing_title_keys:
                 continue
+            if near_dups.query(item_text(src)) is not None:
+                near_dup_dropped += 1
+                continue
 
             item = dict(src)
             item["category"] = cat
@@ -414,6 +514,7 @@ def main() -> int:
             existing_ids.add(item["id"])
             existing_urls.add(url)
             existing_title_keys.add(title_key)
+            near_dups.add(item_text(item), url)
             fallback_added += 1
 
     # Rebuild ordered output with fixed per-category caps
@@ -423,18 +524,34 @@ def main() -> int:
         cat_items.sort(key=lambda z: str(z.get("published_at") or ""), reverse=True)
         ordered.extend(cat_items[: TARGET_COUNTS[cat]])
 
-    out = {
-        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-        "items": ordered,
-    }
-
-    with open(args.file, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
-
     counts = {cat: len([it for it in ordered if it.get("category") == cat]) for cat in TARGET_COUNTS}
+    probes = probe_cache.get_cache()
     print(f"added={added}")
     print(f"fallback_added={fallback_added}")
+    print(f"near_dup_dropped={near_dup_dropped}")
+    print(f"url_probe_cache: hits={probes.hits} misses={probes.misses}")
     print(counts)
+    return ordered
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", required=True, help="Target normalized news.json")
+    args = parser.parse_args()
+
+    data = news_store.read(args.file)
+
+    items = data.get("items", []) if isinstance(data, Mapping) else []
+    if not isinstance(items, list):
+        items = []
+
+    out = {
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "items": backfill_items(items, args.file),
+    }
+
+    # 스냅샷은 여기서 남기지 않는다: 이후 validate_urls_light/enrich를 거친 최종본만 perplexity_auto가 기록한다.
+    news_store.write(args.file, out)
     return 0
 
 
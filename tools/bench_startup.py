@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# bench_startup.py - 엔트리포인트별 import(콜드 스타트) 비용 측정 + 예산 초과 시 실패
+#
+# 각 엔트리포인트를 새 인터프리터에서 `-X importtime`으로 import 해
+#   - 누적 import 시간(ms, 반복 중 최소값)
+#   - 가장 무거운 하위 import 상위 N개
+#   - import 되면 안 되는 무거운 의존성(HEAVY_MODULES) 로드 여부
+# 를 출력한다. 예산 초과 또는 무거운 의존성 로드가 하나라도 있으면 종료 코드 1.
+#
+# 사용: python3 tools/bench_startup.py [--budget-ms 150] [--repeat 5] [--only news_hub]
+import argparse
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TOOLS_DIR = os.path.join(BASE_DIR, "tools")
+
+# (이름, 모듈, sys.path에 추가할 디렉터리)
+ENTRY_POINTS = [
+    ("news_hub", "news_hub", BASE_DIR),
+    ("sync_top_news", "sync_top_news", BASE_DIR),
+    ("detection_journal", "detection_journal", BASE_DIR),
+    ("perplexity_auto", "perplexity_auto", TOOLS_DIR),
+    ("validate_news_urls", "validate_news_urls", TOOLS_DIR),
+    ("backfill_missing_categories", "backfill_missing_categories", TOOLS_DIR),
+    ("enrich_with_claude", "enrich_with_claude", TOOLS_DIR),
+    ("telegram_notifier", "telegram_notifier", BASE_DIR),
+    ("check_process_contract", "check_process_contract", TOOLS_DIR),
+]
+
+# import 시점에 로드되면 안 되는 무거운 의존성 (실제 사용 경로에서 lazy import 해야 함)
+HEAVY_MODULES = ("requests", "perplexity", "pydantic", "httpx", "anthropic", "urllib.request")
+
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "150"))
+
+
+def parse_importtime(stderr, module):
+    """importtime 출력에서 module의 누적 시간(us)과 하위 import 목록 [(name, cumulative_us)]을 뽑는다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        raw_name = parts[2]
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        rows.append((raw_name.strip(), int(parts[1].strip()), depth))
+
+    # importtime은 후위 순회로 출력하므로 대상 모듈 줄 직전의 depth>0 줄들이 하위 트리다.
+    for idx in range(len(rows) - 1, -1, -1):
+        name, cumulative, depth = rows[idx]
+        if name == module and depth == 0:
+            children = []
+            for child_name, child_cumulative, child_depth in reversed(rows[:idx]):
+                if child_depth == 0:
+                    break
+                children.append((child_name, child_cumulative))
+            return cumulative, children
+    return None, []
+
+
+def measure(module, path, repeat):
+    """새 인터프리터로 repeat회 import 해서 가장 빠른 회차의 (cumulative_us, children)을 반환한다."""
+    code = f"import sys; sys.path.insert(0, {path!r}); import {module}"
+    best = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["(stderr 없음)"]
+            raise RuntimeError(f"{module} import 실패: {tail[0]}")
+        cumulative, children = parse_importtime(proc.stderr, module)
+        if cumulative is None:
+            raise RuntimeError(f"{module} importtime 결과를 찾지 못했습니다")
+        if best is None or cumulative < best[0]:
+            best = (cumulative, children)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="엔트리포인트 import 비용 측정")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="엔트리포인트별 import 예산(ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="엔트리포인트별 측정 횟수(최소값 사용)")
+    parser.add_argument("--top", type=int, default=5, help="출력할 무거운 하위 import 개수")
+    parser.add_argument("--only", action="append", default=[], help="측정할 엔트리포인트 이름(반복 지정 가능)")
+    args = parser.parse_args()
+
+    failures = 0
+    for name, module, path in ENTRY_POINTS:
+        if args.only and name not in args.only:
+            continue
+        try:
+            cumulative, children = measure(module, path, args.repeat)
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            failures += 1
+            continue
+
+        total_ms = cumulative / 1000
+        heavy = sorted({child for child, _ in children if child in HEAVY_MODULES})
+        over = total_ms > args.budget_ms
+        mark = "❌" if over or heavy else "✅"
+        print(f"{mark} {name}: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+        for child, child_cumulative in sorted(children, key=lambda c: c[1], reverse=True)[: args.top]:
+            print(f"     {child_cumulative / 1000:7.1f}ms  {child}")
+        if heavy:
+            print(f"     eager heavy imports: {', '.join(heavy)}")
+        if over or heavy:
+            failures += 1
+
+    print(f"startup_failures={failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,50 @@
 #!/usr/bin/env python3
 import argparse
+import copy
 import json
 import os
+import sys
+import time
+from collections.abc import Mapping
 from datetime import datetime, timezone
 
-import requests
-
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    def load_dotenv(*args, **kwargs):
-        return False
-
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
-load_dotenv(ENV_PATH)
 
+sys.path.insert(0, BASE_DIR)
+import enrich_cache  # noqa: E402
+import llm_client  # noqa: E402
+import news_store  # noqa: E402
+from near_dup_index import DEFAULT_INDEX_PATH, NearDupIndex, item_text  # noqa: E402
+from news_time_index import MISSING, parse_epoch_us, select_diverse  # noqa: E402
+
+# .env는 import 시점이 아니라 main()의 load_env()에서 읽는다.
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "").strip()
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514").strip()
+ANTHROPIC_API_URL = os.getenv("ANTHROPIC_API_URL", "https://api.anthropic.com").rstrip("/")
+
+# build_prompt/parse_decision 형식을 바꾸면 올린다 (보강 캐시 키에 포함됨).
+PROMPT_VERSION = "v2"
+# 정적 system prefix(지시문 + 카테고리 컨텍스트)에 Anthropic prompt cache 경계를 둔다.
+# prefix가 모델별 최소 길이(Sonnet 1024 토큰)보다 짧으면 API가 캐시하지 않을 뿐 오류는 아니다.
+PROMPT_CACHE = os.getenv("CLAUDE_PROMPT_CACHE", "1").strip().lower() not in ("0", "false", "no")
+
+REQUEST_TIMEOUT = float(os.getenv("CLAUDE_REQUEST_TIMEOUT", "30"))
+ITEM_TIMEOUT = float(os.getenv("CLAUDE_ITEM_TIMEOUT", "45"))
+ENRICH_CONCURRENCY = int(os.getenv("CLAUDE_ENRICH_CONCURRENCY", "4"))
+ENRICH_RATE_PER_MIN = float(os.getenv("CLAUDE_RATE_PER_MIN", "50"))
+# 같은 카테고리 N건을 한 요청으로 묶는다 (1이면 항목별 단건 요청). 배치 요청은 건당 여유 시간을 더 준다.
+ENRICH_BATCH_SIZE = int(os.getenv("CLAUDE_ENRICH_BATCH_SIZE", "5"))
+BATCH_ITEM_SECONDS = float(os.getenv("CLAUDE_BATCH_ITEM_SECONDS", "15"))
+# 보강 마감 시각 (로컬 "HH:MM" 또는 ISO8601). 마감 DEADLINE_MARGIN초 전까지 못 끝낸 항목은 fallback.
+ENRICH_DEADLINE = os.getenv("CLAUDE_ENRICH_DEADLINE", "").strip()
+DEADLINE_MARGIN = float(os.getenv("CLAUDE_DEADLINE_MARGIN_SECONDS", "60"))
+
+# --batch (Message Batches) 모드: 제출한 배치 id를 상태 파일에 남겨 재시작 후에도 이어서 기다린다.
+BATCH_STATE_PATH = os.getenv("CLAUDE_BATCH_STATE_PATH", os.path.join(BASE_DIR, ".state", "claude_batch.json"))
+BATCH_POLL_SECONDS = float(os.getenv("CLAUDE_BATCH_POLL_SECONDS", "30"))
+BATCH_WAIT_SECONDS = float(os.getenv("CLAUDE_BATCH_WAIT_SECONDS", "1800"))
 
 CATEGORY_SLOT = {
     "listeria_free": 4,
@@ -74,24 +100,89 @@ def _published_val(item):
     return str(item.get("published_at") or "")
 
 
-def call_claude(item, context):
-    if not ANTHROPIC_API_KEY:
-        return None
+def _feed_score(item):
+    try:
+        return float(item.get("score") or 0)
+    except (TypeError, ValueError):
+        return 0.0
 
-    prompt = f"""당신은 한국 창업자의 사업 의사결정 분석가다.
 
-[사업 컨텍스트]
-{context}
+def _has_decision(item):
+    return isinstance(item.get("decision"), dict) and bool(item.get("decision", {}).get("next_action"))
 
-[뉴스]
-제목: {item.get('title', '')}
-요약: {item.get('summary', '')}
-출처: {item.get('source', '')}
-링크: {item.get('url', '')}
 
-아래 JSON만 출력하라. 다른 설명 금지.
-{{
-  "impact_score": 0~10 숫자(소수1자리),
+def parse_deadline(raw, now=None):
+    """"HH:MM"(오늘 로컬 시각) / ISO8601 / epoch 초 → epoch 초. 비었거나 오늘 HH:MM이 이미 지났으면 None."""
+    if raw is None or raw == "":
+        return None
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    now = now or datetime.now().astimezone()
+    text = str(raw).strip()
+    try:
+        hour, minute = (int(part) for part in text.split(":"))
+    except ValueError:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.astimezone()
+        return parsed.timestamp()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    # 마감을 이미 넘긴 재실행(누락 작업 보정 등)은 서두를 이유가 없으므로 마감 없이 돈다.
+    return target.timestamp() if target > now else None
+
+
+def schedule_order(items):
+    """보강 우선순위 순으로 정렬한 dict 항목 목록.
+
+    1) Top-2 후보: 미보강 항목 중 최신순으로 카테고리가 겹치지 않게 고른 2건 (sync_top_news 규칙)
+    2) 카테고리 노출 슬롯(CATEGORY_SLOT) 중 아직 결정으로 채워지지 않은 만큼의 최신 항목
+    3) 나머지
+    같은 등급 안에서는 published_at 최신 > 피드 score 높은 순 > 파일 순서.
+    """
+    entries = [(position, item) for position, item in enumerate(items) if isinstance(item, dict)]
+    decided = {}
+    for _, item in entries:
+        if _has_decision(item):
+            decided[item.get("category")] = decided.get(item.get("category"), 0) + 1
+
+    def rank(entry):
+        position, item = entry
+        published = parse_epoch_us(item.get("published_at"))
+        return (-(MISSING if published is None else published), -_feed_score(item), position)
+
+    pending = sorted((entry for entry in entries if not _has_decision(entry[1]) and entry[1].get("url")), key=rank)
+    top = {id(item) for item in select_diverse([item for _, item in pending], [], k=2)}
+    in_slot = set()
+    filled = dict(decided)
+    for _, item in pending:
+        category = item.get("category")
+        if filled.get(category, 0) < CATEGORY_SLOT.get(category, 0):
+            filled[category] = filled.get(category, 0) + 1
+            in_slot.add(id(item))
+
+    def priority(entry):
+        item = entry[1]
+        tier = 0 if id(item) in top else 1 if id(item) in in_slot else 2
+        return (tier,) + rank(entry)
+
+    return [item for _, item in sorted(entries, key=priority)]
+
+
+def load_env():
+    """.env를 읽고 Anthropic 설정을 다시 채운다."""
+    global ANTHROPIC_API_KEY, ANTHROPIC_MODEL, ANTHROPIC_API_URL
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(ENV_PATH)
+    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "").strip()
+    ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514").strip()
+    ANTHROPIC_API_URL = os.getenv("ANTHROPIC_API_URL", "https://api.anthropic.com").rstrip("/")
+
+
+DECISION_FIELDS = """  "impact_score": 0~10 숫자(소수1자리),
   "impact_reason": "한국어 1~2문장",
   "confidence": 0~1 숫자(소수2자리),
   "confidence_basis": "한국어 1문장",
@@ -99,42 +190,468 @@ def call_claude(item, context):
   "time_sensitivity": "IMMEDIATE|SHORT|MEDIUM|LOW",
   "opportunity": "기회 요인 1문장",
   "risk": "리스크 요인 1문장"
-}}"""
+"""
+
+
+def _news_block(item):
+    return f"""제목: {item.get('title', '')}
+요약: {item.get('summary', '')}
+출처: {item.get('source', '')}
+링크: {item.get('url', '')}"""
+
+
+SYSTEM_PROMPT = f"""당신은 한국 창업자의 사업 의사결정 분석가다.
+주어진 사업 컨텍스트 기준으로 뉴스 한 건마다 아래 필드를 판단한다.
+{{
+{DECISION_FIELDS}}}
+
+출력 규칙:
+- 뉴스가 한 건이면 위 JSON 객체 하나만 출력한다.
+- 뉴스가 여러 건([뉴스 id=...])이면 뉴스마다 "id"(주어진 id 그대로)와 위 필드를 담은 객체를 모아 JSON 배열 하나만 출력한다.
+- JSON 외의 설명은 쓰지 않는다."""
+
+
+def system_blocks(context):
+    """요청마다 같은 정적 prefix (지시문 + 카테고리 컨텍스트). 마지막 블록에 prompt cache 경계를 둔다."""
+    blocks = [
+        {"type": "text", "text": SYSTEM_PROMPT},
+        {"type": "text", "text": f"[사업 컨텍스트]\n{context}"},
+    ]
+    if PROMPT_CACHE:
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return blocks
+
+
+def build_prompt(item):
+    """단건 요청의 user 메시지 (항목마다 달라지는 부분만)."""
+    return f"[뉴스]\n{_news_block(item)}"
 
-    headers = {
+
+def build_batch_prompt(entries):
+    """같은 카테고리 뉴스 여러 건을 한 요청으로 묶은 user 메시지. entries = [(batch_id, item)]."""
+    return "\n\n".join(f"[뉴스 id={batch_id}]\n{_news_block(item)}" for batch_id, item in entries)
+
+
+def _request_headers():
+    return {
         "x-api-key": ANTHROPIC_API_KEY,
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
-    payload = {
+
+
+def _request_payload(item, context):
+    return {
         "model": ANTHROPIC_MODEL,
         "max_tokens": 500,
-        "messages": [{"role": "user", "content": prompt}],
+        "system": system_blocks(context),
+        "messages": [{"role": "user", "content": build_prompt(item)}],
     }
 
+
+def _normalize_decision(parsed):
+    return {
+        "impact_score": float(parsed.get("impact_score", 0)),
+        "impact_reason": str(parsed.get("impact_reason", "")).strip(),
+        "confidence": float(parsed.get("confidence", 0)),
+        "confidence_basis": str(parsed.get("confidence_basis", "")).strip(),
+        "next_action": str(parsed.get("next_action", "")).strip(),
+        "time_sensitivity": str(parsed.get("time_sensitivity", "LOW")).strip().upper(),
+        "opportunity": str(parsed.get("opportunity", "")).strip(),
+        "risk": str(parsed.get("risk", "")).strip(),
+    }
+
+
+def parse_decision(text):
+    """응답 텍스트에서 첫 '{' ~ 마지막 '}' 구간을 decision dict로 정규화한다. 실패 시 None."""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end == -1 or end <= start:
+        return None
     try:
-        resp = requests.post("https://api.anthropic.com/v1/messages", headers=headers, json=payload, timeout=30)
+        return _normalize_decision(json.loads(text[start : end + 1]))
+    except Exception:
+        return None
+
+
+def parse_batch_decisions(text, batch_ids):
+    """배치 응답에서 {batch_id: decision}을 최대한 복구한다.
+
+    배열 전체가 파싱되면 그대로 쓰고, 잘렸거나 설명이 섞여 깨졌으면 '{'마다 raw_decode를 시도해
+    온전한 객체만 건진다. 모르는 id, 중복 id, 필수 필드(next_action)가 빈 객체는 버린다.
+    """
+    wanted = set(batch_ids)
+    objects = []
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            parsed = json.loads(text[start : end + 1])
+            if isinstance(parsed, list):
+                objects = [x for x in parsed if isinstance(x, dict)]
+        except ValueError:
+            objects = []
+    if not objects:
+        decoder = json.JSONDecoder()
+        position = text.find("{")
+        while position != -1:
+            try:
+                obj, consumed = decoder.raw_decode(text, position)
+            except ValueError:
+                position = text.find("{", position + 1)
+                continue
+            if isinstance(obj, dict):
+                objects.append(obj)
+            position = text.find("{", consumed)
+
+    decisions = {}
+    for obj in objects:
+        batch_id = str(obj.get("id", "")).strip()
+        if batch_id not in wanted or batch_id in decisions:
+            continue
+        try:
+            decision = _normalize_decision(obj)
+        except (TypeError, ValueError):
+            continue
+        if decision["next_action"]:
+            decisions[batch_id] = decision
+    return decisions
+
+
+def _response_text(body):
+    return (body.get("content") or [{}])[0].get("text", "")
+
+
+def call_claude(item, context):
+    """단건 동기 호출 (디버깅/단독 사용용). 배치 보강은 enrich_items의 비동기 엔진을 쓴다."""
+    if not ANTHROPIC_API_KEY:
+        return None
+
+    payload = _request_payload(item, context)
+
+    def attempt(call):
+        resp = call.session.post(
+            f"{ANTHROPIC_API_URL}/v1/messages",
+            headers=_request_headers(),
+            json=payload,
+            timeout=REQUEST_TIMEOUT,
+        )
         resp.raise_for_status()
-        text = resp.json().get("content", [{}])[0].get("text", "")
-        start = text.find("{")
-        end = text.rfind("}")
-        if start == -1 or end == -1 or end <= start:
-            return None
-        parsed = json.loads(text[start : end + 1])
-        return {
-            "impact_score": float(parsed.get("impact_score", 0)),
-            "impact_reason": str(parsed.get("impact_reason", "")).strip(),
-            "confidence": float(parsed.get("confidence", 0)),
-            "confidence_basis": str(parsed.get("confidence_basis", "")).strip(),
-            "next_action": str(parsed.get("next_action", "")).strip(),
-            "time_sensitivity": str(parsed.get("time_sensitivity", "LOW")).strip().upper(),
-            "opportunity": str(parsed.get("opportunity", "")).strip(),
-            "risk": str(parsed.get("risk", "")).strip(),
-        }
+        return parse_decision(_response_text(resp.json()))
+
+    try:
+        return llm_client.hedged("claude.messages", attempt, valid=lambda decision: decision is not None)
     except Exception:
         return None
 
 
+class TokenBucket:
+    """asyncio용 토큰 버킷. rate_per_min 속도로 채워지고 burst까지 쌓인다.
+
+    429를 받으면 pause(retry_after)로 버킷 전체를 그 시각까지 멈춘다 (모든 워커 공통).
+    """
+
+    def __init__(self, rate_per_min, burst=None, clock=time.monotonic):
+        self.rate = max(rate_per_min, 0.001) / 60.0
+        self.capacity = float(burst if burst is not None else max(1, ENRICH_CONCURRENCY))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = None
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, self._clock() + max(0.0, seconds))
+        self.tokens = 0.0
+
+    async def acquire(self):
+        import asyncio
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _retry_after_seconds(headers, default):
+    raw = headers.get("retry-after") if headers else None
+    try:
+        return max(0.0, float(raw))
+    except (TypeError, ValueError):
+        return default
+
+
+USAGE_FIELDS = ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens")
+
+
+def _add_usage(totals, body):
+    usage = body.get("usage") if isinstance(body, dict) else None
+    for field in USAGE_FIELDS:
+        try:
+            totals[field] += int((usage or {}).get(field) or 0)
+        except (TypeError, ValueError):
+            pass
+
+
+def usage_report(usage):
+    """토큰 사용량 요약 한 줄. input_equiv는 기본 입력 단가 기준 환산 (캐시 읽기 0.1배, 쓰기 1.25배)."""
+    plain = usage["input_tokens"]
+    read = usage["cache_read_input_tokens"]
+    write = usage["cache_creation_input_tokens"]
+    total_input = plain + read + write
+    equiv = plain + 0.1 * read + 1.25 * write
+    ratio = equiv / total_input * 100 if total_input else 100.0
+    return (
+        f"claude_usage: input={plain} cache_read={read} cache_write={write} "
+        f"output={usage['output_tokens']} input_equiv={equiv:.0f} ({ratio:.0f}% of uncached {total_input})"
+    )
+
+
+class AsyncClaudeClient:
+    """keep-alive HTTP/2 연결 풀(httpx.AsyncClient)로 Messages API를 호출한다. http2=False면 HTTP/1.1."""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504, 529}
+
+    def __init__(self, concurrency=ENRICH_CONCURRENCY, rate_per_min=ENRICH_RATE_PER_MIN, max_attempts=3, http2=True):
+        import httpx
+
+        # http2=True인데 h2가 없으면 httpx가 ImportError를 낸다 (decide_many가 미리 확인한다).
+        self.http = httpx.AsyncClient(
+            base_url=ANTHROPIC_API_URL,
+            headers=_request_headers(),
+            http2=http2,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=10.0),
+            # 헤지 요청이 원 요청과 동시에 나갈 수 있도록 연결 여유를 둔다.
+            limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency),
+        )
+        self.bucket = TokenBucket(rate_per_min)
+        self.max_attempts = max(1, max_attempts)
+        self.rate_limited = 0
+        self.usage = dict.fromkeys(USAGE_FIELDS, 0)
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def create_message(self, payload, timeout=None):
+        """응답 JSON(dict)을 반환한다. 재시도 후에도 실패하면 예외."""
+        import asyncio
+
+        last_error = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.bucket.acquire()
+            try:
+                if timeout is None:
+                    resp = await self.http.post("/v1/messages", json=payload)
+                else:
+                    resp = await self.http.post("/v1/messages", json=payload, timeout=timeout)
+            except Exception as e:
+                last_error = e
+                await asyncio.sleep(min(8.0, 0.5 * (2 ** attempt)))
+                continue
+            if resp.status_code in self.RETRY_STATUSES and attempt < self.max_attempts:
+                delay = _retry_after_seconds(resp.headers, min(8.0, 0.5 * (2 ** attempt)))
+                if resp.status_code == 429:
+                    self.rate_limited += 1
+                    self.bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                last_error = RuntimeError(f"HTTP {resp.status_code}")
+                continue
+            resp.raise_for_status()
+            body = resp.json()
+            _add_usage(self.usage, body)
+            return body
+        raise last_error or RuntimeError("Claude 요청 실패")
+
+
+def _batch_payload(entries, context):
+    return {
+        "model": ANTHROPIC_MODEL,
+        "max_tokens": 500 * len(entries),
+        "system": system_blocks(context),
+        "messages": [{"role": "user", "content": build_batch_prompt(entries)}],
+    }
+
+
+def _chunks(jobs, batch_size):
+    """같은 컨텍스트(카테고리) job 번호를 batch_size씩 묶는다 (입력 순서 유지, 묶음은 첫 job 순서대로)."""
+    by_context = {}
+    for index, (_, context) in enumerate(jobs):
+        by_context.setdefault(context, []).append(index)
+    size = max(1, batch_size)
+    chunks = [indices[i : i + size] for indices in by_context.values() for i in range(0, len(indices), size)]
+    return sorted(chunks, key=lambda indices: indices[0])
+
+
+async def _decide_all(jobs, concurrency=ENRICH_CONCURRENCY, item_timeout=ITEM_TIMEOUT, batch_size=None,
+                      deadline=None, http2=True):
+    """[(item, context)] → 같은 순서의 [decision | None]. 항목별 타임아웃/오류는 None.
+
+    batch_size > 1이면 같은 카테고리 항목을 묶어 한 요청으로 보내고, 응답에서 빠진 항목만
+    단건 요청으로 다시 시도한다.
+    deadline(epoch 초)이 주어지면 jobs 순서(우선순위)대로 시작하되, deadline - DEADLINE_MARGIN까지
+    남은 시간이 관측된 평균 응답 시간보다 짧으면 새 요청을 시작하지 않고, 그 시각에 진행 중인 요청도 취소한다.
+    시작하지 못했거나 취소된 항목(None)은 보류 목록으로 출력한다.
+    """
+    import asyncio
+
+    batch_size = ENRICH_BATCH_SIZE if batch_size is None else batch_size
+    client = AsyncClaudeClient(concurrency=concurrency, http2=http2)
+    gate = asyncio.Semaphore(max(1, concurrency))
+    results = [None] * len(jobs)
+    finished = set()
+    latencies = []
+    stats = {"requests": 0, "batched": 0, "recovered": 0}
+    stop_at = None if deadline is None else time.monotonic() + (deadline - DEADLINE_MARGIN - time.time())
+
+    def may_start():
+        if stop_at is None:
+            return True
+        # 아직 관측값이 없으면 남은 시간이 있는 한 시작한다 (마감에 걸리면 아래에서 취소됨).
+        expected = sum(latencies) / len(latencies) if latencies else 0.0
+        return stop_at - time.monotonic() > expected
+
+    async def request(payload, timeout=None):
+        stats["requests"] += 1
+        begun = time.monotonic()
+        # 단건/배치 요청은 지연 분포가 달라 헤지 기록을 따로 둔다.
+        name = "claude.messages" if timeout is None else "claude.messages.batch"
+        body = await asyncio.wait_for(
+            llm_client.hedged_async(
+                name, lambda number: client.create_message(payload, timeout=timeout), valid=_response_text
+            ),
+            timeout or item_timeout,
+        )
+        latencies.append(time.monotonic() - begun)
+        return body
+
+    async def one(index):
+        item, context = jobs[index]
+        async with gate:
+            if not may_start():
+                return
+            try:
+                body = await request(_request_payload(item, context))
+                results[index] = parse_decision(_response_text(body))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                results[index] = None
+            finished.add(index)
+
+    async def batch(indices):
+        if len(indices) == 1:
+            return await one(indices[0])
+        context = jobs[indices[0]][1]
+        entries = [(f"n{position + 1}", jobs[index][0]) for position, index in enumerate(indices)]
+        timeout = item_timeout + BATCH_ITEM_SECONDS * len(indices)
+        decisions = {}
+        async with gate:
+            if not may_start():
+                return
+            try:
+                body = await request(_batch_payload(entries, context), timeout=timeout)
+                decisions = parse_batch_decisions(_response_text(body), [batch_id for batch_id, _ in entries])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                decisions = {}
+        missing = []
+        for (batch_id, _), index in zip(entries, indices):
+            if batch_id in decisions:
+                results[index] = decisions[batch_id]
+                finished.add(index)
+                stats["batched"] += 1
+            else:
+                missing.append(index)
+        stats["recovered"] += len(missing)
+        await asyncio.gather(*(one(index) for index in missing))
+
+    started = time.monotonic()
+    try:
+        work = asyncio.gather(*(batch(indices) for indices in _chunks(jobs, batch_size)))
+        if stop_at is None:
+            await work
+        else:
+            try:
+                await asyncio.wait_for(work, max(0.0, stop_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+        elapsed = time.monotonic() - started
+        print(
+            f"claude_requests: items={len(jobs)} requests={stats['requests']} "
+            f"batched={stats['batched']} retried_single={stats['recovered']} "
+            f"elapsed={elapsed:.2f}s per_item={elapsed / max(1, len(jobs)) * 1000:.0f}ms"
+        )
+        deferred = [index for index in range(len(jobs)) if index not in finished]
+        if deadline is not None and deferred:
+            _print_deferral_report([jobs[index][0] for index in deferred], deadline)
+        return results
+    finally:
+        if client.rate_limited:
+            print(f"claude_rate_limited={client.rate_limited}")
+        if stats["requests"]:
+            print(usage_report(client.usage))
+        await client.aclose()
+
+
+def _print_deferral_report(items, deadline):
+    when = datetime.fromtimestamp(deadline).strftime("%H:%M:%S")
+    print(f"⏰ claude_deferred={len(items)} (deadline {when} - margin {DEADLINE_MARGIN:g}s, fallback_decision 적용)")
+    for item in items:
+        print(f"   - [{item.get('category', '')}] {str(item.get('title', '')).strip()[:60]}")
+
+
+def _alert_missing_dependency(name, consequence):
+    message = f"⚠️ Claude 보강 의존성 누락 ({name}): {consequence} - pip install -r requirements.txt (httpx[http2]) 필요"
+    print(message)
+    try:
+        import telegram_notifier
+
+        telegram_notifier.notify(message, key=("enrich_missing_dependency", name), label="Claude 보강 의존성 알림")
+    except Exception as e:
+        print(f"⚠️ 의존성 누락 Telegram 알림 실패: {e}")
+
+
+def decide_many(jobs, deadline=None):
+    """jobs를 제한된 동시성으로 보강한다. API 키가 없으면 네트워크 없이 모두 None."""
+    if not jobs or not ANTHROPIC_API_KEY:
+        return [None] * len(jobs)
+    import asyncio
+
+    # 의존성 누락으로 발행을 멈추지는 않는다: h2가 없으면 HTTP/1.1로, httpx가 없으면 전부 fallback으로
+    # 진행하되 로그와 Telegram으로 크게 알린다.
+    try:
+        import httpx  # noqa: F401
+    except ImportError as e:
+        _alert_missing_dependency(e.name, f"Claude 보강 생략, {len(jobs)}건 fallback_decision 적용")
+        return [None] * len(jobs)
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError as e:
+        _alert_missing_dependency(e.name, "HTTP/1.1로 Claude 보강 진행 (연결 다중화 없음)")
+        http2 = False
+
+    try:
+        return asyncio.run(_decide_all(jobs, deadline=deadline, http2=http2))
+    except Exception as e:
+        print(f"⚠️ Claude 비동기 보강 실패, fallback 사용: {e}")
+        return [None] * len(jobs)
+
+
 def fallback_decision(item):
     category = str(item.get("category", ""))
     title = str(item.get("title", "")).strip()
@@ -159,33 +676,94 @@ def fallback_decision(item):
     }
 
 
-def enrich_items(items, max_enrich):
+def _apply_decision(item, decision):
+    item["decision"] = decision
+    item["mode"] = "decision"
+    item["status"] = "PENDING_ACTION"
+    item["decision_generated_at"] = datetime.now(timezone.utc).isoformat()
+
+
+def _context_for(item):
+    return CATEGORY_CONTEXT.get(item.get("category", ""), "사업 영향 중심으로 판단")
+
+
+def _cache_key(item, context):
+    return enrich_cache.cache_key(ANTHROPIC_MODEL, PROMPT_VERSION, context, item)
+
+
+def enrich_items(items, max_enrich, near_dups=None, cache=None, decide=None, deadline=None):
+    """near_dups(NearDupIndex)가 주어지면 이미 분석한 기사의 근사 중복은 Claude 호출 없이 결정을 재사용한다.
+    cache(EnrichCache)가 주어지면 같은 모델·프롬프트·기사 내용의 저장된 결정을 먼저 다시 붙인다.
+    decide([(item, context)]) → [decision | None]는 기본이 decide_many (실시간 호출)다.
+    deadline(epoch 초)이 주어지면 decide_many가 마감에 맞춰 남은 항목을 보류한다 (fallback_decision).
+
+    1) schedule_order 우선순위대로 max_enrich까지 대상을 고르고 (근사 중복 재사용은 즉시 적용)
+    2) 호출이 필요한 항목은 같은 우선순위 순서로 decide_many에 넘겨 동시에 보강한 뒤
+    3) 결과를 붙인다 (실패/타임아웃/마감 보류는 fallback_decision).
+    같은 실행 안에서 먼저 나온 항목의 근사 중복은 그 항목의 결과를 기다렸다가 재사용한다.
+    """
+    if decide is None:
+        def decide(jobs):
+            return decide_many(jobs, deadline=deadline)
+
     enriched_count = 0
-    for item in items:
+    jobs = []  # [(item, context, text, cache_key)]
+    followers = {}  # job 번호 -> [item] (같은 실행의 근사 중복)
+    pending = NearDupIndex()
+    for item in schedule_order(items):
         if max_enrich > 0 and enriched_count >= max_enrich:
             break
-        if not isinstance(item, dict):
-            continue
         if not item.get("url"):
             item["mode"] = item.get("mode", "info")
             item["status"] = item.get("status", "COLLECTING")
             continue
 
-        has_decision = isinstance(item.get("decision"), dict) and bool(item.get("decision", {}).get("next_action"))
-        if has_decision:
+        if _has_decision(item):
             continue
 
-        context = CATEGORY_CONTEXT.get(item.get("category", ""), "사업 영향 중심으로 판단")
-        decision = call_claude(item, context)
-        if not decision:
-            decision = fallback_decision(item)
+        context = _context_for(item)
+        key = _cache_key(item, context)
+        cached = cache.get(key) if cache is not None else None
+        if cached:
+            _apply_decision(item, cached)
+            enriched_count += 1
+            continue
 
-        item["decision"] = decision
-        item["mode"] = "decision"
-        item["status"] = "PENDING_ACTION"
-        item["decision_generated_at"] = datetime.now(timezone.utc).isoformat()
+        text = item_text(item)
+        hit = near_dups.query(text) if near_dups is not None else None
+        if hit is not None and isinstance(hit[1], dict) and hit[1].get("decision"):
+            item["decision_reused_from"] = hit[0]
+            _apply_decision(item, copy.deepcopy(hit[1]["decision"]))
+        elif near_dups is not None and (leader := pending.query(text)) is not None:
+            followers.setdefault(leader[0], []).append(item)
+        else:
+            if near_dups is not None:
+                pending.add(text, len(jobs))
+            jobs.append((item, context, text, key))
         enriched_count += 1
 
+    decisions = decide([(item, context) for item, context, _, _ in jobs])
+    retry = []
+    for index, ((item, context, text, key), decision) in enumerate(zip(jobs, decisions)):
+        if decision and cache is not None:
+            cache.put(key, decision)
+        if decision and near_dups is not None:
+            source_key = str(item.get("id") or item.get("url"))
+            near_dups.add(text, source_key, {"decision": decision})
+            for follower in followers.get(index, []):
+                follower["decision_reused_from"] = source_key
+                _apply_decision(follower, copy.deepcopy(decision))
+        elif decision is None:
+            # 대표 항목이 실패하면 근사 중복 항목은 각자 한 번 더 시도한다.
+            retry.extend(followers.get(index, []))
+        _apply_decision(item, decision or fallback_decision(item))
+
+    retry_jobs = [(item, _context_for(item)) for item in retry]
+    for (item, context), decision in zip(retry_jobs, decide(retry_jobs)):
+        if decision and cache is not None:
+            cache.put(_cache_key(item, context), decision)
+        _apply_decision(item, decision or fallback_decision(item))
+
     return enriched_count
 
 
@@ -209,31 +787,220 @@ def reorder_and_trim(items):
     return out
 
 
+def enrich_and_reorder(items, max_enrich, decide=None, deadline=ENRICH_DEADLINE):
+    """enrich_items(영속 근사중복 인덱스 포함) 후 카테고리 슬롯 기준으로 재정렬한 items를 반환한다.
+
+    deadline은 parse_deadline 형식 (기본: CLAUDE_ENRICH_DEADLINE).
+    """
+    near_dups = NearDupIndex.load(DEFAULT_INDEX_PATH)
+    cache = enrich_cache.get_cache()
+    hits, misses = cache.hits, cache.misses
+    enriched = enrich_items(
+        items, max_enrich, near_dups=near_dups, cache=cache, decide=decide, deadline=parse_deadline(deadline)
+    )
+    near_dups.save()
+    cache.prune()
+    print(
+        f"✅ Claude enrichment: {enriched} items "
+        f"(cache hits={cache.hits - hits} misses={cache.misses - misses})"
+    )
+    return reorder_and_trim(items)
+
+
+class MessageBatchClient:
+    """Message Batches API 동기 클라이언트 (제출 / 상태 조회 / JSONL 결과)."""
+
+    def __init__(self, api_url=None, timeout=REQUEST_TIMEOUT):
+        import requests
+
+        self.api_url = (api_url or ANTHROPIC_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(_request_headers())
+
+    def create(self, batch_requests):
+        resp = self.session.post(
+            f"{self.api_url}/v1/messages/batches", json={"requests": batch_requests}, timeout=self.timeout
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def retrieve(self, batch_id):
+        resp = self.session.get(f"{self.api_url}/v1/messages/batches/{batch_id}", timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def results(self, batch):
+        url = batch.get("results_url") or f"{self.api_url}/v1/messages/batches/{batch['id']}/results"
+        resp = self.session.get(url, timeout=self.timeout, stream=True)
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+def no_live_calls(jobs):
+    """batch 모드의 병합 단계용 decide: 배치에서 결과를 못 받은 항목은 실시간 호출 없이 fallback."""
+    return [None] * len(jobs)
+
+
+def collect_jobs(items, max_enrich, near_dups=None, cache=None):
+    """enrich_items와 같은 선택 기준(캐시/근사 중복 제외)으로 Claude 호출이 필요한 [(item, context)]를 모은다.
+
+    items는 바꾸지 않는다 (사본에서 선택만 수행).
+    """
+    collected = []
+
+    def collect(jobs):
+        collected.extend(jobs)
+        return [None] * len(jobs)
+
+    enrich_items(copy.deepcopy(items), max_enrich, near_dups=near_dups, cache=cache, decide=collect)
+    return collected
+
+
+def batch_requests(jobs):
+    """custom_id = 보강 캐시 키. 결과가 어느 실행에서 도착하든 같은 기사에 다시 붙는다."""
+    out, seen = [], set()
+    for item, context in jobs:
+        key = _cache_key(item, context)
+        if key not in seen:
+            seen.add(key)
+            out.append({"custom_id": key, "params": _request_payload(item, context)})
+    return out
+
+
+def _clear_batch_state(state_path):
+    try:
+        os.remove(state_path)
+    except FileNotFoundError:
+        pass
+    news_store.get_store().invalidate(state_path)
+
+
+def run_batch(items, max_enrich, wait=BATCH_WAIT_SECONDS, poll=BATCH_POLL_SECONDS,
+              state_path=BATCH_STATE_PATH, client=None, sleep=time.sleep):
+    """Message Batches로 보강 결과를 받아 보강 캐시에 채운다.
+
+    state_path에 진행 중인 배치가 있으면 새로 제출하지 않고 그 배치를 이어서 기다린다.
+    배치가 끝났거나 보낼 항목이 없으면 True, wait초 안에 끝나지 않으면 상태를 남기고 False.
+    """
+    import requests
+
+    cache = enrich_cache.get_cache()
+    client = client or MessageBatchClient()
+    state = news_store.read(state_path, default=None)
+    batch_id = state.get("batch_id") if hasattr(state, "get") else None
+    if batch_id:
+        print(f"claude_batch=resume id={batch_id} submitted_at={state.get('submitted_at')}")
+    else:
+        near_dups = NearDupIndex.load(DEFAULT_INDEX_PATH)
+        pending = batch_requests(collect_jobs(items, max_enrich, near_dups=near_dups, cache=cache))
+        if not pending:
+            print("claude_batch=skip (보강할 항목 없음)")
+            return True
+        try:
+            batch_id = client.create(pending)["id"]
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"⚠️ claude_batch 제출 실패: {e}")
+            return False
+        news_store.atomic_write_json(
+            state_path,
+            {
+                "batch_id": batch_id,
+                "submitted_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "requests": len(pending),
+                "model": ANTHROPIC_MODEL,
+                "prompt_version": PROMPT_VERSION,
+            },
+        )
+        print(f"claude_batch=submitted id={batch_id} requests={len(pending)}")
+
+    deadline = time.monotonic() + max(0.0, wait)
+    while True:
+        try:
+            batch = client.retrieve(batch_id)
+        except requests.HTTPError as e:
+            if getattr(e.response, "status_code", None) == 404:
+                print(f"⚠️ claude_batch id={batch_id} 없음 - 상태 초기화")
+                _clear_batch_state(state_path)
+                return True
+            batch = {}
+        except requests.RequestException:
+            batch = {}
+        if batch.get("processing_status") == "ended":
+            break
+        if time.monotonic() >= deadline:
+            counts = batch.get("request_counts") or {}
+            print(
+                f"claude_batch=pending id={batch_id} processing={counts.get('processing', '?')} "
+                f"(다음 실행에서 이어서 확인)"
+            )
+            return False
+        sleep(max(0.0, min(poll, deadline - time.monotonic())))
+
+    usage = dict.fromkeys(USAGE_FIELDS, 0)
+    succeeded = failed = 0
+    try:
+        for row in client.results(batch):
+            result = row.get("result") or {}
+            message = result.get("message") or {}
+            decision = parse_decision(_response_text(message)) if result.get("type") == "succeeded" else None
+            if decision and row.get("custom_id"):
+                cache.put(row["custom_id"], decision)
+                _add_usage(usage, message)
+                succeeded += 1
+            else:
+                failed += 1
+    except (requests.RequestException, ValueError) as e:
+        # 받은 결과까지는 캐시에 남았다. 상태는 유지해 다음 실행에서 결과를 다시 받는다.
+        print(f"⚠️ claude_batch 결과 수신 실패 id={batch_id}: {e}")
+        return False
+    _clear_batch_state(state_path)
+    print(f"claude_batch=ended id={batch_id} succeeded={succeeded} failed={failed}")
+    if succeeded:
+        print(usage_report(usage))
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--in", dest="in_path", required=True)
     parser.add_argument("--out", dest="out_path", required=True)
     parser.add_argument("--max-enrich", dest="max_enrich", type=int, default=20)
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Message Batches로 제출/대기 (진행 중인 배치가 있으면 이어서 확인, 끝나기 전에는 --out을 쓰지 않음)",
+    )
+    parser.add_argument("--batch-wait", dest="batch_wait", type=float, default=BATCH_WAIT_SECONDS)
+    parser.add_argument(
+        "--deadline", default=ENRICH_DEADLINE,
+        help="보강 마감 (로컬 HH:MM 또는 ISO8601). 우선순위 높은 항목부터 보강하고 남은 항목은 fallback",
+    )
     args = parser.parse_args()
+    load_env()
 
-    with open(args.in_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = news_store.read(args.in_path)
 
-    items = data.get("items", []) if isinstance(data, dict) else []
+    items = data.get("items", []) if isinstance(data, Mapping) else []
     if not isinstance(items, list):
         items = []
+    # enrich_items는 항목 dict를 직접 수정하므로 캐시와 공유되지 않게 복사한다.
+    items = [dict(item) if isinstance(item, dict) else item for item in items]
 
-    enriched = enrich_items(items, args.max_enrich)
-    result_items = reorder_and_trim(items)
+    if args.batch:
+        if ANTHROPIC_API_KEY and not run_batch(items, args.max_enrich, wait=args.batch_wait):
+            return
+        result_items = enrich_and_reorder(items, args.max_enrich, decide=no_live_calls)
+    else:
+        result_items = enrich_and_reorder(items, args.max_enrich, deadline=args.deadline)
 
     out = {
         "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "items": result_items,
     }
-    with open(args.out_path, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+    news_store.write(args.out_path, out)
 
-    print(f"✅ Claude enrichment: {enriched} items")
     print(f"✅ news.json updated: {len(result_items)} items")
 
 
@@ -1,34 +1,24 @@
 #!/usr/bin/env python3
+import argparse
+import json
 import os
 import sys
 import subprocess
 import shutil
-from datetime import date
-import requests
-
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    def load_dotenv(*args, **kwargs):
-        return False
+import time
+from datetime import date, datetime, timezone
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
 
-load_dotenv(ENV_PATH)
+sys.path.insert(0, BASE_DIR)
+import llm_client  # noqa: E402
+import news_snapshots  # noqa: E402
+import news_store  # noqa: E402
 
-API_KEY = os.environ.get("PERPLEXITY_API_KEY", "").strip()
-if not API_KEY:
-    raise RuntimeError("PERPLEXITY_API_KEY 환경 변수가 설정되어 있지 않습니다.")
+NORMALIZED_PATH = news_store.NORMALIZED_NEWS_JSON
 
-RAW_MODEL = os.environ.get("PERPLEXITY_MODEL", "").strip().lower()
-if RAW_MODEL and RAW_MODEL != "sonar":
-    print(f"⚠️ PERPLEXITY_MODEL={RAW_MODEL} 무시, sonar 강제 사용")
 MODEL = "sonar"
-OUT_PATH = os.environ.get(
-    "PERPLEXITY_OUTPUT_PATH",
-    os.path.join(BASE_DIR, "data", "raw", "perplexity.txt"),
-).strip()
 
 PROMPT_TEMPLATE = """
 오늘자 뉴스 업데이트해줘. 반드시 중복은 피하고 꼭 가장 최근 기준으로.
@@ -102,8 +92,9 @@ def resolve_node_binary() -> str:
     raise RuntimeError("node 실행 파일을 찾을 수 없습니다. PATH 또는 NODE_BIN을 확인하세요.")
 
 
-def run_pipeline(output_path: str) -> None:
-    normalized_path = os.path.join(BASE_DIR, "data", "normalized", "news.json")
+def run_pipeline_subprocess(output_path: str) -> None:
+    """단계별 개별 프로세스 실행 (디버깅용). 각 단계가 news.json을 읽고 다시 쓴다."""
+    normalized_path = NORMALIZED_PATH
     node_bin = resolve_node_binary()
 
     normalize = [
@@ -148,51 +139,173 @@ def run_pipeline(output_path: str) -> None:
         "--out",
         normalized_path,
         "--max-enrich",
-        str(os.getenv("CLAUDE_ENRICH_MAX_ITEMS", "100")),
+        str(enrich_max_items()),
     ]
     subprocess.run(enrich, cwd=BASE_DIR, check=True)
 
+    from backfill_missing_categories import TARGET_COUNTS
+
+    news_snapshots.record_if_valid(news_store.read(normalized_path), TARGET_COUNTS)
+
     sync = [sys.executable, os.path.join(BASE_DIR, "sync_top_news.py")]
     subprocess.run(sync, cwd=BASE_DIR, check=True)
 
 
-def main() -> int:
-    today = date.today().strftime("%Y-%m-%d")
-    prompt = PROMPT_TEMPLATE.format(today=today)
+def enrich_max_items() -> int:
+    return int(os.getenv("CLAUDE_ENRICH_MAX_ITEMS", "100"))
 
-    response = requests.post(
-        "https://api.perplexity.ai/chat/completions",
-        headers={
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": MODEL,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "너는 최신 뉴스를 웹에서 검색해 한국어로 마크다운 뉴스 브리핑을 만드는 에디터다.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-        },
-        timeout=180,
+
+def _run_stage(name, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    print(f"⏱️ stage {name}: {(time.perf_counter() - started) * 1000:.0f}ms")
+    return result
+
+
+def normalize_in_memory(output_path: str, normalized_path: str):
+    """normalize.js를 1회 실행해 정규화 결과를 stdout으로 받는다 (news.json은 쓰지 않음)."""
+    proc = subprocess.run(
+        [resolve_node_binary(), os.path.join(BASE_DIR, "scripts", "normalize.js"), "--in", output_path, "--out", "-"],
+        cwd=BASE_DIR,
+        check=True,
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
     )
-    response.raise_for_status()
-    payload = response.json()
-    md_text = (
-        (((payload.get("choices") or [{}])[0].get("message") or {}).get("content"))
-        or ""
+    items = json.loads(proc.stdout or "{}").get("items") or []
+
+    # normalize.js 파일 모드와 동일: 0건이면 기존 news.json을 유지하고 그 내용으로 다음 단계를 진행한다.
+    allow_empty = os.getenv("ALLOW_EMPTY_NEWS_WRITE", "").strip().lower() == "true"
+    if not items and not allow_empty and os.path.exists(normalized_path):
+        try:
+            previous = news_store.read(normalized_path).get("items") or []
+        except Exception:
+            previous = []
+        if previous:
+            print(f"WARN: parsed 0 items; keep existing output with {len(previous)} items -> {normalized_path}")
+            return previous
+    return items
+
+
+def run_pipeline_inprocess(output_path: str) -> None:
+    """normalize 이후 단계를 라이브러리 함수로 호출하고 items를 메모리로 넘긴다. news.json은 마지막에 1회 원자적 기록."""
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    if tools_dir not in sys.path:
+        sys.path.insert(0, tools_dir)
+    import backfill_missing_categories
+    import enrich_with_claude
+    import sync_top_news
+    import validate_news_urls
+
+    normalized_path = NORMALIZED_PATH
+    items = _run_stage("normalize", normalize_in_memory, output_path, normalized_path)
+    items = _run_stage("validate_urls", validate_news_urls.validate_news, items)
+    items = _run_stage("backfill", backfill_missing_categories.backfill_items, items, normalized_path)
+    items = _run_stage("validate_urls_light", validate_news_urls.validate_news, items)
+
+    enrich_with_claude.load_env()
+    items = _run_stage("enrich", enrich_with_claude.enrich_and_reorder, items, enrich_max_items())
+
+    payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "items": items,
+    }
+    _run_stage("write", news_store.write, normalized_path, payload)
+    print(f"✅ news.json updated: {len(items)} items")
+    news_snapshots.record_if_valid(payload, backfill_missing_categories.TARGET_COUNTS)
+
+    _run_stage("sync", sync_top_news.main)
+
+
+def run_pipeline(output_path: str, subprocess_mode: bool = False) -> None:
+    if subprocess_mode:
+        run_pipeline_subprocess(output_path)
+    else:
+        run_pipeline_inprocess(output_path)
+
+
+def load_settings(require_api_key: bool = True):
+    """.env를 읽고 (api_key, out_path)를 반환한다. import 시점이 아니라 main()에서 호출한다."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(ENV_PATH)
+
+    api_key = os.environ.get("PERPLEXITY_API_KEY", "").strip()
+    if not api_key and require_api_key:
+        raise RuntimeError("PERPLEXITY_API_KEY 환경 변수가 설정되어 있지 않습니다.")
+
+    raw_model = os.environ.get("PERPLEXITY_MODEL", "").strip().lower()
+    if raw_model and raw_model != "sonar":
+        print(f"⚠️ PERPLEXITY_MODEL={raw_model} 무시, sonar 강제 사용")
+
+    out_path = os.environ.get(
+        "PERPLEXITY_OUTPUT_PATH",
+        os.path.join(BASE_DIR, "data", "raw", "perplexity.txt"),
     ).strip()
+    return api_key, out_path
+
+
+def fetch_markdown(api_key: str, out_path: str) -> None:
+    today = date.today().strftime("%Y-%m-%d")
+    prompt = PROMPT_TEMPLATE.format(today=today)
+
+    def attempt(call):
+        response = call.session.post(
+            "https://api.perplexity.ai/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": MODEL,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "너는 최신 뉴스를 웹에서 검색해 한국어로 마크다운 뉴스 브리핑을 만드는 에디터다.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+            },
+            timeout=180,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        return (
+            (((payload.get("choices") or [{}])[0].get("message") or {}).get("content"))
+            or ""
+        ).strip()
+
+    # 응답 지연이 기록된 분위수를 넘으면 같은 요청을 한 번 더 보낸다 (LLM_HEDGE=1, llm_client 참고).
+    md_text = llm_client.hedged("perplexity.briefing", attempt, valid=bool)
     if not md_text:
         raise RuntimeError("Perplexity 응답이 비어 있습니다.")
 
-    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
         f.write(md_text)
 
-    run_pipeline(OUT_PATH)
-    print(f"✅ Saved: {OUT_PATH}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Perplexity 수집 + 정규화/검증/백필/보강/동기화 파이프라인")
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        default=os.getenv("PIPELINE_STAGE_MODE", "").strip().lower() == "subprocess",
+        help="단계별 개별 프로세스로 실행 (디버깅용, PIPELINE_STAGE_MODE=subprocess와 동일)",
+    )
+    parser.add_argument("--raw", help="Perplexity 호출 없이 기존 원문(md/json) 파일로 파이프라인만 실행")
+    args = parser.parse_args()
+
+    api_key, out_path = load_settings(require_api_key=not args.raw)
+    if args.raw:
+        out_path = os.path.abspath(args.raw)
+    else:
+        fetch_markdown(api_key, out_path)
+
+    run_pipeline(out_path, subprocess_mode=args.subprocess)
+    print(f"✅ Saved: {out_path}")
     return 0
 
 
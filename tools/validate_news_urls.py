@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import os
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from typing import Any, Dict, List, Tuple
 
-import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import news_store  # noqa: E402
+import probe_cache  # noqa: E402
+from probe_cache import ProbeRecord  # noqa: E402
 
 
 def is_http_url(url: str) -> bool:
@@ -41,31 +46,107 @@ def classify_suspicious_url(url: str) -> str:
     return ""
 
 
-def probe_url(url: str, timeout: int = 8) -> Tuple[bool, str, str]:
-    headers = {"User-Agent": "WaveTreeNewsBot/1.0 (+url-validator)"}
+PROBE_WORKERS = int(os.getenv("URL_VALIDATE_WORKERS", "16"))
+PROBE_PER_HOST = int(os.getenv("URL_VALIDATE_PER_HOST", "2"))
+PROBE_HEADERS = {"User-Agent": "WaveTreeNewsBot/1.0 (+url-validator)"}
+
+_local = threading.local()
+
+
+def _session():
+    """스레드별 requests.Session (호스트별 keep-alive 연결 재사용)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        session.headers.update(PROBE_HEADERS)
+        _local.session = session
+    return session
+
+
+def _record(url: str, status: int, final_url: str) -> ProbeRecord:
+    if status in (404, 410):
+        return ProbeRecord(url, status, final_url, f"http_{status}")
+    suspicious = classify_suspicious_url(final_url)
+    return ProbeRecord(url, status, final_url, suspicious or f"http_{status}", suspicious)
+
+
+def _fetch_record(url: str, timeout: int) -> ProbeRecord:
+    session = _session()
     try:
-        h = requests.head(url, timeout=timeout, allow_redirects=True, headers=headers)
-        status = int(getattr(h, "status_code", 0) or 0)
-        final_url = str(getattr(h, "url", "") or url)
-        if status in (404, 410):
-            return False, f"http_{status}", final_url
-        suspicious = classify_suspicious_url(final_url)
-        if suspicious:
-            return False, suspicious, final_url
-        return True, f"http_{status}", final_url
+        h = session.head(url, timeout=timeout, allow_redirects=True)
+        return _record(url, int(getattr(h, "status_code", 0) or 0), str(getattr(h, "url", "") or url))
     except Exception:
         try:
-            g = requests.get(url, timeout=timeout, allow_redirects=True, headers=headers)
-            status = int(getattr(g, "status_code", 0) or 0)
-            final_url = str(getattr(g, "url", "") or url)
-            if status in (404, 410):
-                return False, f"http_{status}", final_url
-            suspicious = classify_suspicious_url(final_url)
-            if suspicious:
-                return False, suspicious, final_url
-            return True, f"http_{status}", final_url
+            # HEAD를 거부하는 서버용: 첫 바이트만 요청(Range)하고 본문은 스트림으로 열기만 한 뒤 닫는다.
+            with session.get(
+                url, timeout=timeout, allow_redirects=True, stream=True, headers={"Range": "bytes=0-0"}
+            ) as g:
+                return _record(url, int(getattr(g, "status_code", 0) or 0), str(getattr(g, "url", "") or url))
         except Exception as e:
-            return True, f"network_skip:{type(e).__name__}", url
+            return ProbeRecord(url, 0, url, f"network_skip:{type(e).__name__}")
+
+
+def probe_record(url: str, timeout: int = 8) -> ProbeRecord:
+    """probe 캐시(.state/url_probe_cache.sqlite3)를 먼저 보고, 없거나 만료됐을 때만 네트워크로 확인한다."""
+    cache = probe_cache.get_cache()
+    record = cache.get(url)
+    if record is None:
+        record = _fetch_record(url, timeout)
+        cache.put(record)
+    return record
+
+
+def probe_url(url: str, timeout: int = 8) -> Tuple[bool, str, str]:
+    record = probe_record(url, timeout)
+    if record.network_error:
+        return True, record.reason, url
+    ok = record.status not in (404, 410) and not record.suspicious
+    return ok, record.reason, record.final_url
+
+
+def _host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def probe_urls(
+    urls: List[str],
+    workers: int = PROBE_WORKERS,
+    per_host: int = PROBE_PER_HOST,
+    probe=probe_url,
+) -> Dict[str, Tuple[bool, str, str]]:
+    """URL 목록을 동시에 probe 한다 (전체 동시성 workers, 호스트당 per_host). {url: 결과} 반환.
+
+    호스트별 URL을 per_host개 레인으로 나눠 레인 하나를 작업 1개로 제출하므로,
+    같은 호스트 요청은 레인 수 이상 겹치지 않고 워커가 호스트 대기로 묶이지도 않는다.
+    전체 소요 시간은 모든 호스트의 합이 아니라 가장 느린 호스트(레인)에 수렴한다.
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+
+    lanes: List[List[str]] = []
+    by_host: Dict[str, List[str]] = {}
+    for url in unique:
+        by_host.setdefault(_host_of(url), []).append(url)
+    for host_urls in by_host.values():
+        count = max(1, min(per_host, len(host_urls)))
+        lanes.extend(host_urls[i::count] for i in range(count))
+    # 긴 레인부터 시작해야 꼬리 지연이 줄어든다.
+    lanes.sort(key=len, reverse=True)
+
+    def run_lane(lane: List[str]) -> List[Tuple[str, Tuple[bool, str, str]]]:
+        return [(url, probe(url)) for url in lane]
+
+    results: Dict[str, Tuple[bool, str, str]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(lanes)))) as pool:
+        for lane_results in pool.map(run_lane, lanes):
+            results.update(lane_results)
+    return results
 
 
 def validate_items(
@@ -77,14 +158,19 @@ def validate_items(
     kept: List[Dict[str, Any]] = []
     removed_reasons: List[str] = []
 
-    for it in items:
-        url = str(it.get("url") or "").strip()
+    urls = [str(it.get("url") or "").strip() for it in items]
+    probes: Dict[str, Tuple[bool, str, str]] = {}
+    if check_http:
+        probes = probe_urls([url for url in urls if url and is_http_url(url)])
+
+    # probe는 병렬이지만 판정/출력은 입력 순서 그대로 한다.
+    for it, url in zip(items, urls):
         if not url or not is_http_url(url):
             removed_reasons.append("invalid_url_format")
             continue
 
         if check_http:
-            ok, reason, final_url = probe_url(url)
+            ok, reason, final_url = probes[url]
             if final_url and is_http_url(final_url):
                 it["url"] = final_url
 
@@ -100,6 +186,38 @@ def validate_items(
     return kept, removed_reasons
 
 
+def validate_news(
+    items: List[Dict[str, Any]],
+    check_http: bool = False,
+    drop_http_dead: bool = False,
+    drop_suspicious: bool = False,
+) -> List[Dict[str, Any]]:
+    """validate_items + 결과 요약 출력. 파이프라인 러너가 in-process로 호출한다."""
+    before = len(items)
+    cache = probe_cache.get_cache()
+    hits, misses = cache.hits, cache.misses
+    kept, removed = validate_items(
+        items,
+        check_http=check_http,
+        drop_http_dead=drop_http_dead,
+        drop_suspicious=drop_suspicious,
+    )
+
+    after = len(kept)
+    if check_http:
+        print(f"url_probe_cache: hits={cache.hits - hits} misses={cache.misses - misses}")
+    print(
+        f"url_validate: before={before} after={after} removed={before - after} "
+        f"check_http={check_http} drop_http_dead={drop_http_dead} drop_suspicious={drop_suspicious}"
+    )
+    if removed:
+        counts: Dict[str, int] = {}
+        for r in removed:
+            counts[r] = counts.get(r, 0) + 1
+        print("url_validate_reasons:", counts)
+    return kept
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate news URLs and remove clearly broken ones")
     parser.add_argument("--file", required=True, help="Path to normalized news.json")
@@ -109,35 +227,19 @@ def main() -> int:
     args = parser.parse_args()
 
     path = os.path.abspath(args.file)
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = news_store.checkout(path)
 
     items = data.get("items", []) if isinstance(data, dict) else []
     if not isinstance(items, list):
         items = []
 
-    before = len(items)
-    kept, removed = validate_items(
+    data["items"] = validate_news(
         items,
         check_http=args.check_http,
         drop_http_dead=args.drop_http_dead,
         drop_suspicious=args.drop_suspicious,
     )
-
-    data["items"] = kept
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    after = len(kept)
-    print(
-        f"url_validate: before={before} after={after} removed={before - after} "
-        f"check_http={args.check_http} drop_http_dead={args.drop_http_dead} drop_suspicious={args.drop_suspicious}"
-    )
-    if removed:
-        counts: Dict[str, int] = {}
-        for r in removed:
-            counts[r] = counts.get(r, 0) + 1
-        print("url_validate_reasons:", counts)
+    news_store.write(path, data)
     return 0
 
 